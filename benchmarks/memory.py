@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+
+"""Measure the memory held per packet for common play packets."""
+
+from __future__ import annotations
+
+import gc
+import tracemalloc
+
+from uuid import UUID
+
+from prodis.packets import play
+from prodis.packets.play import clientbound as _clientbound
+
+
+COUNT = 10000
+
+SAMPLES = [
+    _clientbound.EntityHeadLook(entity_id=1234, head_yaw=90.0),
+    _clientbound.PlayerPositionAndLook(x=1.5, y=64.0, z=-3.25,
+                                       teleport_id=7),
+    _clientbound.TimeUpdate(world_age=123456, time_of_day=6000),
+    _clientbound.SpawnLivingEntity(
+        entity_id=1234,
+        entity_uuid=UUID(int=0x1234),
+        entity_type=5,
+        x=1.5, y=64.0, z=-3.25,
+        yaw=90.0, pitch=0.0, head_pitch=45.0,
+        velocity_x=0.0, velocity_y=-0.5, velocity_z=0.25,
+    ),
+    _clientbound.UpdateViewPosition(chunk_x=-3, chunk_z=5),
+]
+
+
+def measure(sample: play.ClientBound, decode: bool) -> float:
+
+    buffer = memoryview(b''.join(sample.wrapped() for _ in range(COUNT)))
+
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+
+    packets = []
+    pos = 0
+    while pos < len(buffer):
+        dispatched, frame, pos = play.ClientBound.parse_frame(buffer, pos)
+        packet = dispatched.from_frame(frame)
+        if decode:
+            packet.__getstate__()
+
+        packets.append(packet)
+
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # don't count the list holding the packets
+    return (after - before) / COUNT - 8
+
+
+def main() -> None:
+
+    print(f"{'packet':<24} {'undecoded':>10} {'decoded':>10}  bytes/packet")
+    for sample in SAMPLES:
+        print(f"{type(sample).__name__:<24} "
+              f"{measure(sample, False):10.1f} {measure(sample, True):10.1f}")
+
+
+if __name__ == '__main__':
+    main()
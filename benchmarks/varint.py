@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+
+"""Compare the varint codec with the generator based reference."""
+
+from __future__ import annotations
+
+import random
+import timeit
+
+from prodis.utils import byte as _byte
+from prodis.utils import parse as _parse
+from prodis.utils import varint as _varint
+
+
+def reference_render_varint(v: int) -> bytes:
+
+    if 0 <= v <= 0x7f:
+        return v.to_bytes(1, 'little')
+
+    v &= 0xffffffff
+
+    l = []
+
+    while v >= 0x80:
+        l.append(v & 0x7f | 0x80)
+        v >>= 7
+
+    return bytes(l + [v])
+
+
+def reference_parse_varint(data: bytes, start: int = 0) -> tuple[int, int]:
+
+    return _byte._to_parser(_parse.request_varint(), data, start=start)
+
+
+def bench(name: str, stmt, number: int) -> float:
+
+    best = min(timeit.repeat(stmt, number=number, repeat=5))
+    print(f"{name:<40} {best / number * 1e9:10.1f} ns")
+    return best
+
+
+def main() -> None:
+
+    rng = random.Random(757)
+    samples = {
+        'small (0..127)': [rng.randrange(0x80) for _ in range(1000)],
+        'medium (128..16383)': [rng.randrange(0x80, 0x4000)
+                                for _ in range(1000)],
+        'large (16384..2**31-1)': [rng.randrange(0x4000, 0x8000_0000)
+                                   for _ in range(1000)],
+        'negative': [rng.randrange(-0x8000_0000, 0) for _ in range(1000)],
+    }
+
+    for label, values in samples.items():
+        print(f"\n{label}, per 1000 values")
+        encoded = [_varint.encode_varint(v) for v in values]
+        assert encoded == [reference_render_varint(v) for v in values]
+        joined = b''.join(encoded)
+
+        def decode_reference() -> None:
+            pos = 0
+            for _ in range(len(values)):
+                _, pos = reference_parse_varint(joined, pos)
+
+        def decode_single() -> None:
+            pos = 0
+            for _ in range(len(values)):
+                _, pos = _varint.decode_varint(joined, pos)
+
+        old = bench("encode reference",
+                    lambda: [reference_render_varint(v) for v in values], 20)
+        new = bench("encode_varint",
+                    lambda: [_varint.encode_varint(v) for v in values], 20)
+        bulk = bench("encode_varints",
+                     lambda: _varint.encode_varints(values), 20)
+        print(f"speedup {old / new:.1f}x, bulk {old / bulk:.1f}x")
+
+        old = bench("decode reference", decode_reference, 20)
+        new = bench("decode_varint", decode_single, 20)
+        bulk = bench("decode_varints",
+                     lambda: _varint.decode_varints(joined, len(values)), 20)
+        print(f"speedup {old / new:.1f}x, bulk {old / bulk:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+from collections import OrderedDict as _OrderedDict
+from struct import (
+    Struct as _Struct,
+    error as _StructError,
+)
+
+from .packets import play as _play
+from .packets.play.clientbound import (
+    ChunkData as _ChunkData,
+    UpdateLight as _UpdateLight,
+    UnloadChunk as _UnloadChunk,
+    JoinGame as _JoinGame,
+)
+
+from .utils import varint as _varint
+
+from .logger import Logger as _Logger
+_log = _Logger(__name__)
+
+
+_CHUNK_POS = _Struct('>ii')
+
+
+def _chunk_pos(data: bytes | memoryview) -> tuple[int, int]:
+
+    try:
+        return _CHUNK_POS.unpack_from(data)
+
+    except _StructError:
+        raise ValueError("end of data reached") from None
+
+
+class CachedChunk:
+
+    """A chunk as last sent by the server, with its latest light update.
+
+    Only the payloads of the packets are kept, copied into memory of their
+    own. They are decoded into `chunk` and `light` on first access, and
+    decoded again after `drop_decoded()`. `size` only accounts for the
+    payloads.
+    """
+
+    __slots__ = ('chunk_data', 'light_data', 'size', '_chunk', '_light')
+
+    chunk_data: bytes
+    light_data: bytes | None
+    size: int
+
+    _chunk: _ChunkData | None
+    _light: _UpdateLight | None
+
+    def __init__(self, chunk_data: bytes) -> None:
+
+        self.chunk_data = chunk_data
+        self.light_data = None
+        self.size = len(chunk_data)
+
+        self._chunk = None
+        self._light = None
+
+    @property
+    def chunk(self) -> _ChunkData:
+
+        if self._chunk is None:
+            self._chunk = _ChunkData(self.chunk_data)
+
+        return self._chunk
+
+    @property
+    def light(self) -> _UpdateLight | None:
+
+        if self._light is None and self.light_data is not None:
+            self._light = _UpdateLight(self.light_data)
+
+        return self._light
+
+    def set_light(self, light_data: bytes) -> None:
+
+        self.light_data = light_data
+        self._light = None
+
+    def drop_decoded(self) -> None:
+
+        self._chunk = None
+        self._light = None
+
+
+class ChunkCache:
+
+    """The chunks the server has sent over a connection.
+
+    Feed it the clientbound play packets with `update()` to keep it up to
+    date. Chunks are looked up by their coordinates with `get()`, which
+    counts `hits` and `misses`.
+
+    The payloads of the packets are copied, so they don't keep the receive
+    buffers alive, and `bytes_held` accounts for them. Once that exceeds
+    `max_bytes`, the least recently sent or looked up chunks are evicted,
+    which is counted in `evictions`. Only the chunk coordinates are read
+    when updating, while the packets are decoded on first access (see
+    `CachedChunk`). The decoded forms are not accounted for, so they are
+    only kept for the `max_decoded` chunks looked up most recently and
+    dropped from the others, which then cost little more than their
+    payloads.
+    """
+
+    max_bytes: int
+    max_decoded: int
+    bytes_held: int
+    hits: int
+    misses: int
+    evictions: int
+
+    _chunks: _OrderedDict[tuple[int, int], CachedChunk]
+    _hot: _OrderedDict[tuple[int, int], CachedChunk]
+
+    def __init__(self, max_bytes: int = 0x4000000,
+                 max_decoded: int = 16) -> None:
+
+        self.max_bytes = max_bytes
+        self.max_decoded = max_decoded
+        self.bytes_held = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._chunks = _OrderedDict()
+        self._hot = _OrderedDict()
+
+    def __len__(self) -> int:
+
+        return len(self._chunks)
+
+    def __contains__(self, key: tuple[int, int]) -> bool:
+
+        return key in self._chunks
+
+    def get(self, chunk_x: int, chunk_z: int) -> CachedChunk | None:
+
+        key = chunk_x, chunk_z
+
+        try:
+            cached = self._chunks[key]
+
+        except KeyError:
+            self.misses += 1
+            return None
+
+        self._chunks.move_to_end(key)
+        self.hits += 1
+
+        hot = self._hot
+        hot[key] = cached
+        hot.move_to_end(key)
+        while len(hot) > self.max_decoded:
+            _, cold = hot.popitem(last=False)
+            cold.drop_decoded()
+
+        return cached
+
+    def update(self, packet: _play.ClientBound) -> None:
+
+        """Update the cache from a packet, ignoring irrelevant ones."""
+
+        # generic ones are passed on undecoded, e.g. in passthrough mode
+        cls = packet.dispatched_class()
+
+        if cls is _ChunkData:
+            data = bytes(packet.field_data())
+            self._add(_chunk_pos(data), CachedChunk(data))
+
+        elif cls is _UpdateLight:
+            data = bytes(packet.field_data())
+            chunk_x, pos = _varint.decode_varint(data)
+            chunk_z, _ = _varint.decode_varint(data, pos)
+            self._set_light((chunk_x, chunk_z), data)
+
+        elif cls is _UnloadChunk:
+            self._remove(_chunk_pos(packet.field_data()))
+
+        elif cls is _JoinGame:
+            self.clear()
+
+    def clear(self) -> None:
+
+        for cached in self._hot.values():
+            cached.drop_decoded()
+
+        self._hot.clear()
+        self._chunks.clear()
+        self.bytes_held = 0
+
+    def _add(self, key: tuple[int, int], cached: CachedChunk) -> None:
+
+        self._remove(key)
+
+        self._chunks[key] = cached
+        self.bytes_held += cached.size
+
+        self._evict()
+
+    def _set_light(self, key: tuple[int, int], light_data: bytes) -> None:
+
+        cached = self._chunks.get(key)
+        if cached is None:
+            _log.debug("light update for unknown chunk {key}", key=key)
+            return
+
+        size = len(light_data)
+        if cached.light_data is not None:
+            size -= len(cached.light_data)
+
+        cached.set_light(light_data)
+        cached.size += size
+        self.bytes_held += size
+
+        self._chunks.move_to_end(key)
+        self._evict()
+
+    def _evict(self) -> None:
+
+        while self.bytes_held > self.max_bytes:
+            key, evicted = self._chunks.popitem(last=False)
+            self.bytes_held -= evicted.size
+            self.evictions += 1
+            self._drop(key, evicted)
+
+    def _remove(self, key: tuple[int, int]) -> None:
+
+        cached = self._chunks.pop(key, None)
+        if cached is not None:
+            self.bytes_held -= cached.size
+            self._drop(key, cached)
+
+    def _drop(self, key: tuple[int, int], cached: CachedChunk) -> None:
+
+        # references held elsewhere must not keep the decoded forms alive
+        cached.drop_decoded()
+        self._hot.pop(key, None)
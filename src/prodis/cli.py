@@ -1,17 +1,90 @@
 #!/usr/bin/env python3
 
+from argparse import (
+    ArgumentParser as _ArgumentParser,
+    ArgumentTypeError as _ArgumentTypeError,
+    Namespace as _Namespace,
+)
+from collections.abc import (
+    Sequence as _Sequence,
+)
+from functools import partial as _partial
+from typing import (
+    Type as _Type,
+)
+
 import trio as _trio
 
+from .packets import play as _play
+from .packets.play import (
+    clientbound as _clientbound,
+    serverbound as _serverbound,
+)
 from .runner import main_coroutine
 
 from .logger import Logger as _Logger
 _log = _Logger(__name__)
 
 
-def main() -> int | None:
+def _packets(arg: str) -> tuple[
+        int | _Type[_play.ClientBound | _play.ServerBound], ...]:
+
+    """Resolve a play packet, given by id or by class name."""
+
+    try:
+        return int(arg, 0),
+
+    except ValueError:
+        pass
+
+    # a name may denote packets in both directions, e.g. PluginMessage
+    types = tuple(
+        cls for cls in (getattr(module, arg, None)
+                        for module in (_clientbound, _serverbound))
+        if isinstance(cls, type)
+        and issubclass(cls, (_play.ClientBound, _play.ServerBound))
+        and cls.id is not None
+    )
+    if not types:
+        raise _ArgumentTypeError(f"unknown play packet {arg!r}")
+
+    return types
+
+
+def parse_args(argv: _Sequence[str] | None = None) -> _Namespace:
+
+    parser = _ArgumentParser(prog='prodis', description="Protocol Dissector")
+    parser.add_argument(
+        '--inspect', nargs='*', type=_packets, metavar='PACKET',
+        help="decode only the play packets given by id or class name and "
+             "pass on the others undecoded (all of them if none are given)",
+    )
+    parser.add_argument(
+        '--chunk-cache-size', type=int, metavar='BYTES',
+        help="cache the chunks sent by the server, up to that many bytes",
+    )
+    parser.add_argument(
+        '--track-entities', action='store_true',
+        help="track the entities sent by the server",
+    )
+    parser.add_argument(
+        '--track-players', action='store_true',
+        help="track the player list sent by the server",
+    )
+
+    args = parser.parse_args(argv)
+    if args.inspect is not None:
+        args.inspect = [entry for types in args.inspect for entry in types]
+
+    return args
+
+
+def main(argv: _Sequence[str] | None = None) -> int | None:
+
+    args = parse_args(argv)
 
     try:
-        _trio.run(main_coroutine,
+        _trio.run(_partial(main_coroutine, **vars(args)),
                   restrict_keyboard_interrupt_to_checkpoints=True)
 
     except _trio.Cancelled as exc:
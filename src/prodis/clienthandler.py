@@ -2,9 +2,14 @@
 
 from __future__ import annotations
 
+from typing import (
+    Type as _Type,
+)
+
 from collections.abc import (
     Awaitable as _Awaitable,
     Coroutine as _Coroutine,
+    Iterable as _Iterable,
 )
 
 import trio as _trio
@@ -15,6 +20,7 @@ from .utils.context import let as _let
 
 from .packets import (
     protocol as _protocol,
+    versions as _versions,
     handshaking as _handshaking,
     status as _status,
     login as _login,
@@ -30,14 +36,26 @@ class ClientHandler:
     _stream: _trio.abc.HalfCloseableStream
     _send_channel: _trio.abc.SendChannel
     _recv_channel: _trio.abc.ReceiveChannel
-
-    def __init__(self, stream: _trio.abc.HalfCloseableStream,
-                 send_channel: _trio.abc.SendChannel,
-                 recv_channel: _trio.abc.ReceiveChannel) -> None:
+    _packet_reader: _PacketReader
+    _inspect: _Iterable[
+        int | _Type[_play.ClientBound | _play.ServerBound]
+    ] | None
+
+    def __init__(
+            self,
+            stream: _trio.abc.HalfCloseableStream,
+            send_channel: _trio.abc.SendChannel,
+            recv_channel: _trio.abc.ReceiveChannel,
+            inspect: _Iterable[
+                int | _Type[_play.ClientBound | _play.ServerBound]
+            ] | None = None,
+    ) -> None:
 
         self._stream = stream
         self._send_channel = send_channel
         self._recv_channel = recv_channel
+        self._inspect = inspect
+        self._packet_reader = _PacketReader(stream, _handshaking.ServerBound)
 
     async def run(self) -> None:
 
@@ -52,7 +70,7 @@ class ClientHandler:
 
         await self._stream.wait_send_all_might_not_block()
 
-        if await self._stream.receive_some(1):
+        if not await self._packet_reader.at_eof():
             raise ValueError("unexpected data while waiting for EOF")
 
     async def _state_machine(self, next_state: _Awaitable) -> None:
@@ -64,11 +82,15 @@ class ClientHandler:
 
     async def _handshaking(self) -> tuple[int, _Coroutine]:
 
-        packet_reader = _PacketReader(self._stream, _handshaking.ServerBound)
+        packet_reader = self._packet_reader
+        packet_reader.packet_type = _handshaking.ServerBound
         async for packet in packet_reader:
 
             assert isinstance(packet, _handshaking.serverbound.Handshake)
-            assert packet.protocol == 757
+            if (packet.next_state == 2
+                    and not _versions.is_supported(packet.protocol)):
+                raise ValueError("unsupported protocol version "
+                                 f"{packet.protocol}")
 
             protocol = packet.protocol
             next_state = {
@@ -87,7 +109,8 @@ class ClientHandler:
 
     async def _status(self) -> _Coroutine | None:
 
-        packet_reader = _PacketReader(self._stream, _status.ServerBound)
+        packet_reader = self._packet_reader
+        packet_reader.packet_type = _status.ServerBound
         packet_writer = _PacketWriter(self._stream)
 
         async for packet in packet_reader:
@@ -119,7 +142,8 @@ class ClientHandler:
 
     async def _login(self) -> _Coroutine | None:
 
-        packet_reader = _PacketReader(self._stream, _login.ServerBound)
+        packet_reader = self._packet_reader
+        packet_reader.packet_type = _login.ServerBound
         packet_writer = _PacketWriter(self._stream)
 
         async for packet in packet_reader:
@@ -138,7 +162,8 @@ class ClientHandler:
 
     async def _play(self) -> _Coroutine | None:
 
-        packet_reader = _PacketReader(self._stream, _play.ServerBound)
+        packet_reader = self._packet_reader
+        packet_reader.packet_type = _play.ServerBound
         packet_writer = _PacketWriter(self._stream)
 
         packet = await self._recv_channel.receive()
@@ -153,6 +178,8 @@ class ClientHandler:
         else:
             raise EOFError("client disconnected")
 
+        packet_reader.inspect = self._inspect
+
         async with _trio.open_nursery() as nursery:
             nursery.start_soon(self._upstream, packet_reader)
             nursery.start_soon(self._downstream, packet_writer)
@@ -166,5 +193,11 @@ class ClientHandler:
 
     async def _downstream(self, packet_writer: _PacketWriter) -> None:
 
-        async for packet in self._recv_channel:
-            await packet_writer.write(packet)
+        async with packet_writer.sending():
+            async for packet in self._recv_channel:
+                if packet_writer.congested:
+                    _log.debug("client is falling behind, "
+                               "{unsent} bytes unsent",
+                               unsent=packet_writer.unsent)
+
+                await packet_writer.write(packet, release=True)
@@ -2,12 +2,25 @@
 
 from __future__ import annotations
 
+from typing import (
+    Type as _Type,
+)
+
+from collections.abc import (
+    Iterable as _Iterable,
+)
+
 import trio as _trio
 
+from .chunkcache import ChunkCache as _ChunkCache
 from .clienthandler import ClientHandler as _ClientHandler
+from .entitytracker import EntityTracker as _EntityTracker
 from .serverhandler import ServerHandler as _ServerHandler
 from .packetmirror import PacketMirror as _PacketMirror
 from .packetmonitor import PacketMonitor as _PacketMonitor
+from .playerlist import PlayerList as _PlayerList
+
+from .packets import play as _play
 
 from .logger import Logger as _Logger
 _log = _Logger(__name__)
@@ -19,6 +32,12 @@ class ClientListener:
     listen_port: int
     connect_host: str
     connect_port: int
+    inspect: _Iterable[
+        int | _Type[_play.ClientBound | _play.ServerBound]
+    ] | None
+    chunk_cache_size: int | None
+    track_entities: bool
+    track_players: bool
 
     _cancel_scope: _trio.CancelScope | None = None
 
@@ -28,12 +47,22 @@ class ClientListener:
             listen_port: int = 25565,
             connect_host: str = 'localhost',
             connect_port: int = 14454,
+            inspect: _Iterable[
+                int | _Type[_play.ClientBound | _play.ServerBound]
+            ] | None = None,
+            chunk_cache_size: int | None = None,
+            track_entities: bool = False,
+            track_players: bool = False,
     ) -> None:
 
         self.listen_host = listen_host
         self.listen_port = listen_port
         self.connect_host = connect_host
         self.connect_port = connect_port
+        self.inspect = inspect
+        self.chunk_cache_size = chunk_cache_size
+        self.track_entities = track_entities
+        self.track_players = track_players
 
     async def _client_connected(
             self,
@@ -58,11 +87,26 @@ class ClientListener:
 
         mon_send, mon_recv = _trio.open_memory_channel(100)
 
-        client_handler = _ClientHandler(client_stream, up_send1, dn_recv1)
-        server_handler = _ServerHandler(server_stream, dn_send2, up_recv2)
+        client_handler = _ClientHandler(client_stream, up_send1, dn_recv1,
+                                        inspect=self.inspect)
+        server_handler = _ServerHandler(server_stream, dn_send2, up_recv2,
+                                        inspect=self.inspect)
         packet_mirror = _PacketMirror(dn_send1, up_recv1, up_send2, dn_recv2,
                                       mon_send)
-        packet_monitor = _PacketMonitor(mon_recv)
+
+        # caching chunks and tracking entities or players cost memory and
+        # time on every packet, so they have to be asked for
+        chunk_cache = (_ChunkCache(self.chunk_cache_size)
+                       if self.chunk_cache_size else None)
+        entity_tracker = _EntityTracker() if self.track_entities else None
+        player_list = _PlayerList() if self.track_players else None
+
+        packet_monitor = _PacketMonitor(
+            mon_recv,
+            chunk_cache=chunk_cache,
+            entity_tracker=entity_tracker,
+            player_list=player_list,
+        )
 
         async with _trio.open_nursery() as nursery:
             nursery.start_soon(client_handler.run)
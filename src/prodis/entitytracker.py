@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+from typing import (
+    Any as _Any,
+    Callable as _Callable,
+    NamedTuple as _NamedTuple,
+)
+
+from collections.abc import (
+    MutableSequence as _MutableSequence,
+)
+
+from array import array as _array
+from math import floor as _floor
+from uuid import UUID as _UUID
+
+from .packets import play as _play
+from .packets.play.clientbound import (
+    SpawnEntity as _SpawnEntity,
+    SpawnLivingEntity as _SpawnLivingEntity,
+    SpawnPlayer as _SpawnPlayer,
+    EntityPosition as _EntityPosition,
+    EntityPositionAndRotation as _EntityPositionAndRotation,
+    EntityRotation as _EntityRotation,
+    EntityHeadLook as _EntityHeadLook,
+    EntityTeleport as _EntityTeleport,
+    DestroyEntities as _DestroyEntities,
+    JoinGame as _JoinGame,
+)
+
+from .utils.varint import (
+    decode_varint as _decode_varint,
+    decode_varints as _decode_varints,
+)
+
+
+# entity type of players in protocol 757, which are spawned without one
+PLAYER = 111
+
+# only the fields of interest are decoded, as defined by the schemas
+_SPAWN_ENTITY = _SpawnEntity.schema.reader(
+    'entity_id', 'entity_uuid', 'entity_type', 'x', 'y', 'z', 'yaw', 'pitch',
+)
+_SPAWN_LIVING_ENTITY = _SpawnLivingEntity.schema.reader(
+    'entity_id', 'entity_uuid', 'entity_type', 'x', 'y', 'z', 'yaw', 'pitch',
+    'head_pitch',
+)
+_SPAWN_PLAYER = _SpawnPlayer.schema.reader(
+    'entity_id', 'player_uuid', 'x', 'y', 'z', 'yaw', 'pitch',
+)
+_POSITION = _EntityPosition.schema.reader(
+    'delta_x', 'delta_y', 'delta_z',
+)
+_POSITION_AND_ROTATION = _EntityPositionAndRotation.schema.reader(
+    'delta_x', 'delta_y', 'delta_z', 'yaw', 'pitch',
+)
+_ROTATION = _EntityRotation.schema.reader('yaw', 'pitch')
+_HEAD_LOOK = _EntityHeadLook.schema.reader('head_yaw')
+_TELEPORT = _EntityTeleport.schema.reader('x', 'y', 'z', 'yaw', 'pitch')
+
+
+class TrackedEntity(_NamedTuple):
+
+    entity_id: int
+    uuid: _UUID
+    type: int
+    x: float
+    y: float
+    z: float
+    yaw: float
+    pitch: float
+    head_yaw: float
+
+
+class EntityTracker:
+
+    """The entities the server has spawned over a connection.
+
+    Feed it the clientbound play packets with `update()` to keep it up to
+    date. The entities are kept in columns of arrays with a row each, which
+    are kept dense when entities are destroyed. They are also indexed by a
+    uniform grid of `cell_size` blocks over their x and z coordinates, so
+    `within()` only has to look at the cells around the queried area.
+    """
+
+    cell_size: float
+
+    _rows: dict[int, int]
+    _ids: _array[int]
+    _uuids: list[_UUID]
+    _types: _array[int]
+    _x: _array[float]
+    _y: _array[float]
+    _z: _array[float]
+    _yaw: _array[float]
+    _pitch: _array[float]
+    _head_yaw: _array[float]
+    _cells: list[tuple[int, int]]
+    _grid: dict[tuple[int, int], set[int]]
+
+    def __init__(self, cell_size: float = 16.0) -> None:
+
+        self.cell_size = cell_size
+        self.clear()
+
+    def __len__(self) -> int:
+
+        return len(self._rows)
+
+    def __contains__(self, entity_id: int) -> bool:
+
+        return entity_id in self._rows
+
+    def get(self, entity_id: int) -> TrackedEntity | None:
+
+        row = self._rows.get(entity_id)
+        if row is None:
+            return None
+
+        return TrackedEntity(entity_id, self._uuids[row], self._types[row],
+                             self._x[row], self._y[row], self._z[row],
+                             self._yaw[row], self._pitch[row],
+                             self._head_yaw[row])
+
+    def within(self, x: float, z: float, radius: float) -> list[int]:
+
+        """Find the ids of the entities within `radius` of x and z."""
+
+        min_cx, min_cz = self._cell(x - radius, z - radius)
+        max_cx, max_cz = self._cell(x + radius, z + radius)
+
+        grid = self._grid
+        if (max_cx - min_cx + 1) * (max_cz - min_cz + 1) <= len(grid):
+            cells = (grid.get((cx, cz))
+                     for cx in range(min_cx, max_cx + 1)
+                     for cz in range(min_cz, max_cz + 1))
+
+        else:
+            # fewer occupied cells than cells in the area
+            cells = (ids for (cx, cz), ids in grid.items()
+                     if min_cx <= cx <= max_cx and min_cz <= cz <= max_cz)
+
+        rows = self._rows
+        xs = self._x
+        zs = self._z
+        r2 = radius * radius
+
+        found = []
+        for ids in cells:
+            if not ids:
+                continue
+
+            for entity_id in ids:
+                row = rows[entity_id]
+                dx = xs[row] - x
+                dz = zs[row] - z
+                if dx * dx + dz * dz <= r2:
+                    found.append(entity_id)
+
+        return found
+
+    def update(self, packet: _play.ClientBound) -> None:
+
+        """Update the tracker from a packet, ignoring irrelevant ones.
+
+        Only the fields of interest are parsed, without decoding the packet.
+        """
+
+        # only the fields needed are read from the packet, whether it has
+        # been dispatched or passed on undecoded, e.g. in passthrough mode
+        handler = self._handlers.get(packet.dispatched_class())
+        if handler is not None:
+            handler(self, packet.field_data())
+
+    def clear(self) -> None:
+
+        self._rows = {}
+        self._ids = _array('i')
+        self._uuids = []
+        self._types = _array('i')
+        self._x = _array('d')
+        self._y = _array('d')
+        self._z = _array('d')
+        self._yaw = _array('f')
+        self._pitch = _array('f')
+        self._head_yaw = _array('f')
+        self._cells = []
+        self._grid = {}
+
+    def _cell(self, x: float, z: float) -> tuple[int, int]:
+
+        size = self.cell_size
+        return _floor(x / size), _floor(z / size)
+
+    def _add(self, entity_id: int, uuid: _UUID, type_: int,
+             x: float, y: float, z: float,
+             yaw: float, pitch: float, head_yaw: float) -> None:
+
+        self._remove(entity_id)
+
+        cell = self._cell(x, z)
+
+        self._rows[entity_id] = len(self._ids)
+        self._ids.append(entity_id)
+        self._uuids.append(uuid)
+        self._types.append(type_)
+        self._x.append(x)
+        self._y.append(y)
+        self._z.append(z)
+        self._yaw.append(yaw)
+        self._pitch.append(pitch)
+        self._head_yaw.append(head_yaw)
+        self._cells.append(cell)
+
+        self._grid.setdefault(cell, set()).add(entity_id)
+
+    def _remove(self, entity_id: int) -> None:
+
+        row = self._rows.pop(entity_id, None)
+        if row is None:
+            return
+
+        self._leave(entity_id, self._cells[row])
+
+        # move the last row into the gap, keeping the columns dense
+        last = len(self._ids) - 1
+        columns: tuple[_MutableSequence[_Any], ...] = (
+            self._ids, self._uuids, self._types,
+            self._x, self._y, self._z,
+            self._yaw, self._pitch, self._head_yaw, self._cells,
+        )
+
+        if row != last:
+            for column in columns:
+                column[row] = column[last]
+
+            self._rows[self._ids[row]] = row
+
+        for column in columns:
+            column.pop()
+
+    def _leave(self, entity_id: int, cell: tuple[int, int]) -> None:
+
+        ids = self._grid[cell]
+        ids.discard(entity_id)
+        if not ids:
+            del self._grid[cell]
+
+    def _move(self, row: int, x: float, y: float, z: float) -> None:
+
+        self._x[row] = x
+        self._y[row] = y
+        self._z[row] = z
+
+        cell = self._cell(x, z)
+        if cell != self._cells[row]:
+            entity_id = self._ids[row]
+            self._leave(entity_id, self._cells[row])
+            self._grid.setdefault(cell, set()).add(entity_id)
+            self._cells[row] = cell
+
+    def _spawn_entity(self, data: memoryview) -> None:
+
+        entity_id, uuid, type_, x, y, z, yaw, pitch = _SPAWN_ENTITY(data)
+        self._add(entity_id, uuid, type_, x, y, z, yaw, pitch, yaw)
+
+    def _spawn_living_entity(self, data: memoryview) -> None:
+
+        # the head pitch of living entities is actually their head yaw
+        (entity_id, uuid, type_, x, y, z, yaw, pitch,
+         head_yaw) = _SPAWN_LIVING_ENTITY(data)
+        self._add(entity_id, uuid, type_, x, y, z, yaw, pitch, head_yaw)
+
+    def _spawn_player(self, data: memoryview) -> None:
+
+        entity_id, uuid, x, y, z, yaw, pitch = _SPAWN_PLAYER(data)
+        self._add(entity_id, uuid, PLAYER, x, y, z, yaw, pitch, yaw)
+
+    def _row(self, data: memoryview) -> tuple[int | None, int]:
+
+        # the entity id comes first, and the other fields are only decoded
+        # for the entities tracked
+        entity_id, pos = _decode_varint(data)
+        return self._rows.get(entity_id), pos
+
+    def _relative_move(self, data: memoryview) -> None:
+
+        row, pos = self._row(data)
+        if row is not None:
+            self._move_by(row, *_POSITION(data, pos))
+
+    def _relative_move_and_rotate(self, data: memoryview) -> None:
+
+        row, pos = self._row(data)
+        if row is None:
+            return
+
+        dx, dy, dz, yaw, pitch = _POSITION_AND_ROTATION(data, pos)
+        self._move_by(row, dx, dy, dz)
+        self._yaw[row] = yaw
+        self._pitch[row] = pitch
+
+    def _move_by(self, row: int, dx: float, dy: float, dz: float) -> None:
+
+        self._move(row, self._x[row] + dx, self._y[row] + dy,
+                   self._z[row] + dz)
+
+    def _rotate(self, data: memoryview) -> None:
+
+        row, pos = self._row(data)
+        if row is not None:
+            self._yaw[row], self._pitch[row] = _ROTATION(data, pos)
+
+    def _head_look(self, data: memoryview) -> None:
+
+        row, pos = self._row(data)
+        if row is not None:
+            self._head_yaw[row], = _HEAD_LOOK(data, pos)
+
+    def _teleport(self, data: memoryview) -> None:
+
+        row, pos = self._row(data)
+        if row is None:
+            return
+
+        x, y, z, yaw, pitch = _TELEPORT(data, pos)
+        self._move(row, x, y, z)
+        self._yaw[row] = yaw
+        self._pitch[row] = pitch
+
+    def _destroy(self, data: memoryview) -> None:
+
+        n, pos = _decode_varint(data)
+        if n < 0:
+            raise ValueError("negative number of entities")
+
+        entity_ids, _ = _decode_varints(data, n, pos)
+        for entity_id in entity_ids:
+            self._remove(entity_id)
+
+    def _join_game(self, data: memoryview) -> None:
+
+        self.clear()
+
+    _handlers: dict[type | None,
+                    _Callable[[EntityTracker, memoryview], None]] = {
+        _SpawnEntity: _spawn_entity,
+        _SpawnLivingEntity: _spawn_living_entity,
+        _SpawnPlayer: _spawn_player,
+        _EntityPosition: _relative_move,
+        _EntityPositionAndRotation: _relative_move_and_rotate,
+        _EntityRotation: _rotate,
+        _EntityHeadLook: _head_look,
+        _EntityTeleport: _teleport,
+        _DestroyEntities: _destroy,
+        _JoinGame: _join_game,
+    }
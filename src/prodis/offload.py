@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+from typing import (
+    TypeVar as _TypeVar,
+)
+
+from collections.abc import (
+    Callable as _Callable,
+)
+
+import os as _os
+
+import trio as _trio
+
+from .logger import Logger as _Logger
+_log = _Logger(__name__)
+
+
+_T = _TypeVar('_T')
+
+# frames at least this large are (de)compressed in a worker thread
+DEFAULT_SIZE = 0x10000
+
+limiter = _trio.CapacityLimiter(_os.cpu_count() or 4)
+
+
+async def run_sync(fn: _Callable[..., _T], *args) -> _T:
+
+    """Run CPU heavy work like (de)compression in a worker thread.
+
+    zlib releases the GIL, so this keeps large frames from stalling the I/O
+    of all other connections. The number of worker threads is bounded by
+    the shared `limiter`, whose `total_tokens` can be adjusted.
+    """
+
+    return await _trio.to_thread.run_sync(fn, *args, limiter=limiter)
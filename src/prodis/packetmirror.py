@@ -52,5 +52,9 @@ class PacketMirror:
 
         async with recv_channel, send_channel, mirror_channel:
             async for packet in recv_channel:
+                # both the relay and the monitor release the packet, so the
+                # last one of them to be done with it recycles it
+                packet.share()
+
                 await send_channel.send(packet)
                 await mirror_channel.send((direction, packet))
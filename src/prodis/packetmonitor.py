@@ -4,6 +4,11 @@ from __future__ import annotations
 
 import trio as _trio
 
+from .chunkcache import ChunkCache as _ChunkCache
+from .entitytracker import EntityTracker as _EntityTracker
+from .playerlist import PlayerList as _PlayerList
+
+from .packets import play as _play
 from .packets.play.clientbound import ChunkData as _ChunkData
 
 from .logger import Logger as _Logger
@@ -12,22 +17,69 @@ _log = _Logger(__name__)
 
 class PacketMonitor:
 
+    chunk_cache: _ChunkCache | None
+    entity_tracker: _EntityTracker | None
+    player_list: _PlayerList | None
+
     _recv_channel: _trio.abc.ReceiveChannel
 
-    def __init__(self, recv_channel: _trio.abc.ReceiveChannel) -> None:
+    def __init__(self, recv_channel: _trio.abc.ReceiveChannel,
+                 chunk_cache: _ChunkCache | None = None,
+                 entity_tracker: _EntityTracker | None = None,
+                 player_list: _PlayerList | None = None) -> None:
+
+        self.chunk_cache = chunk_cache
+        self.entity_tracker = entity_tracker
+        self.player_list = player_list
 
         self._recv_channel = recv_channel
 
     async def run(self) -> None:
 
         filter_chunkdata = False
+        chunk_cache = self.chunk_cache
+        entity_tracker = self.entity_tracker
+        player_list = self.player_list
 
         async with self._recv_channel:
             async for direction, packet in self._recv_channel:
-                if not direction and isinstance(packet, _ChunkData):
-                    if filter_chunkdata:
-                        continue
-                    filter_chunkdata = True
+                try:
+                    if not direction and isinstance(packet, _play.ClientBound):
+                        if chunk_cache is not None:
+                            chunk_cache.update(packet)
+
+                        if entity_tracker is not None:
+                            entity_tracker.update(packet)
+
+                        if player_list is not None:
+                            player_list.update(packet)
+
+                    # also catches undecoded frames in passthrough mode
+                    if not direction and packet.id == _ChunkData.id:
+                        if filter_chunkdata:
+                            continue
+                        filter_chunkdata = True
+
+                    _log.debug("{symbol} {packet}",
+                               symbol='->' if direction else '<-',
+                               packet=packet)
+
+                finally:
+                    packet.release()
+
+        if chunk_cache is not None:
+            _log.debug("chunk cache: {chunks} chunks in {bytes} bytes, "
+                       "{hits} hits, {misses} misses, {evictions} evictions",
+                       chunks=len(chunk_cache),
+                       bytes=chunk_cache.bytes_held,
+                       hits=chunk_cache.hits,
+                       misses=chunk_cache.misses,
+                       evictions=chunk_cache.evictions)
+
+        if entity_tracker is not None:
+            _log.debug("entity tracker: {entities} entities",
+                       entities=len(entity_tracker))
 
-                _log.debug("{symbol} {packet}",
-                           symbol='->' if direction else '<-', packet=packet)
+        if player_list is not None:
+            _log.debug("player list: {players} players",
+                       players=len(player_list))
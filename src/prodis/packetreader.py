@@ -4,37 +4,164 @@ from __future__ import annotations
 
 from typing import (
     Type as _Type,
+    TypeVar as _TypeVar,
+)
+
+from collections.abc import (
+    Generator as _Generator,
+    Iterable as _Iterable,
 )
 
 import trio as _trio
 
-from .packets import Packet as _Packet
+from . import offload as _offload
+
+from .packets import (
+    Packet as _Packet,
+    MinecraftPacket as _MinecraftPacket,
+    MinecraftPacketWithID as _MinecraftPacketWithID,
+)
 
 from .logger import Logger as _Logger
 _log = _Logger(__name__)
 
 
+_T = _TypeVar('_T')
+
+
 class PacketReader:
 
+    """Read packets of `packet_type` from a trio receive stream.
+
+    Data is pulled from the stream in chunks of up to `chunk_size` bytes and
+    kept in an internal buffer, from which the frames are sliced without
+    copying them. Hence a single `receive_some` call can yield many packets.
+    Frames which are buffered completely are parsed in one go, the others
+    are served to `Packet.request()` as they arrive.
+
+    Since the buffer may hold data belonging to the next protocol state,
+    the same reader should be used for the whole lifetime of the stream,
+    switching `packet_type` as the protocol state changes.
+
+    If `inspect` is set, only packets whose ids or classes are contained in
+    it are decoded into their specific classes. All other frames are passed
+    on as opaque instances of `packet_type` itself, which merely carry the
+    packet id and the undecoded payload.
+
+    Compressed frames of at least `offload_size` bytes are inflated in a
+    worker thread if they are going to be decoded, i.e. if their ids are
+    contained in `inspect` or their classes decode eagerly. Lazy packets
+    otherwise keep their frames compressed, so they can be passed on as is,
+    and only inflate them when a field is first accessed.
+
+    The dispatch table of `packet_type` is looked up on reading the first
+    packet after switching it, so by then `protocol` must have been set to
+    the version the connection uses.
+    """
+
+    chunk_size: int
+    offload_size: int
+
     _receive_stream: _trio.abc.ReceiveStream
+    _buffer: memoryview
+    _pos: int
     _packet_type: _Type[_Packet]
+    _table: tuple[type | None, ...] | None = None
+    _inspect: frozenset[int] | None = None
 
     def __init__(
             self,
             receive_stream: _trio.abc.ReceiveStream,
             packet_type: _Type[_Packet],
+            chunk_size: int = 0x10000,
+            inspect: _Iterable[int | _Type[_Packet]] | None = None,
+            offload_size: int = _offload.DEFAULT_SIZE,
     ) -> None:
 
+        self.packet_type = packet_type
+        self.chunk_size = chunk_size
+        self.inspect = inspect
+        self.offload_size = offload_size
+
         self._receive_stream = receive_stream
-        self._packet_type = packet_type
+        self._buffer = memoryview(b'')
+        self._pos = 0
 
     def __aiter__(self) -> PacketReader:
 
         return self
 
+    @property
+    def packet_type(self) -> _Type[_Packet]:
+
+        return self._packet_type
+
+    @packet_type.setter
+    def packet_type(self, packet_type: _Type[_Packet]) -> None:
+
+        self._packet_type = packet_type
+        self._table = None
+
+    @property
+    def inspect(self) -> frozenset[int] | None:
+
+        """Packet ids to decode, or `None` to decode all packets.
+
+        When setting it, classes not derived from the current `packet_type`
+        are ignored, so the same collection can be used for both directions.
+        """
+
+        return self._inspect
+
+    @inspect.setter
+    def inspect(self, inspect: _Iterable[int | _Type[_Packet]] | None) -> None:
+
+        self._inspect = None if inspect is None else frozenset(
+            entry if isinstance(entry, int) else entry.id
+            for entry in inspect
+            if isinstance(entry, int) or issubclass(entry, self.packet_type)
+        )
+
     async def __anext__(self) -> _Packet:
 
-        requester = self._packet_type.request()
+        packet_type = self.packet_type
+        if not issubclass(packet_type, _MinecraftPacket):
+            return await self._serve(packet_type.request(self._inspect))
+
+        table = self._table
+        if table is None and issubclass(packet_type, _MinecraftPacketWithID):
+            table = self._table = packet_type.dispatch_table()
+
+        # parse frames buffered completely right away, falling back to the
+        # requester protocol for those which still need to be received
+        parsed = packet_type.parse_frame(self._buffer, self._pos,
+                                         self._inspect, table)
+        if parsed is not None:
+            dispatched, frame, self._pos = parsed
+
+        else:
+            dispatched, frame = await self._serve(
+                packet_type.request_frame(self._inspect, table)
+            )
+
+        # frames passed on undecoded are left alone, possibly never inflated
+        if (dispatched is not packet_type and not frame.inflated
+                and frame.size >= self.offload_size
+                and self._decoding(dispatched, frame.id)):
+            await _offload.run_sync(frame.uncompressed)
+
+        return dispatched.from_frame(frame)
+
+    def _decoding(self, dispatched: type, id_: int | None) -> bool:
+
+        if not getattr(dispatched, 'lazy', False):
+            return True
+
+        inspect = self._inspect
+        return inspect is not None and id_ in inspect
+
+    async def _serve(self, requester: _Generator[int, memoryview, _T]) -> _T:
+
         data = None
 
         while True:
@@ -44,15 +171,43 @@ class PacketReader:
             except StopIteration as exc:
                 return exc.value
 
-            data = await self._receive_stream.receive_some(num_bytes)
-            if not data:
+            if not await self._fill(num_bytes):
                 raise StopAsyncIteration
 
-            while len(data) < num_bytes:
-                more_data = await self._receive_stream.receive_some(
-                    num_bytes - len(data)
-                )
-                if not more_data:
-                    raise StopAsyncIteration
+            start = self._pos
+            self._pos += num_bytes
+            data = self._buffer[start:self._pos]
+
+    async def at_eof(self) -> bool:
+
+        """Check whether the stream has been exhausted.
+
+        In contrast to reading from the stream directly, this takes into
+        account data that has already been buffered.
+        """
+
+        return not await self._fill(1)
+
+    async def _fill(self, num_bytes: int) -> bool:
+
+        available = len(self._buffer) - self._pos
+        if available >= num_bytes:
+            return True
+
+        chunks = [self._buffer[self._pos:]] if available else []
+
+        while available < num_bytes:
+            data = await self._receive_stream.receive_some(
+                max(self.chunk_size, num_bytes - available)
+            )
+            if not data:
+                break
+
+            chunks.append(data)
+            available += len(data)
+
+        self._buffer = memoryview(chunks[0] if len(chunks) == 1
+                                  else b''.join(chunks))
+        self._pos = 0
 
-                data += more_data
+        return available >= num_bytes
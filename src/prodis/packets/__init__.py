@@ -1,9 +1,18 @@
 #!/usr/bin/env python
 
 from .packet import (
+    Frame,
     Packet,
     MinecraftPacket,
     MinecraftPacketWithID,
     protocol,
     compression,
+    max_uncompressed,
+    compression_policy,
+    pool_debug,
+)
+
+from .policy import (
+    CompressionPolicy,
+    CompressionStats,
 )
@@ -2,16 +2,10 @@
 
 from __future__ import annotations
 
-from collections.abc import (
-    Iterator as _Iterator,
-)
-
-from itertools import islice as _islice
-
 from ..packet import MinecraftPacketWithID as _MinecraftPacketWithID
 
-from ...utils import byte as _byte
-from ...utils import iter as _iter
+from .. import schema as _schema
+from .. import versions as _versions
 
 
 class Packet(_MinecraftPacketWithID):
@@ -23,51 +17,29 @@ class Handshake(Packet):
 
     id = 0x0
 
-    def __init__(
-            self,
-            address: str = 'localhost',
-            port: int = 25565,
-            next_state: int = None,
-            protocol: int = 757,
-    ) -> None:
+    schema = _schema.Schema(
+        _schema.VarInt('protocol', default=757),
+        _schema.String('address', default='localhost'),
+        _schema.UShort('port', default=25565),
+        _schema.UByte('next_state', default=None),
+    )
+
+    def __init__(self, address: str = 'localhost', port: int = 25565,
+                 next_state: int | None = None,
+                 protocol: int = 757) -> None:
 
+        # the protocol comes first on the wire, but last as an argument
         super().__init__()
 
+        self.protocol = protocol
         self.address = address
         self.port = port
         self.next_state = next_state
-        self.protocol = protocol
-
-    def __getstate__(self) -> dict[str, object]:
-
-        return {key: getattr(self, key) for key in [
-            'address',
-            'port',
-            'next_state',
-            'protocol',
-        ]}
-
-    @property
-    def payload(self) -> bytes | bytearray:
-
-        return b'%b%b%b%c' % (
-            _byte.render_varint(self.protocol),
-            _byte.render_varstr(self.address),
-            self.port.to_bytes(2, 'big'),
-            self.next_state,
-        )
-
-    @payload.setter
-    def payload(self, it: bytes | bytearray | _Iterator[int]) -> None:
-
-        it = iter(it)
 
-        self.protocol = _iter.consume_varint(it)
-        self.address = _iter.consume_varstr(it)
-        self.port = int.from_bytes(_islice(it, 2), 'big')
-        self.next_state, = it
+    def _validate(self) -> None:
 
-        assert self.protocol == 757
         assert self.address
         assert self.port > 0
         assert self.next_state in [1, 2]
+        # status can be queried by any version, even an unknown one (-1)
+        assert self.next_state == 1 or _versions.is_supported(self.protocol)
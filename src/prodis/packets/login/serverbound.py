@@ -2,17 +2,13 @@
 
 from __future__ import annotations
 
-from collections.abc import (
-    Iterator as _Iterator,
-)
-
 from ..packet import MinecraftPacketWithID as _MinecraftPacketWithID
 
-from ...utils import byte as _byte
-from ...utils import iter as _iter
+from .. import schema as _schema
+from .. import versions as _versions
 
 
-class Packet(_MinecraftPacketWithID):
+class Packet(_MinecraftPacketWithID, versions=_versions.V1_18):
 
     pass
 
@@ -21,26 +17,6 @@ class LoginStart(Packet):
 
     id = 0x0
 
-    def __init__(self, name: str = None) -> None:
-
-        super().__init__()
-
-        self.name = name
-
-    def __getstate__(self) -> dict[str, object]:
-
-        return {key: getattr(self, key) for key in [
-            'name',
-        ]}
-
-    @property
-    def payload(self) -> bytes | bytearray:
-
-        return _byte.render_varstr(self.name)
-
-    @payload.setter
-    def payload(self, it: bytes | bytearray | _Iterator[int]) -> None:
-
-        it = iter(it)
-        self.name = _iter.consume_varstr(it)
-        () = it
+    schema = _schema.Schema(
+        _schema.String('name', default=None),
+    )
@@ -3,36 +3,55 @@
 from __future__ import annotations
 
 from typing import (
+    TYPE_CHECKING as _TYPE_CHECKING,
+    Any as _Any,
+    SupportsIndex as _SupportsIndex,
+    cast as _cast,
     Type as _Type,
 )
 
 from collections.abc import (
+    Container as _Container,
     Generator as _Generator,
     Iterable as _Iterable,
     Iterator as _Iterator,
 )
 
 from zlib import (
-    compress as _compress,
-    decompress as _decompress,
+    decompressobj as _decompressobj,
 )
 
+import inspect as _inspect
+
 from ..utils import fmt as _fmt
 from ..utils import byte as _byte
+from ..utils import inflate as _inflate
 from ..utils import iter as _iter
 from ..utils import parse as _parse
 
+from .policy import CompressionPolicy as _CompressionPolicy
+from .schema import Schema as _Schema
+from . import versions as _versions
+
+import copyreg as _copyreg
+
+from types import MemberDescriptorType as _MemberDescriptorType
+
 from contextvars import ContextVar as _ContextVar
 
-protocol = _ContextVar('protocol')
+protocol: _ContextVar[int] = _ContextVar('protocol')
 compression = _ContextVar('compression', default=-1)
+max_uncompressed = _ContextVar('max_uncompressed', default=0x800000)
+compression_policy = _ContextVar('compression_policy',
+                                 default=_CompressionPolicy())
+pool_debug = _ContextVar('pool_debug', default=False)
 
 
 class Packet:
 
-    __raw_data: bytes | bytearray = None
+    __slots__ = ('__raw_data',)
 
-    def __init__(self, payload: bytes | bytearray = None) -> None:
+    def __init__(self, payload: bytes | bytearray | None = None) -> None:
 
         super().__init__()
 
@@ -45,12 +64,25 @@ class Packet:
 
     def __getstate__(self) -> dict[str, object]:
 
-        return ({'payload': self.payload} if type(self) is Packet
-                else self.__dict__)
+        """Return the fields, as passed to `__init__` by `__setstate__`.
+
+        They are read as attributes, whether kept in slots or not.
+        """
+
+        return {name: getattr(self, name)
+                for name in type(self)._field_names() if hasattr(self, name)}
+
+    def __reduce_ex__(self, protocol: _SupportsIndex) -> tuple:
+
+        state = {k: bytes(v) if isinstance(v, memoryview) else v
+                 for k, v in self.__getstate__().items()}
+
+        return _copyreg.__newobj__, (type(self),), state
 
     def __repr__(self) -> str:
 
-        args = (f"{k}={v!r}" for k, v in self.__getstate__().items())
+        args = (f"{k}={bytes(v) if isinstance(v, memoryview) else v!r}"
+                for k, v in self.__getstate__().items())
         return f"{type(self).__qualname__}({', '.join(args)})"
 
     def __str__(self) -> str:
@@ -67,157 +99,848 @@ class Packet:
         return f"<{' '.join(f'{b:02x}' for b in payload)}>"
 
     @classmethod
-    def _request_payload(cls) -> _Generator[
-            int, bytes | bytearray, tuple[_Type[Packet], bytes | bytearray]]:
+    def _field_names(cls) -> tuple[str, ...]:
+
+        """Return the names of the fields, i.e. the `__init__` parameters."""
+
+        return tuple(
+            name for name, param in _inspect.signature(
+                cls.__init__
+            ).parameters.items()
+            if name != 'self' and param.kind in (
+                param.POSITIONAL_OR_KEYWORD,
+                param.KEYWORD_ONLY,
+            )
+        )
+
+    @classmethod
+    def _request_payload(
+            cls, inspect: _Container[int] | None = None,
+    ) -> _Generator[
+            int, bytes | memoryview, tuple[_Type[Packet], bytes | memoryview]]:
 
         raise NotImplementedError
 
     @classmethod
-    def request(cls) -> _Generator[int, bytes | bytearray, Packet]:
+    def request(cls, inspect: _Container[int] | None = None) -> _Generator[
+            int, bytes | memoryview, Packet]:
 
-        dispatched, payload = yield from cls._request_payload()
+        dispatched, payload = yield from cls._request_payload(inspect)
         packet = dispatched.__new__(dispatched)
         packet.payload = payload
 
         return packet
 
     @classmethod
-    def _wrap(cls, data: bytes | bytearray) -> bytes | bytearray:
+    def _wrap(cls, data: bytes | bytearray | memoryview
+              ) -> bytes | bytearray | memoryview:
 
         return data
 
-    def wrapped(self) -> bytes | bytearray:
+    def wrapped(self) -> bytes | bytearray | memoryview:
 
         return self._wrap(self.payload)
 
+    def wrapping_cost(self) -> int:
+
+        """Estimate how many bytes `wrapped()` has to (de)compress."""
+
+        return 0
+
     @property
-    def payload(self) -> bytes | bytearray:
+    def payload(self) -> bytes | memoryview:
 
-        return self.__raw_data
+        try:
+            return self.__raw_data
+
+        except AttributeError:
+            return None
 
     @payload.setter
     def payload(self, it: bytes | bytearray | _Iterable[int]) -> None:
 
-        self.__raw_data = bytes(it)
+        self.__raw_data = it if isinstance(it, bytes) else _byte.view(it)
+
+
+class Frame:
+
+    """Frame a packet has been received in.
+
+    Keeps the frame data following the length prefix together with the
+    compression threshold in effect, so the frame can be sent on verbatim as
+    long as the packet is unchanged and the threshold matches. Compressed
+    data is only inflated once the uncompressed data is actually needed, and
+    never beyond `limit` bytes (`max_uncompressed` at the time of receipt).
+    """
+
+    __slots__ = ('data', 'threshold', 'limit', 'id', 'offset', '_pos',
+                 '_size', '_uncompressed')
+
+    data: memoryview
+    threshold: int
+    limit: int
+    id: int | None
+    offset: int
+
+    def __init__(self, data: memoryview, threshold: int,
+                 limit: int | None = None) -> None:
+
+        self.data = data
+        self.threshold = threshold
+        self.limit = max_uncompressed.get() if limit is None else limit
+        self.id = None
+        self.offset = 0
+
+        if threshold < 0:
+            self._pos = self._size = 0
+            self._uncompressed = data
+            return
+
+        self._size, self._pos = _byte.parse_varint(data)
+        if self._size > self.limit:
+            raise ValueError(f"declared uncompressed size {self._size} "
+                             f"exceeds {self.limit} bytes")
+
+        self._uncompressed = None if self._size else data[self._pos:]
+
+    def peek(self, n: int) -> bytes | memoryview:
+
+        """Return (at most) the first `n` bytes of the uncompressed data."""
+
+        if self._uncompressed is not None:
+            return self._uncompressed[:n]
+
+        # feed small pieces to avoid copying the whole unconsumed input
+        decompressor = _decompressobj()
+        data = self.data[self._pos:]
+        result = b''
+
+        for pos in range(0, len(data), 0x100):
+            result += decompressor.decompress(data[pos:pos + 0x100],
+                                              n - len(result))
+            if len(result) >= n or decompressor.eof:
+                break
+
+        return result
+
+    def uncompressed(self) -> memoryview:
+
+        if self._uncompressed is None:
+            self._uncompressed = memoryview(_inflate.inflate(
+                self.data[self._pos:], self._size, self.limit
+            ))
+
+        return self._uncompressed
+
+    def uncompressed_chunks(
+            self,
+            chunk_size: int = 0x10000,
+    ) -> _Iterator[bytes | memoryview]:
+
+        """Iterate over the uncompressed data without inflating it at once.
+
+        This allows a decoder to process large frames incrementally. Data
+        that is already uncompressed is yielded as a single view.
+        """
+
+        if self._uncompressed is not None:
+            yield self._uncompressed
+            return
+
+        yield from _inflate.inflate_chunks(self.data[self._pos:],
+                                           self._size, chunk_size)
+
+    @property
+    def inflated(self) -> bool:
+
+        return self._uncompressed is not None
+
+    @property
+    def size(self) -> int:
+
+        """Size of the uncompressed data."""
+
+        if self._uncompressed is not None:
+            return len(self._uncompressed)
+
+        return self._size
+
+    def payload(self) -> memoryview:
+
+        return self.uncompressed()[self.offset:]
+
+    def wire(self) -> bytes:
+
+        return _byte.render_varint(len(self.data)) + self.data
 
 
 class MinecraftPacket(Packet):
 
-    _payload: bytes | bytearray = None
+    __slots__ = ('_payload', '_frame')
+
+    _payload: bytes | memoryview | None
+    _frame: Frame | None
+
+    def __new__(cls, *args, **kwargs) -> MinecraftPacket:
 
-    def __init__(self, payload: bytes | bytearray = None) -> None:
+        self = super().__new__(cls)
+        self._payload = None
+        self._frame = None
+
+        return self
+
+    def __init__(self, payload: bytes | bytearray | None = None) -> None:
 
         super().__init__()
 
         if payload is not None:
             self.payload = payload
 
-    def __getstate__(self) -> dict[str, object]:
+    @classmethod
+    def request_frame(
+            cls,
+            inspect: _Container[int] | None = None,
+            table: tuple[type | None, ...] | None = None,
+    ) -> _Generator[int, bytes | memoryview, tuple[_Type[Packet], Frame]]:
 
-        return ({'payload': self.payload} if type(self) is MinecraftPacket
-                else self.__dict__)
+        """Request a frame and determine the class of its packet.
 
-    @classmethod
-    def _request_payload(cls) -> _Generator[
-            int, bytes | bytearray, tuple[_Type[Packet], bytes | bytearray]]:
+        Packet classes are looked up in `table`, by default the one
+        `dispatch_table()` returns, if the class has any.
+        """
 
         n = yield from _parse.request_varint()
-        data = yield n
+        data = _byte.view((yield n))
+
+        return cls._dispatch(Frame(data, compression.get()), inspect, table)
+
+    @classmethod
+    def parse_frame(
+            cls,
+            data: bytes | bytearray | memoryview,
+            start: int = 0,
+            inspect: _Container[int] | None = None,
+            table: tuple[type | None, ...] | None = None,
+    ) -> tuple[_Type[Packet], Frame, int] | None:
+
+        """Parse a frame from a buffer at an offset, like `request_frame()`.
 
-        if compression.get() >= 0:
-            u, pos = _byte.parse_varint(data)
-            data = data[pos:]
+        Returns the packet class, the frame and the offset following it, or
+        `None` if the buffer doesn't hold the complete frame yet.
+        """
 
-            if u:
-                data = _decompress(data, bufsize=u)
-                assert len(data) == u
+        data = _byte.view(data)
 
-        return cls, data
+        try:
+            n, start = _byte.parse_varint(data, start)
+
+        except ValueError:
+            # possibly truncated, leave it to the requester protocol
+            return None
+
+        if n < 0:
+            raise ValueError("negative frame length")
+
+        end = start + n
+        if end > len(data):
+            return None
 
-    # TODO: def unwrap(self, ...):
+        dispatched, frame = cls._dispatch(Frame(data[start:end],
+                                                compression.get()),
+                                          inspect, table)
+        return dispatched, frame, end
 
     @classmethod
-    def _wrap(cls, data: bytes | bytearray) -> bytes | bytearray:
+    def _dispatch(cls, frame: Frame, inspect: _Container[int] | None = None,
+                  table: tuple[type | None, ...] | None = None) -> tuple[
+            _Type[Packet], Frame]:
+
+        return cls, frame
+
+    @classmethod
+    def _request_payload(
+            cls, inspect: _Container[int] | None = None,
+    ) -> _Generator[
+            int, bytes | memoryview, tuple[_Type[Packet], bytes | memoryview]]:
+
+        dispatched, frame = yield from cls.request_frame(inspect)
+
+        return dispatched, frame.payload()
+
+    @classmethod
+    def request(cls, inspect: _Container[int] | None = None) -> _Generator[
+            int, bytes | memoryview, Packet]:
+
+        dispatched, frame = yield from cls.request_frame(inspect)
+
+        return dispatched.from_frame(frame)
+
+    @classmethod
+    def from_frame(cls, frame: Frame) -> MinecraftPacket:
+
+        packet = cls.__new__(cls)
+        packet._set_frame(frame)
+
+        return packet
+
+    def _set_frame(self, frame: Frame) -> None:
+
+        # without a way to tell whether the packet is modified later on,
+        # the frame cannot be reused, so just decode the payload right away
+        self.payload = frame.payload()
+
+    def _unwrapped_payload(self) -> bytes | memoryview:
+
+        if self._payload is None and self._frame is not None:
+            self._payload = self._frame.payload()
+
+        return self._payload
+
+    def _is_pristine(self) -> bool:
+
+        return True
+
+    def _reusable_frame(self) -> Frame | None:
+
+        frame = self._frame
+        if (frame is not None and frame.threshold == compression.get()
+                and self._is_pristine()):
+            return frame
+
+        return None
+
+    def wrapped(self) -> bytes | bytearray:
+
+        if (frame := self._reusable_frame()) is not None:
+            return frame.wire()
+
+        return super().wrapped()
+
+    def wrapping_cost(self) -> int:
+
+        if self._reusable_frame() is not None:
+            return 0
+
+        frame = self._frame
+        cost = 0
+
+        if frame is not None:
+            size = frame.size
+            if not frame.inflated:
+                cost += size
+
+        elif self._payload is not None:
+            size = len(self._payload)
+
+        else:
+            return 0
+
+        if 0 <= compression.get() <= size:
+            cost += size
+
+        return cost
+
+    @classmethod
+    def _wrap(cls, data: bytes | bytearray | memoryview
+              ) -> bytes | bytearray:
 
         if (threshold := compression.get()) >= 0:
-            if (u := len(data)) >= threshold:
-                data = _byte.render_varint(u) + _compress(data, level=1)
+            if ((u := len(data)) >= threshold and (
+                    compressed := compression_policy.get().compress(cls, data)
+            ) is not None):
+                data = _byte.render_varint(u) + compressed
             else:
                 data = b'\x00' + data
 
         return _byte.render_varint(len(data)) + data
 
     @property
-    def payload(self) -> bytes | bytearray:
+    def payload(self) -> bytes | memoryview:
 
         return self._payload
 
     @payload.setter
     def payload(self, it: bytes | bytearray | _Iterable[int]) -> None:
 
-        self._payload = bytes(it)
+        self._payload = it if isinstance(it, bytes) else _byte.view(it)
+        self._frame = None
+
+
+_PENDING, _DECODING, _DECODED, _RELEASED = range(1, 5)
+
+
+def _released_error(packet: MinecraftPacketWithID) -> RuntimeError:
+
+    return RuntimeError(f"{type(packet).__name__} packet used after release")
+
+
+class _DictMember:
+
+    """Stand-in for the member descriptor of a slot, for unslotted fields."""
+
+    __slots__ = ('name',)
+
+    def __init__(self, name: str) -> None:
+
+        self.name = name
+
+    def __get__(self, instance: object, owner: type | None = None) -> object:
+
+        try:
+            return instance.__dict__[self.name]
+
+        except KeyError:
+            raise AttributeError(self.name) from None
+
+    def __set__(self, instance: object, value: object) -> None:
+
+        instance.__dict__[self.name] = value
+
+
+class _GuardedField:
+
+    """Field of a pooled packet, which must not be used after release.
+
+    Values live in the slot (or else the instance `__dict__` entry) the
+    descriptor replaces.
+    """
+
+    __slots__ = ('name', 'member')
+
+    name: str
+    member: _Any
+
+    def __init__(self, name: str, member: object = None) -> None:
+
+        self.name = name
+        self.member = member if member is not None else _DictMember(name)
+
+    def __get__(self, instance: MinecraftPacketWithID | None,
+                owner: type | None = None) -> object:
+
+        if instance is None:
+            return self
+
+        if instance._lazy == _RELEASED:
+            raise _released_error(instance)
+
+        return self.member.__get__(instance, owner)
+
+    def __set__(self, instance: MinecraftPacketWithID, value: object) -> None:
+
+        if instance._lazy == _RELEASED:
+            raise _released_error(instance)
+
+        self.member.__set__(instance, value)
+
+
+class _LazyField(_GuardedField):
+
+    """Field of a lazy packet, decoded from the raw payload on first access.
+
+    Decoded values are ignored while the packet is pending decoding.
+    Assigning a field decodes the remaining ones first, since afterwards the
+    raw payload no longer represents the packet.
+    """
+
+    __slots__ = ()
+
+    def __get__(self, instance: MinecraftPacketWithID | None,
+                owner: type | None = None) -> object:
+
+        if instance is None:
+            return self
+
+        lazy = instance._lazy
+        if lazy == _PENDING:
+            instance._decode()
+        elif lazy == _RELEASED:
+            raise _released_error(instance)
+
+        return self.member.__get__(instance, owner)
+
+    def __set__(self, instance: MinecraftPacketWithID, value: object) -> None:
+
+        lazy = instance._lazy
+        if lazy == _PENDING:
+            instance._decode()
+        elif lazy == _RELEASED:
+            raise _released_error(instance)
+
+        if lazy != _DECODING:
+            instance._lazy = None
+            instance._frame = None
+
+        self.member.__set__(instance, value)
+
+
+def _get_lazy_payload(self: MinecraftPacketWithID) -> bytes | memoryview:
+
+    lazy = self._lazy
+    if lazy == _PENDING or lazy == _DECODED:
+        return self._unwrapped_payload()
+
+    if lazy == _RELEASED:
+        raise _released_error(self)
+
+    return self._encode_payload()
+
+
+def _get_guarded_payload(self: MinecraftPacketWithID) -> bytes | memoryview:
+
+    if self._lazy == _RELEASED:
+        raise _released_error(self)
+
+    return self._encode_payload()
+
+
+def _set_lazy_payload(self: MinecraftPacketWithID,
+                      it: bytes | bytearray | _Iterable[int]) -> None:
+
+    self._payload = it if isinstance(it, bytes) else _byte.view(it)
+    self._frame = None
+    self._lazy = _PENDING
+
+
+def _set_lazy_frame(self: MinecraftPacketWithID, frame: Frame) -> None:
+
+    self._payload = None
+    self._frame = frame
+    self._lazy = _PENDING
 
 
 class _WithID(type):
 
+    def __new__(mcs, name: str, bases: tuple[type, ...],
+                namespace: dict[str, object], **kwargs) -> _WithID:
+
+        # packets are compact by default: generic classes add no slots and
+        # the others one for each field of their schema, if they have one
+        if '__slots__' not in namespace:
+            schema = namespace.get('schema')
+            if schema is not None:
+                namespace['__slots__'] = schema.names
+            elif namespace.get('id') is None:
+                namespace['__slots__'] = ()
+
+        return super().__new__(mcs, name, bases, namespace, **kwargs)
+
     def __call__(
             cls: _Type[MinecraftPacketWithID],
-            payload: bytes | bytearray = None,
+            *args,
             **kwargs
     ) -> MinecraftPacketWithID:
 
-        if payload is None:
-            packet = cls.__new__(cls, **kwargs)
-            packet.__init__(**kwargs)
+        # a lone bytes-like argument is the payload, anything else fields
+        if (len(args) != 1 or kwargs
+                or not isinstance(args[0], (bytes, bytearray, memoryview))):
+            packet = cls.__new__(cls, *args, **kwargs)
+            packet.__init__(*args, **kwargs)
             return packet
 
-        if kwargs:
-            raise TypeError("cannot have both data and arguments")
+        payload, = args
 
         if cls.id is not None or not hasattr(cls, 'packet_types'):
             packet = cls.__new__(cls)
             packet.payload = payload
             return packet
 
+        payload = _byte.view(payload)
         id_, start = _byte.parse_varint(payload)
 
-        if id_ not in cls.packet_types:
+        table = cls.dispatch_table()
+        dispatched = table[id_] if 0 <= id_ < len(table) else None
+
+        if dispatched is None:
             packet = cls.__new__(cls)
             packet.payload = payload
             return packet
 
-        dispatched = cls.packet_types[id_]
-
         packet = dispatched.__new__(dispatched)
         packet.payload = payload[start:]
         return packet
 
 
+class _GenericID:
+
+    """The `id` of generic packets, which varies per instance.
+
+    Subclasses for specific packets shadow it with their class attribute.
+    """
+
+    __slots__ = ()
+
+    def __get__(self, instance: MinecraftPacketWithID | None,
+                owner: type | None = None) -> int | None:
+
+        return None if instance is None else instance._id
+
+    def __set__(self, instance: MinecraftPacketWithID, value: int) -> None:
+
+        instance._id = value
+
+
 class MinecraftPacketWithID(MinecraftPacket, metaclass=_WithID):
 
-    id: int = None
-    packet_types: dict[int, _Type[MinecraftPacketWithID]]
+    __slots__ = ('_id', '_lazy', '_owners')
+
+    id: int | None = _GenericID()
+    versions: range | None = None
+    packet_types: dict[int, list[_Type[MinecraftPacketWithID]]]
+    _tables: dict[int | None,
+                  tuple[_Type[MinecraftPacketWithID] | None, ...]]
+
+    schema: _Schema | None = None
+
+    lazy: bool = False
+    _lazy_fields: tuple[str, ...] = ()
+    _id: int | None
+    _lazy: int | None
+
+    pool_size: int = 0
+    _pool: list[MinecraftPacketWithID] | None = None
+    _owners: int
+
+    if _TYPE_CHECKING:
+        # the fields of a schema only come into being along with its class
+        def __getattr__(self, name: str) -> _Any: ...
+
+    def __new__(cls, *args, **kwargs) -> MinecraftPacketWithID:
+
+        pool = cls._pool
+        self = pool.pop() if pool else _cast(MinecraftPacketWithID,
+                                             super().__new__(cls))
+
+        self._id = None
+        self._lazy = None
+        self._owners = 1
+
+        return self
 
     @classmethod
-    def __init_subclass__(cls, **kwargs) -> None:
+    def __init_subclass__(cls, lazy: bool | None = None,
+                          versions: range | None = None, **kwargs) -> None:
 
         super().__init_subclass__(**kwargs)
 
         cls.packet_types = {}
+        cls._tables = {}
+
+        if lazy is not None:
+            cls.lazy = lazy
+
+        if versions is not None:
+            cls.versions = versions
+
+        # each class needs a pool of its own, so it only gets its own kind
+        cls._pool = [] if cls.pool_size else None
 
         if cls.id is None:
             return
 
+        schema = cls.__dict__.get('schema')
+        if schema is not None:
+            schema.build(cls)
+
+        if 'payload' in cls.__dict__:
+            if cls.lazy:
+                cls._make_lazy()
+
+            elif cls.pool_size:
+                cls._guard_released()
+
+        # definitions of a packet for several version ranges share its id
         base = cls
         while hasattr(base, 'packet_types'):
-            assert cls.id not in base.packet_types
-            base.packet_types[cls.id] = cls
+            defined = base.packet_types.setdefault(cls.id, [])
+            assert not any(_versions.overlap(cls.versions, other.versions)
+                           for other in defined)
+            defined.append(cls)
+            base._tables.clear()
             base, = base.__bases__
 
-    def __getstate__(self) -> dict[str, object]:
+    @classmethod
+    def dispatch_table(cls, version: int | None = None) -> tuple[
+            _Type[MinecraftPacketWithID] | None, ...]:
+
+        """Return the packet classes for protocol `version`, indexed by id.
+
+        The version defaults to the one in `protocol`, or else the latest one
+        supported. Ids without a class defined for the version map to `None`.
+        Tables are built on first use and kept until another packet class
+        gets registered, so versions which are never used cost nothing.
+        """
 
-        return ({'payload': self.payload} if type(self).id is None
-                else self.__dict__)
+        if version is None:
+            version = protocol.get(_versions.LATEST)
+
+        try:
+            return cls._tables[version]
+
+        except KeyError:
+            pass
+
+        types = {
+            id_: dispatched
+            for id_, defined in cls.packet_types.items()
+            for dispatched in defined
+            if dispatched.versions is None or version in dispatched.versions
+        }
+        if cls.id is not None and (cls.versions is None
+                                   or version in cls.versions):
+            types[cls.id] = cls
+
+        table = tuple(map(types.get, range(max(types, default=-1) + 1)))
+        cls._tables[version] = table
+
+        return table
+
+    def dispatched_class(self) -> _Type[MinecraftPacketWithID] | None:
+
+        """Return the class the id of the packet dispatches to.
+
+        That is the class of specific packets themselves, while generic ones
+        passed on undecoded look it up in the `dispatch_table()`, so it is
+        `None` if there is no class for their id.
+        """
+
+        cls = type(self)
+        if cls.id is not None:
+            return cls
+
+        id_ = self.id
+        table = cls.dispatch_table()
+        if id_ is None or not 0 <= id_ < len(table):
+            return None
+
+        return table[id_]
+
+    def field_data(self) -> memoryview:
+
+        """Return the encoded fields of the packet, following its id.
+
+        Generic packets are not re-rendered with their id for that, and lazy
+        ones not decoded, so the fields of interest can be parsed from the
+        data received without copying it.
+        """
+
+        if type(self).id is not None:
+            return _byte.view(self.payload)
+
+        payload = self._unwrapped_payload()
+        return _byte.view(b'' if payload is None else payload)
+
+    @classmethod
+    def _make_lazy(cls) -> None:
+
+        """Defer decoding of the payload until a field is accessed.
+
+        The fields are those of the class' schema, or else the parameters of
+        its `__init__`, and each gets a descriptor which triggers decoding by
+        the class' `payload` setter. Until a field is assigned, `payload`
+        returns the raw payload the packet was created from. Note that
+        mutable field values must be reassigned after modifying them in place
+        for this to be noticed.
+        """
+
+        encoded = cls.__dict__['payload']
+        cls._encode_payload = encoded.fget
+        cls._decode_payload = encoded.fset
+
+        cls._lazy_fields = cls._field_names()
+        cls._replace_fields(_LazyField)
+
+        cls.payload = property(_get_lazy_payload, _set_lazy_payload)
+        cls._set_frame = _set_lazy_frame
+
+    @classmethod
+    def _guard_released(cls) -> None:
+
+        """Make use of the packet after release raise a `RuntimeError`.
+
+        Lazy packets check for that when decoding anyway, so this is for
+        pooled classes decoding eagerly, whose fields and payload get
+        descriptors doing the check instead.
+        """
+
+        encoded = cls.__dict__['payload']
+        cls._encode_payload = encoded.fget
+
+        cls._replace_fields(_GuardedField)
+
+        cls.payload = property(_get_guarded_payload, encoded.fset)
+
+    @classmethod
+    def _field_names(cls) -> tuple[str, ...]:
+
+        if cls.schema is not None:
+            return cls.schema.names
+
+        return super()._field_names()
+
+    @classmethod
+    def _replace_fields(cls, descriptor: _Type[_GuardedField]) -> None:
+
+        for name in cls._field_names():
+            member = cls.__dict__.get(name)
+            if not isinstance(member, _MemberDescriptorType):
+                member = None
+
+            setattr(cls, name, descriptor(name, member))
+
+    def share(self, owners: int = 1) -> None:
+
+        """Add `owners` that are going to `release()` the packet as well."""
+
+        self._owners += owners
+
+    def release(self) -> bool:
+
+        """Give up ownership of the packet.
+
+        Once its last owner has released it, the packet is returned to the
+        pool of its class for reuse, if the class has a pool (see
+        `pool_size`). Returns whether this happened, in which case nobody
+        may use the packet anymore. A packet has a single owner, unless more
+        have been added with `share()`.
+
+        With `pool_debug` set, released packets are never reused, so that any
+        further access to their fields or payload raises a `RuntimeError`.
+        """
+
+        cls = type(self)
+        pool = cls._pool
+        if pool is None:
+            return False
+
+        if self._lazy == _RELEASED:
+            raise RuntimeError(f"{cls.__name__} packet released twice")
+
+        self._owners -= 1
+        if self._owners > 0:
+            return False
+
+        self._payload = None
+        self._frame = None
+        self._lazy = _RELEASED
+
+        if len(pool) < cls.pool_size and not pool_debug.get():
+            pool.append(self)
+
+        return True
+
+    def _decode(self) -> None:
+
+        self._lazy = _DECODING
+
+        try:
+            self._decode_payload(self._unwrapped_payload())
+
+        except BaseException:
+            self._lazy = _PENDING
+            raise
+
+        self._lazy = _DECODED
 
     def __str__(self) -> str:
 
@@ -230,29 +953,46 @@ class MinecraftPacketWithID(MinecraftPacket, metaclass=_WithID):
         return f"{cls.__name__}({', '.join(args)})"
 
     @classmethod
-    def _request_payload(cls) -> _Generator[
-            int, bytes | bytearray, tuple[_Type[Packet], bytes | bytearray]]:
+    def _dispatch(cls, frame: Frame, inspect: _Container[int] | None = None,
+                  table: tuple[type | None, ...] | None = None) -> tuple[
+            _Type[Packet], Frame]:
 
-        _, payload = yield from super()._request_payload()
+        id_, frame.offset = _byte.parse_varint(frame.peek(5))
+        frame.id = id_
 
-        id_, start = _byte.parse_varint(payload)
+        if inspect is not None and id_ not in inspect and cls.id is None:
+            return cls, frame
 
-        try:
-            dispatched = cls.packet_types[id_]
+        if table is None:
+            table = cls.dispatch_table()
 
-        except KeyError:
+        dispatched = table[id_] if 0 <= id_ < len(table) else None
+
+        if dispatched is None:
             if cls.id is not None:
                 raise ValueError(f"unknown packet id {id_:#x}")
 
             dispatched = cls
 
-        else:
-            payload = payload[start:]
+        return dispatched, frame
+
+    def _set_frame(self, frame: Frame) -> None:
 
-        return dispatched, payload
+        if type(self).id is not None:
+            super()._set_frame(frame)
+            return
+
+        self.id = frame.id
+        self._payload = None
+        self._frame = frame
+
+    def _is_pristine(self) -> bool:
+
+        return type(self).id is not None or self.id == self._frame.id
 
     @classmethod
-    def _wrap(cls, data: bytes | bytearray) -> bytes | bytearray:
+    def _wrap(cls, data: bytes | bytearray | memoryview
+              ) -> bytes | bytearray:
 
         if cls.id is not None:
             data = _byte.render_varint(cls.id) + data
@@ -265,18 +1005,21 @@ class MinecraftPacketWithID(MinecraftPacket, metaclass=_WithID):
         if type(self).id is not None:
             return self._payload
 
-        if self.id is None and self._payload is None:
+        payload = self._unwrapped_payload()
+        if self.id is None and payload is None:
             return None
 
-        return _byte.render_varint(self.id) + self._payload
+        return _byte.render_varint(self.id) + payload
 
     @payload.setter
     def payload(self, it: bytes | bytearray | _Iterable[int]) -> None:
 
+        self._frame = None
+
         if type(self).id is not None:
-            self._payload = bytes(it)
+            self._payload = it if isinstance(it, bytes) else _byte.view(it)
             return
 
-        it = iter(it)
-        self.id = _iter.consume_varint(it)
-        self._payload = bytes(it)
+        mv = _byte.view(it)
+        self.id, start = _byte.parse_varint(mv)
+        self._payload = mv[start:]
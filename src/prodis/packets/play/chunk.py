@@ -0,0 +1,790 @@
+#!/usr/bin/env python3
+
+"""Chunk data of the play state, decoded lazily.
+
+The sections of a chunk are only split up once they are accessed, and the
+entries of their paletted containers are only unpacked once their values
+are asked for. With NumPy installed, they are unpacked into NumPy arrays by
+vectorised operations, otherwise into `array.array`s.
+
+The entries of direct palettes are as wide as the client derives from the
+sizes of the registries, which default to those of vanilla 1.18. Set
+`block_state_registry_size` and `biome_registry_size` for servers whose
+registries differ, e.g. through data packs adding biomes.
+"""
+
+from __future__ import annotations
+
+from typing import (
+    NamedTuple as _NamedTuple,
+    TypeVar as _TypeVar,
+    overload as _overload,
+)
+
+from collections.abc import (
+    Iterable as _Iterable,
+    Sequence as _Sequence,
+)
+
+from array import array as _array
+from contextvars import ContextVar as _ContextVar
+from struct import (
+    Struct as _Struct,
+    error as _StructError,
+)
+
+from ...utils import byte as _byte
+from ...utils import nbt as _nbt
+from ...utils import optional as _optional
+from ...utils import varint as _varint
+
+
+_SHORT = _Struct('>h')
+_LONG = _Struct('>Q')
+
+_C = _TypeVar('_C', bound='PalettedContainer')
+
+block_state_registry_size = _ContextVar('block_state_registry_size',
+                                        default=20342)
+biome_registry_size = _ContextVar('biome_registry_size', default=61)
+
+
+class PalettedContainer:
+
+    """Values of a chunk section, as sent in a paletted container.
+
+    `bits` is the number of bits per entry and `palette` maps the entries to
+    the actual values. Containers with a direct palette have no `palette`,
+    since their entries are the values themselves, while a single value is
+    sent as a palette without any entries (`bits` 0). `data` holds the
+    entries as big endian longs, which entries don't span.
+
+    Containers are immutable, so use `from_values()` for modified values.
+    """
+
+    __slots__ = ('bits', 'palette', 'data', '_values')
+
+    # subclasses define these according to the kind of values
+    size: int
+    min_bits: int
+    max_indirect_bits: int
+    registry_size: _ContextVar[int]
+
+    bits: int
+    palette: tuple[int, ...] | None
+    data: bytes | memoryview
+
+    _values: _Sequence[int] | None
+
+    def __init__(self, bits: int, palette: tuple[int, ...] | None,
+                 data: bytes | memoryview = b'') -> None:
+
+        self.bits = bits
+        self.palette = palette
+        self.data = data
+        self._values = None
+
+    @classmethod
+    def direct_bits(cls) -> int:
+
+        """Return the bits per entry of direct palettes.
+
+        Like the client, that is the least number of bits holding any value
+        of the registry, whatever the server sends.
+        """
+
+        return max((cls.registry_size.get() - 1).bit_length(), 1)
+
+    @classmethod
+    def parse(cls: type[_C], data: bytes | memoryview, start: int = 0,
+              direct_bits: int | None = None) -> tuple[_C, int]:
+
+        """Parse a container, with `direct_bits()` unless given."""
+
+        try:
+            bits = data[start]
+
+        except IndexError:
+            raise ValueError("end of data reached") from None
+
+        palette: tuple[int, ...] | None
+
+        if bits == 0:
+            value, pos = _varint.decode_varint(data, start + 1)
+            palette = (value,)
+
+        elif bits <= cls.max_indirect_bits:
+            # the client uses no less than that, regardless of what is sent
+            bits = max(bits, cls.min_bits)
+            n, pos = _varint.decode_varint(data, start + 1)
+            if n < 0:
+                raise ValueError("negative palette length")
+
+            entries, pos = _varint.decode_varints(data, n, pos)
+            palette = tuple(entries)
+
+        else:
+            # the client disregards the bits sent for direct palettes
+            bits = cls.direct_bits() if direct_bits is None else direct_bits
+            palette = None
+            pos = start + 1
+
+        if palette and min(palette) < 0:
+            raise ValueError("negative palette entry")
+
+        n, pos = _varint.decode_varint(data, pos)
+        if n < 0:
+            raise ValueError("negative data length")
+
+        end = pos + n * 8
+        if end > len(data):
+            raise ValueError("end of data reached")
+
+        if not bits:
+            # a single value has no entries, and the client reads none
+            if n:
+                raise ValueError(f"{n} longs for a single value")
+
+        elif n * (64 // bits) < cls.size:
+            raise ValueError(f"{n} longs are too few for {cls.size} entries")
+
+        return cls(bits, palette, data[pos:end]), end
+
+    @classmethod
+    def from_values(cls: type[_C], values: _Iterable[int]) -> _C:
+
+        """Build a container of `values`, choosing the most compact palette.
+        """
+
+        np = _optional.numpy()
+        if np is not None:
+            values = np.asarray(values, dtype=np.int64).reshape(-1)
+            palette, entries = np.unique(values, return_inverse=True)
+            palette = tuple(palette.tolist())
+
+        else:
+            values = list(values)
+            palette = tuple(sorted(set(values)))
+            index = {value: i for i, value in enumerate(palette)}
+            entries = [index[value] for value in values]
+
+        if len(entries) != cls.size:
+            raise ValueError(f"need {cls.size} values, not {len(entries)}")
+
+        if palette[0] < 0:
+            raise ValueError("negative value")
+
+        if len(palette) == 1:
+            return cls(0, palette)
+
+        bits = max((len(palette) - 1).bit_length(), cls.min_bits)
+        if bits > cls.max_indirect_bits:
+            bits = cls.direct_bits()
+            if palette[-1] >> bits:
+                raise ValueError(f"value {palette[-1]} out of range")
+
+            entries = values
+            palette = None
+
+        return cls(bits, palette, _pack(entries, bits, cls.size))
+
+    def __len__(self) -> int:
+
+        return self.size
+
+    def __getitem__(self, index: int) -> int:
+
+        """Return a single value without unpacking the others."""
+
+        if self._values is not None:
+            return int(self._values[index])
+
+        if not -self.size <= index < self.size:
+            raise IndexError("container index out of range")
+
+        if not self.bits:
+            assert self.palette is not None
+            return self.palette[0]
+
+        index %= self.size
+        per_long = 64 // self.bits
+        long, = _LONG.unpack_from(self.data, index // per_long * 8)
+        entry = long >> index % per_long * self.bits & (1 << self.bits) - 1
+
+        if self.palette is None:
+            return entry
+
+        try:
+            return self.palette[entry]
+
+        except IndexError:
+            raise ValueError("palette index out of range") from None
+
+    def values(self) -> _Sequence[int]:
+
+        """Return all values, unpacked on first use.
+
+        The result is shared between calls and must not be modified.
+        """
+
+        if self._values is None:
+            self._values = _unpack(self.bits, self.palette, self.data,
+                                   self.size)
+
+        return self._values
+
+    def render(self) -> bytes:
+
+        if not self.bits:
+            assert self.palette is not None
+            header = b'\x00' + _varint.encode_varint(self.palette[0])
+
+        elif self.palette is not None:
+            header = (bytes((self.bits,))
+                      + _varint.encode_varint(len(self.palette))
+                      + _varint.encode_varints(self.palette))
+
+        else:
+            header = bytes((self.bits,))
+
+        return (header + _varint.encode_varint(len(self.data) // 8)
+                + self.data)
+
+    def __reduce__(self) -> tuple:
+
+        return type(self), (self.bits, self.palette, bytes(self.data))
+
+    def __repr__(self) -> str:
+
+        palette = ('direct' if self.palette is None
+                   else f"{len(self.palette)} in palette")
+        return f"<{type(self).__name__} {self.bits} bits, {palette}>"
+
+
+class BlockStates(PalettedContainer):
+
+    """Block states of a section, indexed by `(y * 16 + z) * 16 + x`."""
+
+    __slots__ = ()
+
+    size = 4096
+    min_bits = 4
+    max_indirect_bits = 8
+    registry_size = block_state_registry_size
+
+
+class Biomes(PalettedContainer):
+
+    """Biomes of a section in cells of 4 blocks along each axis."""
+
+    __slots__ = ()
+
+    size = 64
+    min_bits = 1
+    max_indirect_bits = 3
+    registry_size = biome_registry_size
+
+
+def _unpack(bits: int, palette: tuple[int, ...] | None,
+            data: bytes | memoryview, size: int) -> _Sequence[int]:
+
+    np = _optional.numpy()
+
+    if not bits:
+        assert palette is not None
+        if np is None:
+            return _array('I', palette) * size
+
+        values = np.full(size, palette[0], dtype=np.uint32)
+        values.flags.writeable = False
+        return values
+
+    per_long = 64 // bits
+    n = -(-size // per_long)
+    mask = (1 << bits) - 1
+
+    if np is None:
+        shifts = range(0, per_long * bits, bits)
+        entries = [long >> shift & mask
+                   for long, in _LONG.iter_unpack(data[:n * 8])
+                   for shift in shifts]
+        del entries[size:]
+
+        try:
+            return _array('I', entries if palette is None
+                          else map(palette.__getitem__, entries))
+
+        except IndexError:
+            raise ValueError("palette index out of range") from None
+
+    longs = np.frombuffer(data, dtype='>u8', count=n)
+    shifts = np.arange(0, per_long * bits, bits, dtype=np.uint64)
+    entries = (longs[:, np.newaxis] >> shifts
+               & np.uint64(mask)).reshape(-1)[:size]
+
+    if palette is None:
+        values = entries.astype(np.uint32)
+
+    else:
+        try:
+            values = np.array(palette, dtype=np.uint32)[entries]
+
+        except IndexError:
+            raise ValueError("palette index out of range") from None
+
+    values.flags.writeable = False
+    return values
+
+
+def _pack(entries: _Iterable[int], bits: int, size: int) -> bytes:
+
+    per_long = 64 // bits
+    n = -(-size // per_long)
+
+    np = _optional.numpy()
+    if np is None:
+        entries = list(entries)
+        entries += [0] * (n * per_long - size)
+        shifts = range(0, per_long * bits, bits)
+        return b''.join(
+            _LONG.pack(sum(entry << shift for entry, shift in zip(
+                entries[i:i + per_long], shifts
+            )))
+            for i in range(0, n * per_long, per_long)
+        )
+
+    padded = np.zeros(n * per_long, dtype=np.uint64)
+    padded[:size] = entries
+    shifts = np.arange(0, per_long * bits, bits, dtype=np.uint64)
+    longs = np.bitwise_or.reduce(padded.reshape(n, per_long) << shifts,
+                                 axis=1)
+
+    return longs.astype('>u8').tobytes()
+
+
+class ChunkSection:
+
+    """A section of 16×16×16 blocks."""
+
+    __slots__ = ('block_count', 'block_states', 'biomes')
+
+    block_count: int
+    block_states: BlockStates
+    biomes: Biomes
+
+    def __init__(self, block_count: int, block_states: BlockStates,
+                 biomes: Biomes) -> None:
+
+        self.block_count = block_count
+        self.block_states = block_states
+        self.biomes = biomes
+
+    @classmethod
+    def parse(cls, data: bytes | memoryview, start: int = 0,
+              direct_bits: tuple[int, int] | None = None) -> tuple[
+            ChunkSection, int]:
+
+        """Parse a section, with the `direct_bits` of its containers.
+
+        They default to the `direct_bits()` of `BlockStates` and `Biomes`.
+        """
+
+        try:
+            block_count, = _SHORT.unpack_from(data, start)
+
+        except _StructError:
+            raise ValueError("end of data reached") from None
+
+        block_bits, biome_bits = direct_bits or (None, None)
+        block_states, start = BlockStates.parse(data, start + 2, block_bits)
+        biomes, start = Biomes.parse(data, start, biome_bits)
+
+        return cls(block_count, block_states, biomes), start
+
+    def render(self) -> bytes:
+
+        return (_SHORT.pack(self.block_count) + self.block_states.render()
+                + self.biomes.render())
+
+    def block_at(self, x: int, y: int, z: int) -> int:
+
+        return self.block_states[(y << 8) | (z << 4) | x]
+
+    def biome_at(self, x: int, y: int, z: int) -> int:
+
+        """Return the biome at block coordinates within the section."""
+
+        return self.biomes[(y >> 2 << 4) | (z >> 2 << 2) | (x >> 2)]
+
+    def __repr__(self) -> str:
+
+        return (f"ChunkSection({self.block_count!r}, {self.block_states!r}, "
+                f"{self.biomes!r})")
+
+
+class ChunkSections(_Sequence[ChunkSection]):
+
+    """The sections of a chunk from bottom to top, split up on first access.
+
+    As long as no section has been replaced, rendering returns the data the
+    sections were parsed from, so unmodified chunks are forwarded as is.
+    The widths of direct palettes are determined when parsing, so splitting
+    the sections later on doesn't depend on the context at that time.
+    """
+
+    __slots__ = ('_sections', '_data', '_direct_bits')
+
+    _sections: list[ChunkSection] | None
+    _data: bytes | memoryview | None
+    _direct_bits: tuple[int, int]
+
+    def __init__(self, sections: _Iterable[ChunkSection] = ()) -> None:
+
+        self._sections = list(sections)
+        self._data = None
+
+    @classmethod
+    def parse(cls, data: memoryview, start: int = 0) -> tuple[
+            ChunkSections, int]:
+
+        data, end = _byte.parse_varbytes(data, start)
+        return cls._unsplit(data), end
+
+    @classmethod
+    def _unsplit(cls, data: bytes | memoryview,
+                 direct_bits: tuple[int, int] | None = None
+                 ) -> ChunkSections:
+
+        self = cls.__new__(cls)
+        self._sections = None
+        self._data = data
+        self._direct_bits = direct_bits or (BlockStates.direct_bits(),
+                                            Biomes.direct_bits())
+
+        return self
+
+    def _split(self) -> list[ChunkSection]:
+
+        if self._sections is None:
+            data = self._data
+            assert data is not None
+            sections = []
+            pos = 0
+
+            while pos < len(data):
+                section, pos = ChunkSection.parse(data, pos,
+                                                  self._direct_bits)
+                sections.append(section)
+
+            self._sections = sections
+
+        return self._sections
+
+    @property
+    def split(self) -> bool:
+
+        """Whether the sections have been parsed yet."""
+
+        return self._sections is not None
+
+    def __len__(self) -> int:
+
+        return len(self._split())
+
+    @_overload
+    def __getitem__(self, index: int) -> ChunkSection: ...
+
+    @_overload
+    def __getitem__(self, index: slice) -> list[ChunkSection]: ...
+
+    def __getitem__(self, index: int | slice
+                    ) -> ChunkSection | list[ChunkSection]:
+
+        return self._split()[index]
+
+    def __setitem__(self, index: int, section: ChunkSection) -> None:
+
+        self._split()[index] = section
+        self._data = None
+
+    def render(self) -> bytes:
+
+        if self._data is not None:
+            return _byte.render_varbytes(self._data)
+
+        return _byte.render_varbytes(
+            b''.join(section.render() for section in self._split())
+        )
+
+    def __reduce__(self) -> tuple:
+
+        if self._data is not None:
+            return type(self)._unsplit, (bytes(self._data),
+                                         self._direct_bits)
+
+        return type(self), (self._sections,)
+
+    def __repr__(self) -> str:
+
+        if self._data is not None and self._sections is None:
+            return f"<ChunkSections of {len(self._data)} bytes>"
+
+        return f"ChunkSections({self._sections!r})"
+
+
+def render_sections(sections: _Iterable[ChunkSection]) -> bytes:
+
+    if not isinstance(sections, ChunkSections):
+        sections = ChunkSections(sections)
+
+    return sections.render()
+
+
+class BlockEntity(_NamedTuple):
+
+    """Block entity with coordinates relative to the chunk.
+
+    `data` is the NBT of the block entity, left undecoded until `tag` is
+    accessed.
+    """
+
+    x: int
+    y: int
+    z: int
+    type: int
+    data: bytes
+
+    @property
+    def tag(self) -> object:
+
+        return _nbt.parse(self.data)[0]
+
+
+def parse_block_entities(data: memoryview, start: int = 0) -> tuple[
+        list[BlockEntity], int]:
+
+    n, start = _varint.decode_varint(data, start)
+    if n < 0:
+        raise ValueError("negative number of block entities")
+
+    entities = []
+    for _ in range(n):
+        try:
+            xz = data[start]
+            y, = _SHORT.unpack_from(data, start + 1)
+
+        except (IndexError, _StructError):
+            raise ValueError("end of data reached") from None
+
+        type_, start = _varint.decode_varint(data, start + 3)
+        nbt, start = _nbt.parse_raw(data, start)
+
+        # copied, since it is small and this keeps the entities picklable
+        entities.append(BlockEntity(xz >> 4, y, xz & 0xf, type_,
+                                    bytes(nbt)))
+
+    return entities, start
+
+
+def render_block_entities(entities: _Iterable[BlockEntity]) -> bytes:
+
+    entities = list(entities)
+
+    return _varint.encode_varint(len(entities)) + b''.join(
+        bytes((entity.x << 4 | entity.z,)) + _SHORT.pack(entity.y)
+        + _varint.encode_varint(entity.type) + entity.data
+        for entity in entities
+    )
+
+
+# nibble extraction for unpacking light levels without NumPy
+_LOW_NIBBLES = bytes(b & 0xf for b in range(256))
+_HIGH_NIBBLES = bytes(b >> 4 for b in range(256))
+
+
+class LightArrays(_Sequence[memoryview]):
+
+    """Light levels of the sections whose bits are set in `mask`.
+
+    Bit 0 stands for the section below the world. Each array holds the
+    levels of a section as nibbles, indexed like `BlockStates` with even
+    indices in the low nibbles. The arrays are kept back to back in a single
+    buffer, `data`, and the arrays of single sections are views of it.
+    """
+
+    __slots__ = ('mask', 'data')
+
+    SIZE = 2048
+
+    mask: int
+    data: bytes
+
+    def __init__(self, mask: int = 0, data: bytes = b'') -> None:
+
+        if len(data) != mask.bit_count() * self.SIZE:
+            raise ValueError("light arrays don't match the mask")
+
+        self.mask = mask
+        self.data = data
+
+    def __len__(self) -> int:
+
+        return len(self.data) // self.SIZE
+
+    @_overload
+    def __getitem__(self, index: int) -> memoryview: ...
+
+    @_overload
+    def __getitem__(self, index: slice) -> list[memoryview]: ...
+
+    def __getitem__(self, index: int | slice
+                    ) -> memoryview | list[memoryview]:
+
+        n = len(self)
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(n))]
+
+        if not -n <= index < n:
+            raise IndexError("light array index out of range")
+
+        start = index % n * self.SIZE
+        return memoryview(self.data)[start:start + self.SIZE]
+
+    def section(self, index: int) -> memoryview | None:
+
+        """Return the array of the section at bit `index`, if there is one.
+        """
+
+        if index < 0 or not self.mask >> index & 1:
+            return None
+
+        return self[(self.mask & (1 << index) - 1).bit_count()]
+
+    def level(self, index: int, x: int, y: int, z: int) -> int | None:
+
+        """Return the light level of a block of the section at bit `index`.
+        """
+
+        array = self.section(index)
+        if array is None:
+            return None
+
+        pos = (y << 8) | (z << 4) | x
+        return array[pos >> 1] >> ((pos & 1) << 2) & 0xf
+
+    def array(self) -> _Sequence:
+
+        """Return all arrays as rows sharing the buffer.
+
+        That's a 2-D NumPy array if NumPy is installed, and a list of
+        memoryviews otherwise.
+        """
+
+        np = _optional.numpy()
+        if np is None:
+            return list(self)
+
+        return np.frombuffer(self.data, dtype=np.uint8).reshape(len(self),
+                                                                self.SIZE)
+
+    def levels(self) -> _Sequence:
+
+        """Return the levels unpacked to a byte each, one row per section."""
+
+        size = self.SIZE * 2
+
+        np = _optional.numpy()
+        if np is None:
+            unpacked = bytearray(len(self.data) * 2)
+            unpacked[0::2] = self.data.translate(_LOW_NIBBLES)
+            unpacked[1::2] = self.data.translate(_HIGH_NIBBLES)
+            rows = memoryview(unpacked)
+            return [rows[start:start + size]
+                    for start in range(0, len(rows), size)]
+
+        packed = np.frombuffer(self.data, dtype=np.uint8).reshape(len(self),
+                                                                  self.SIZE)
+        levels = np.empty((len(self), size), dtype=np.uint8)
+        levels[:, 0::2] = packed & 0xf
+        levels[:, 1::2] = packed >> 4
+        return levels
+
+    @classmethod
+    def parse(cls, data: memoryview, start: int, mask: int) -> tuple[
+            LightArrays, int]:
+
+        n, pos = _varint.decode_varint(data, start)
+        if n < 0:
+            raise ValueError("negative number of light arrays")
+
+        # with NumPy, copy the arrays in one go if all of them have the
+        # usual length prefix, avoiding an object for each of them
+        np = _optional.numpy()
+        end = pos + n * (cls.SIZE + 2)
+        if np is not None and end <= len(data):
+            arrays = np.frombuffer(data, dtype=np.uint8, count=end - pos,
+                                   offset=pos).reshape(n, cls.SIZE + 2)
+            if (arrays[:, 0] == 0x80).all() and (arrays[:, 1] == 0x10).all():
+                return cls(mask, arrays[:, 2:].tobytes()), end
+
+        arrays = []
+        for _ in range(n):
+            array, pos = _byte.parse_varbytes(data, pos)
+            if len(array) != cls.SIZE:
+                raise ValueError(f"light array of {len(array)} bytes")
+
+            arrays.append(array)
+
+        return cls(mask, b''.join(arrays)), pos
+
+    def render(self) -> bytes:
+
+        prefix = _varint.encode_varint(self.SIZE)
+
+        return _varint.encode_varint(len(self)) + b''.join(
+            prefix + self.data[start:start + self.SIZE]
+            for start in range(0, len(self.data), self.SIZE)
+        )
+
+    def __repr__(self) -> str:
+
+        return f"<LightArrays of {len(self)} sections, mask {self.mask:#x}>"
+
+
+NO_LIGHT = LightArrays()
+
+
+def parse_light(data: memoryview, start: int = 0) -> tuple[tuple, int]:
+
+    """Parse the light data shared by ChunkData and UpdateLight.
+
+    Returns `trust_edges`, the `LightArrays` of sky and block light, and the
+    masks of the sections whose sky and block light are all zero.
+    """
+
+    trust_edges, pos = _byte.parse_bool(data, start)
+    sky_mask, pos = _byte.parse_bitset(data, pos)
+    block_mask, pos = _byte.parse_bitset(data, pos)
+    empty_sky_mask, pos = _byte.parse_bitset(data, pos)
+    empty_block_mask, pos = _byte.parse_bitset(data, pos)
+
+    sky_light, pos = LightArrays.parse(data, pos, sky_mask)
+    block_light, pos = LightArrays.parse(data, pos, block_mask)
+
+    return (trust_edges, sky_light, block_light,
+            empty_sky_mask, empty_block_mask), pos
+
+
+def render_light(trust_edges: bool, sky_light: LightArrays,
+                 block_light: LightArrays, empty_sky_light_mask: int,
+                 empty_block_light_mask: int) -> bytes:
+
+    return b''.join((
+        b'\x01' if trust_edges else b'\x00',
+        _byte.render_bitset(sky_light.mask),
+        _byte.render_bitset(block_light.mask),
+        _byte.render_bitset(empty_sky_light_mask),
+        _byte.render_bitset(empty_block_light_mask),
+        sky_light.render(),
+        block_light.render(),
+    ))
@@ -2,207 +2,134 @@
 
 from __future__ import annotations
 
-from collections.abc import (
-    Iterator as _Iterator,
+from typing import (
+    Any as _Any,
 )
 
-import json as _json
 import math as _math
 
-from itertools import islice as _islice
-
 from uuid import UUID as _UUID
 
 from ..packet import MinecraftPacketWithID as _MinecraftPacketWithID
 
+from .. import schema as _schema
+from .. import versions as _versions
+
+from . import chunk as _chunk
+from . import item as _item
+from . import metadata as _metadata
+
+from ...utils import blob as _blob
 from ...utils import byte as _byte
-from ...utils import iter as _iter
+from ...utils import nbt as _nbt
+from ...utils import varint as _varint
 
 
-class Packet(_MinecraftPacketWithID):
+class Packet(_MinecraftPacketWithID, lazy=True,
+             versions=_versions.V1_18):
 
     pass
 
 
-class SpawnLivingEntity(Packet):
+class SpawnEntity(Packet):
 
-    id = 0x2
+    id = 0x0
 
-    def __init__(
-            self,
-            entity_id: int,
-            entity_uuid: _UUID | str,
-            entity_type: int,
-            x: float,
-            y: float,
-            z: float,
-            yaw: float,
-            pitch: float,
-            head_pitch: float,
-            velocity_x: float,
-            velocity_y: float,
-            velocity_z: float,
-    ) -> None:
-
-        if entity_uuid and not isinstance(entity_uuid, _UUID):
-            entity_uuid = _UUID(entity_uuid)
-
-        super().__init__()
-
-        self.entity_id = entity_id
-        self.entity_uuid = entity_uuid
-        self.entity_type = entity_type
-        self.x = x
-        self.y = y
-        self.z = z
-        self.yaw = yaw
-        self.pitch = pitch
-        self.head_pitch = head_pitch
-        self.velocity_x = velocity_x
-        self.velocity_y = velocity_y
-        self.velocity_z = velocity_z
-
-    def __getstate__(self) -> dict[str, object]:
-
-        return {key: getattr(self, key) for key in [
-            'entity_id',
-            'entity_uuid',
-            'entity_type',
-            'x',
-            'y',
-            'z',
-            'yaw',
-            'pitch',
-            'head_pitch',
-            'velocity_x',
-            'velocity_y',
-            'velocity_z',
-        ]}
+    schema = _schema.Schema(
+        _schema.VarInt('entity_id'),
+        _schema.UUID('entity_uuid'),
+        _schema.VarInt('entity_type'),
+        _schema.Double('x'),
+        _schema.Double('y'),
+        _schema.Double('z'),
+        _schema.Angle('pitch'),
+        _schema.Angle('yaw'),
+        _schema.Int('data', default=0),
+        _schema.Short('velocity_x', scale=8000, default=0.0),
+        _schema.Short('velocity_y', scale=8000, default=0.0),
+        _schema.Short('velocity_z', scale=8000, default=0.0),
+    )
 
-    @property
-    def payload(self) -> bytes | bytearray:
-
-        return b'%b%b%b%b%b%b%c%c%c%b%b%b' % (
-            _byte.render_varint(self.entity_id),
-            self.entity_uuid.bytes,
-            _byte.render_varint(self.entity_type),
-            _byte.render_double(self.x),
-            _byte.render_double(self.y),
-            _byte.render_double(self.z),
-            round(self.yaw / 1.40625) & 0xff,
-            round(self.pitch / 1.40625) & 0xff,
-            round(self.head_pitch / 1.40625) & 0xff,
-            round(self.velocity_x * 8000).to_bytes(2, 'big', signed=True),
-            round(self.velocity_y * 8000).to_bytes(2, 'big', signed=True),
-            round(self.velocity_z * 8000).to_bytes(2, 'big', signed=True),
-        )
-
-    @payload.setter
-    def payload(self, it: bytes | bytearray | _Iterator[int]) -> None:
-
-        it = iter(it)
-        self.entity_id = _iter.consume_varint(it)
-        self.entity_uuid = _UUID(bytes=bytes(_islice(it, 16)))
-        self.entity_type = _iter.consume_varint(it)
-        self.x = _iter.consume_double(it)
-        self.y = _iter.consume_double(it)
-        self.z = _iter.consume_double(it)
-        self.yaw = next(it) * 1.40625
-        self.pitch = next(it) * 1.40625
-        self.head_pitch = next(it) * 1.40625
-        self.velocity_x = int.from_bytes(_islice(it, 2), 'big', signed=True) / 8000
-        self.velocity_y = int.from_bytes(_islice(it, 2), 'big', signed=True) / 8000
-        self.velocity_z = int.from_bytes(_islice(it, 2), 'big', signed=True) / 8000
-        () = it
+    def _validate(self) -> None:
 
-        assert 0 <= self.entity_type <= 112
         assert _math.isfinite(self.x)
         assert _math.isfinite(self.y)
         assert _math.isfinite(self.z)
 
 
-class ServerDifficulty(Packet):
-
-    id = 0xe
-
-    def __init__(self, difficulty: int = 2, locked: bool = True) -> None:
-
-        super().__init__()
-
-        self.difficulty = difficulty
-        self.locked = locked
+class SpawnLivingEntity(Packet):
 
-    def __getstate__(self) -> dict[str, object]:
+    id = 0x2
 
-        return {key: getattr(self, key) for key in [
-            'difficulty',
-            'locked',
-        ]}
+    schema = _schema.Schema(
+        _schema.VarInt('entity_id'),
+        _schema.UUID('entity_uuid'),
+        _schema.VarInt('entity_type'),
+        _schema.Double('x'),
+        _schema.Double('y'),
+        _schema.Double('z'),
+        _schema.Angle('yaw'),
+        _schema.Angle('pitch'),
+        _schema.Angle('head_pitch'),
+        _schema.Short('velocity_x', scale=8000),
+        _schema.Short('velocity_y', scale=8000),
+        _schema.Short('velocity_z', scale=8000),
+    )
+
+    def _validate(self) -> None:
 
-    @property
-    def payload(self) -> bytes | bytearray:
+        assert 0 <= self.entity_type <= 112
+        assert _math.isfinite(self.x)
+        assert _math.isfinite(self.y)
+        assert _math.isfinite(self.z)
 
-        return b'%c%c' % (
-            self.difficulty,
-            self.locked,
-        )
 
-    @payload.setter
-    def payload(self, it: bytes | bytearray | _Iterator[int]) -> None:
+class SpawnPlayer(Packet):
 
-        it = iter(it)
-        self.difficulty = next(it)
-        self.locked = bool(next(it))
-        () = it
+    id = 0x4
 
-        assert 0 <= self.difficulty <= 3
+    schema = _schema.Schema(
+        _schema.VarInt('entity_id'),
+        _schema.UUID('player_uuid'),
+        _schema.Double('x'),
+        _schema.Double('y'),
+        _schema.Double('z'),
+        _schema.Angle('yaw'),
+        _schema.Angle('pitch'),
+    )
 
+    def _validate(self) -> None:
 
-class ChatMessage(Packet):
+        assert _math.isfinite(self.x)
+        assert _math.isfinite(self.y)
+        assert _math.isfinite(self.z)
 
-    id = 0xf
 
-    def __init__(
-            self,
-            data: dict = None,
-            position: int = 0,
-            sender: _UUID = None,
-    ) -> None:
+class ServerDifficulty(Packet):
 
-        if sender and not isinstance(sender, _UUID):
-            sender = _UUID(sender)
+    id = 0xe
 
-        super().__init__()
+    schema = _schema.Schema(
+        _schema.UByte('difficulty', default=2),
+        _schema.Bool('locked', default=True),
+    )
 
-        self.data = data
-        self.position = position
-        self.sender = sender
+    def _validate(self) -> None:
 
-    def __getstate__(self) -> dict[str, object]:
+        assert 0 <= self.difficulty <= 3
 
-        return {key: getattr(self, key) for key in [
-            'data',
-            'position',
-            'sender',
-        ]}
 
-    @property
-    def payload(self) -> bytes | bytearray:
+class ChatMessage(Packet):
 
-        return b'%b%c%b' % (
-            _byte.render_varstr(_json.dumps(self.data, separators=(',', ':'))),
-            self.position,
-            self.sender.bytes,
-        )
+    id = 0xf
 
-    @payload.setter
-    def payload(self, it: bytes | bytearray | _Iterator[int]) -> None:
+    schema = _schema.Schema(
+        _schema.Json('data', default=None),
+        _schema.UByte('position', default=0),
+        _schema.UUID('sender', default=None),
+    )
 
-        it = iter(it)
-        self.data = _json.loads(_iter.consume_varstr(it))
-        self.position = next(it)
-        self.sender = _UUID(bytes=bytes(_islice(it, 16)))
-        () = it
+    def _validate(self) -> None:
 
         assert 0 <= self.position <= 2
 
@@ -212,652 +139,402 @@ class DeclareCommands(Packet):
 
     id = 0x12
 
-    def __init__(self, raw_tail: bytes) -> None:
-
-        super().__init__()
-
-        # ...
-        self.raw_tail = raw_tail
-
-    def __getstate__(self) -> dict[str, object]:
-
-        return {key: getattr(self, key) for key in [
-            # ...,
-            'raw_tail',
-        ]}
-
-    @property
-    def payload(self) -> bytes | bytearray:
-
-        return b'%b' % (
-            # ...,
-            self.raw_tail,
-        )
-
-    @payload.setter
-    def payload(self, it: bytes | bytearray | _Iterator[int]) -> None:
-
-        it = iter(it)
+    schema = _schema.Schema(
         # ...
-        self.raw_tail = bytes(it)
-        # () = it
+        _schema.Custom('raw_tail',
+                       parse=_blob.parse_rest,
+                       render=bytes),
+    )
 
 
-# TODO: complete
 class WindowItems(Packet):
 
     id = 0x14
 
-    def __init__(self, window_id: int, state_id: int, raw_tail: bytes) -> None:
+    schema = _schema.Schema(
+        _schema.UByte('window_id'),
+        _schema.VarInt('state_id'),
+        _schema.Custom('items',
+                       parse=_item.parse_slots,
+                       render=_item.render_slots,
+                       default=()),
+        _schema.Custom('carried_item',
+                       parse=_item.parse_slot,
+                       render=_item.render_slot,
+                       default=None),
+    )
 
-        super().__init__()
 
-        self.window_id = window_id
-        self.state_id = state_id
-        # ...
-        self.raw_tail = raw_tail
+class PluginMessage(Packet):
 
-    def __getstate__(self) -> dict[str, object]:
+    id = 0x18
 
-        return {key: getattr(self, key) for key in [
-            'window_id',
-            'state_id',
-            # ...,
-            'raw_tail',
-        ]}
+    schema = _schema.Schema(
+        _schema.Identifier('namespace', 'channel',
+                           default=('minecraft', None)),
+        _schema.Rest('data', default=None),
+    )
 
-    @property
-    def payload(self) -> bytes | bytearray:
 
-        return b'%c%b%b' % (
-            self.window_id,
-            _byte.render_varint(self.state_id),
-            # ...,
-            self.raw_tail,
-        )
+class EntityTrigger(Packet):
 
-    @payload.setter
-    def payload(self, it: bytes | bytearray | _Iterator[int]) -> None:
+    id = 0x1b
 
-        it = iter(it)
-        self.window_id = next(it)
-        self.state_id = _iter.consume_varint(it)
-        # ...
-        self.raw_tail = bytes(it)
-        # () = it
+    schema = _schema.Schema(
+        _schema.Int('entity_id'),
+        _schema.UByte('trigger'),
+    )
 
+    def _validate(self) -> None:
 
-class PluginMessage(Packet):
+        assert 0 <= self.trigger <= 60
 
-    id = 0x18
 
-    def __init__(
-            self,
-            namespace: str = 'minecraft',
-            channel: str = None,
-            data: bytes | bytearray = None,
-    ) -> None:
+class UnloadChunk(Packet):
 
-        super().__init__()
+    id = 0x1d
 
-        self.namespace = namespace
-        self.channel = channel
-        self.data = data
+    schema = _schema.Schema(
+        _schema.Int('chunk_x'),
+        _schema.Int('chunk_z'),
+    )
 
-    def __getstate__(self) -> dict[str, object]:
 
-        return {key: getattr(self, key) for key in [
-            'namespace',
-            'channel',
-            'data',
-        ]}
+class InitializeWorldBorder(Packet):
 
-    @property
-    def payload(self) -> bytes | bytearray:
+    id = 0x20
 
-        return b'%b%b' % (
-            _byte.render_identifier(self.namespace, self.channel),
-            self.data,
-        )
+    schema = _schema.Schema(
+        _schema.Double('x'),
+        _schema.Double('z'),
+        _schema.Double('old_diameter'),
+        _schema.Double('new_diameter'),
+        _schema.VarLong('speed', scale=1000),
+        _schema.VarInt('portal_teleport_boundary'),
+        _schema.VarInt('warning_blocks'),
+        _schema.VarInt('warning_time'),
+    )
 
-    @payload.setter
-    def payload(self, it: bytes | bytearray | _Iterator[int]) -> None:
+    def _validate(self) -> None:
 
-        it = iter(it)
-        self.namespace, self.channel = _iter.consume_identifier(it)
-        self.data = bytes(it)
+        assert _math.isfinite(self.x)
+        assert _math.isfinite(self.z)
+        assert _math.isfinite(self.old_diameter) and self.old_diameter > 0
+        assert _math.isfinite(self.new_diameter) and self.new_diameter > 0
 
 
-class EntityTrigger(Packet):
+# the light data ChunkData and UpdateLight end with
+_LIGHT = _schema.Custom('trust_edges', 'sky_light', 'block_light',
+                        'empty_sky_light_mask', 'empty_block_light_mask',
+                        parse=_chunk.parse_light,
+                        render=_chunk.render_light,
+                        default=(True, _chunk.NO_LIGHT, _chunk.NO_LIGHT,
+                                 0, 0))
 
-    id = 0x1b
 
-    def __init__(self, entity_id: int, trigger: int) -> None:
+class ChunkData(Packet):
 
-        super().__init__()
+    """Chunk column with its light.
 
-        self.entity_id = entity_id
-        self.trigger = trigger
+    `heightmaps` is the NBT of the heightmaps, left undecoded until
+    `heightmaps_tag` is accessed.
+    """
 
-    def __getstate__(self) -> dict[str, object]:
+    id = 0x22
 
-        return {key: getattr(self, key) for key in [
-            'entity_id',
-            'trigger',
-        ]}
+    schema = _schema.Schema(
+        _schema.Int('chunk_x'),
+        _schema.Int('chunk_z'),
+        _schema.Custom('heightmaps',
+                       parse=_nbt.parse_raw,
+                       render=_byte.view),
+        _schema.Custom('sections',
+                       parse=_chunk.ChunkSections.parse,
+                       render=_chunk.render_sections,
+                       default=()),
+        _schema.Custom('block_entities',
+                       parse=_chunk.parse_block_entities,
+                       render=_chunk.render_block_entities,
+                       default=()),
+        _LIGHT,
+    )
 
     @property
-    def payload(self) -> bytes | bytearray:
+    def heightmaps_tag(self) -> object:
 
-        return b'%b%c' % (
-            self.entity_id.to_bytes(4, 'big'),
-            self.trigger,
-        )
+        return _nbt.parse(self.heightmaps)[0]
 
-    @payload.setter
-    def payload(self, it: bytes | bytearray | _Iterator[int]) -> None:
 
-        it = iter(it)
-        self.entity_id = int.from_bytes(_islice(it, 4), 'big')
-        self.trigger = next(it)
-        () = it
+class UpdateLight(Packet):
 
-        assert 0 <= self.trigger <= 60
+    id = 0x25
 
+    schema = _schema.Schema(
+        _schema.VarInt('chunk_x'),
+        _schema.VarInt('chunk_z'),
+        _LIGHT,
+    )
 
-class InitializeWorldBorder(Packet):
 
-    id = 0x20
+def _parse_identifiers(data: memoryview, start: int) -> tuple[
+        list[tuple[str, str]], int]:
 
-    def __init__(
-            self,
-            x: float,
-            z: float,
-            old_diameter: float,
-            new_diameter: float,
-            speed: float,
-            portal_teleport_boundary: int,
-            warning_blocks: int,
-            warning_time: int,
-    ) -> None:
-
-        super().__init__()
-
-        self.x = x
-        self.z = z
-        self.old_diameter = old_diameter
-        self.new_diameter = new_diameter
-        self.speed = speed
-        self.portal_teleport_boundary = portal_teleport_boundary
-        self.warning_blocks = warning_blocks
-        self.warning_time = warning_time
-
-    def __getstate__(self) -> dict[str, object]:
-
-        return {key: getattr(self, key) for key in [
-            'x',
-            'z',
-            'old_diameter',
-            'new_diameter',
-            'speed',
-            'portal_teleport_boundary',
-            'warning_blocks',
-            'warning_time',
-        ]}
+    n, start = _byte.parse_varint(data, start)
 
-    @property
-    def payload(self) -> bytes | bytearray:
-
-        return b'%b%b%b%b%b%b%b%b' % (
-            _byte.render_double(self.x),
-            _byte.render_double(self.z),
-            _byte.render_double(self.old_diameter),
-            _byte.render_double(self.new_diameter),
-            _byte.render_varlong(round(self.speed * 1000)),
-            _byte.render_varint(self.portal_teleport_boundary),
-            _byte.render_varint(self.warning_blocks),
-            _byte.render_varint(self.warning_time),
-        )
-
-    @payload.setter
-    def payload(self, it: bytes | bytearray | _Iterator[int]) -> None:
-
-        it = iter(it)
-        self.x = _iter.consume_double(it)
-        self.z = _iter.consume_double(it)
-        self.old_diameter = _iter.consume_double(it)
-        self.new_diameter = _iter.consume_double(it)
-        self.speed = _iter.consume_varlong(it) / 1000
-        self.portal_teleport_boundary = _iter.consume_varint(it)
-        self.warning_blocks = _iter.consume_varint(it)
-        self.warning_time = _iter.consume_varint(it)
-        () = it
+    identifiers = []
+    for _ in range(n):
+        identifier, start = _byte.parse_identifier(data, start)
+        identifiers.append(identifier)
 
-        assert _math.isfinite(self.x)
-        assert _math.isfinite(self.z)
-        assert _math.isfinite(self.old_diameter) and self.old_diameter > 0
-        assert _math.isfinite(self.new_diameter) and self.new_diameter > 0
+    return identifiers, start
 
 
-# TODO: complete
-class ChunkData(Packet):
+def _render_identifiers(identifiers: list[tuple[str, str]]) -> bytes:
 
-    id = 0x22
+    return _byte.render_varint(len(identifiers)) + b''.join(
+        _byte.render_identifier(namespace, name)
+        for namespace, name in identifiers
+    )
 
-    def __init__(
-            self,
-            chunk_x: int,
-            chunk_z: int,
-            # ...,
-            raw_tail: bytes,
-    ) -> None:
 
-        super().__init__()
+def _parse_nbt_blob(data: memoryview, start: int) -> tuple[_blob.Blob, int]:
 
-        self.chunk_x = chunk_x
-        self.chunk_z = chunk_z
-        # ...
-        self.raw_tail = raw_tail
+    raw, end = _nbt.parse_raw(data, start)
+    return _blob.intern(raw), end
 
-    def __getstate__(self) -> dict[str, object]:
 
-        return {key: getattr(self, key) for key in [
-            'chunk_x',
-            'chunk_z',
-            # ...,
-            'raw_tail',
-        ]}
+class JoinGame(Packet):
 
-    @property
-    def payload(self) -> bytes | bytearray:
+    """Join a world.
 
-        return b'%b%b%b' % (
-            self.chunk_x.to_bytes(4, 'big', signed=True),
-            self.chunk_z.to_bytes(4, 'big', signed=True),
-            # ...,
-            self.raw_tail,
-        )
+    The dimension codec and the dimension are kept as NBT in interned blobs,
+    shared by all connections receiving the same data. Their decoded form
+    is shared as well when obtained with e.g.
+    `dimension_codec.decoded(utils.nbt.parse)`.
+    """
 
-    @payload.setter
-    def payload(self, it: bytes | bytearray | _Iterator[int]) -> None:
+    id = 0x26
 
-        it = iter(it)
-        self.chunk_x = int.from_bytes(_islice(it, 4), 'big', signed=True)
-        self.chunk_z = int.from_bytes(_islice(it, 4), 'big', signed=True)
-        # ...
-        self.raw_tail = bytes(it)
-        # () = it
+    schema = _schema.Schema(
+        _schema.Int('entity_id'),
+        _schema.Bool('hardcore'),
+        _schema.UByte('gamemode'),
+        _schema.Byte('previous_gamemode'),
+        _schema.Custom('worlds',
+                       parse=_parse_identifiers,
+                       render=_render_identifiers),
+        _schema.Custom('dimension_codec',
+                       parse=_parse_nbt_blob,
+                       render=bytes),
+        _schema.Custom('dimension',
+                       parse=_parse_nbt_blob,
+                       render=bytes),
+        _schema.Identifier('world_namespace', 'world_name'),
+        _schema.Long('hashed_seed'),
+        _schema.VarInt('max_players'),
+        _schema.VarInt('view_distance'),
+        _schema.VarInt('simulation_distance'),
+        _schema.Bool('reduced_debug_info'),
+        _schema.Bool('enable_respawn_screen'),
+        _schema.Bool('is_debug'),
+        _schema.Bool('is_flat'),
+    )
+
+    def _validate(self) -> None:
 
+        assert self.entity_id != 0
+        assert 0 <= self.gamemode <= 3
+        assert -1 <= self.previous_gamemode <= 3
 
-# TODO: complete
-class UpdateLight(Packet):
 
-    id = 0x25
+class EntityPosition(Packet):
 
-    def __init__(
-            self,
-            chunk_x: int,
-            chunk_z: int,
-            trust_edges: bool,
-            # ...,
-            raw_tail: bytes,
-    ) -> None:
+    """Relative move of an entity by less than 8 blocks."""
 
-        super().__init__()
+    id = 0x29
+    pool_size = 1024
 
-        self.chunk_x = chunk_x
-        self.chunk_z = chunk_z
-        self.trust_edges = trust_edges
-        # ...
-        self.raw_tail = raw_tail
+    schema = _schema.Schema(
+        _schema.VarInt('entity_id'),
+        _schema.Short('delta_x', scale=4096),
+        _schema.Short('delta_y', scale=4096),
+        _schema.Short('delta_z', scale=4096),
+        _schema.Bool('on_ground'),
+    )
 
-    def __getstate__(self) -> dict[str, object]:
 
-        return {key: getattr(self, key) for key in [
-            'chunk_x',
-            'chunk_z',
-            'trust_edges',
-            # ...,
-            'raw_tail',
-        ]}
+class EntityPositionAndRotation(Packet):
 
-    @property
-    def payload(self) -> bytes | bytearray:
-
-        return b'%b%b%c%b' % (
-            _byte.render_varint(self.chunk_x),
-            _byte.render_varint(self.chunk_z),
-            self.trust_edges,
-            # ...,
-            self.raw_tail,
-        )
-
-    @payload.setter
-    def payload(self, it: bytes | bytearray | _Iterator[int]) -> None:
-
-        it = iter(it)
-        self.chunk_x = _iter.consume_varint(it)
-        self.chunk_z = _iter.consume_varint(it)
-        self.trust_edges = bool(next(it))
-        # ...
-        self.raw_tail = bytes(it)
-        # () = it
+    """Relative move of an entity by less than 8 blocks, and its rotation."""
 
+    id = 0x2a
+    pool_size = 1024
 
-# TODO: complete
-class JoinGame(Packet):
+    schema = _schema.Schema(
+        _schema.VarInt('entity_id'),
+        _schema.Short('delta_x', scale=4096),
+        _schema.Short('delta_y', scale=4096),
+        _schema.Short('delta_z', scale=4096),
+        _schema.Angle('yaw'),
+        _schema.Angle('pitch'),
+        _schema.Bool('on_ground'),
+    )
 
-    id = 0x26
 
-    def __init__(
-            self,
-            entity_id: int,
-            hardcore: bool,
-            gamemode: int,
-            previous_gamemode: int,
-            # dimension: int,
-            # hashed_seed: int,
-            # max_players: int = 20,
-            # level_type: str = 'default',
-            # view_distance: int = 10,
-            # reduced_debug_info: bool = False,
-            # enable_respawn_screen: bool = True,
-            raw_tail: bytes,
-    ) -> None:
-
-        super().__init__()
-
-        self.entity_id = entity_id
-        self.hardcore = hardcore
-        self.gamemode = gamemode
-        self.previous_gamemode = previous_gamemode
-        # self.dimension = dimension
-        # self.hashed_seed = hashed_seed
-        # self.max_players = max_players
-        # self.level_type = level_type
-        # self.view_distance = view_distance
-        # self.reduced_debug_info = reduced_debug_info
-        # self.enable_respawn_screen = enable_respawn_screen
-        self.raw_tail = raw_tail
-
-    def __getstate__(self) -> dict[str, object]:
-
-        return {key: getattr(self, key) for key in [
-            'entity_id',
-            'hardcore',
-            'gamemode',
-            'previous_gamemode',
-            # 'dimension',
-            # 'hashed_seed',
-            # 'max_players',
-            # 'level_type',
-            # 'view_distance',
-            # 'reduced_debug_info',
-            # 'enable_respawn_screen',
-            'raw_tail',
-        ]}
+class EntityRotation(Packet):
 
-    @property
-    def payload(self) -> bytes | bytearray:
-
-        return b'%b%c%c%c%b' % (
-            self.entity_id.to_bytes(4, 'big', signed=True),
-            self.hardcore,
-            self.gamemode,
-            self.previous_gamemode & 0xff,
-            # self.dimension.to_bytes(4, 'big', signed=True),
-            # self.hashed_seed.to_bytes(8, 'big', signed=True),
-            # self.max_players,
-            # _byte.render_varstr(self.level_type),
-            # _byte.render_varint(self.view_distance),
-            # self.reduced_debug_info,
-            # self.enable_respawn_screen,
-            self.raw_tail,
-        )
-
-    @payload.setter
-    def payload(self, it: bytes | bytearray | _Iterator[int]) -> None:
-
-        it = iter(it)
-        self.entity_id = int.from_bytes(_islice(it, 4), 'big', signed=True)
-        self.hardcore = bool(next(it))
-        self.gamemode = next(it)
-        self.previous_gamemode = (next(it) ^ 0x80) - 0x80
-        # self.dimension = int.from_bytes(_islice(it, 4), 'big', signed=True)
-        # self.hashed_seed = int.from_bytes(_islice(it, 8), 'big', signed=True)
-        # self.max_players = next(it)
-        # self.level_type = _iter.consume_varstr(it)
-        # self.view_distance = _iter.consume_varint(it)
-        # self.reduced_debug_info = bool(next(it))
-        # self.enable_respawn_screen = bool(next(it))
-        self.raw_tail = bytes(it)
-        # () = it
+    id = 0x2b
+    pool_size = 1024
 
-        assert self.entity_id != 0
-        assert 0 <= self.gamemode <= 3
-        assert -1 <= self.previous_gamemode <= 3
-        # assert -1 <= self.dimension <= 1
-        # assert self.max_players > 0
-        # assert self.level_type in [
-        #     'default',
-        #     'flat',
-        #     'largeBiomes',
-        #     'amplified',
-        #     'customized',
-        #     'buffet',
-        #     'default_1_1',
-        # ]
-        # assert 2 <= self.view_distance <= 32
+    schema = _schema.Schema(
+        _schema.VarInt('entity_id'),
+        _schema.Angle('yaw'),
+        _schema.Angle('pitch'),
+        _schema.Bool('on_ground'),
+    )
 
 
 class PlayerAbilities(Packet):
 
     id = 0x32
 
-    def __init__(
-            self,
-            flags: int = 0,
-            flying_speed: float = 0.05,
-            fov_modifier: float = 0.1,
-    ) -> None:
-
-        super().__init__()
+    schema = _schema.Schema(
+        _schema.UByte('flags', default=0),
+        _schema.Float('flying_speed', default=0.05),
+        _schema.Float('fov_modifier', default=0.1),
+    )
 
-        self.flags = flags
-        self.flying_speed = flying_speed
-        self.fov_modifier = fov_modifier
+    def _validate(self) -> None:
 
-    def __getstate__(self) -> dict[str, object]:
+        assert not (self.flags & ~0xf)
+        assert _math.isfinite(self.flying_speed) and self.flying_speed >= 0
+        assert _math.isfinite(self.fov_modifier) and self.fov_modifier >= 0
 
-        return {key: getattr(self, key) for key in [
-            'flags',
-            'flying_speed',
-            'fov_modifier',
-        ]}
 
-    @property
-    def payload(self) -> bytes | bytearray:
+def _parse_player_info(data: memoryview, start: int) -> tuple[tuple, int]:
 
-        return b'%c%b%b' % (
-            self.flags,
-            _byte.render_float(self.flying_speed),
-            _byte.render_float(self.fov_modifier),
-        )
+    action, start = _byte.parse_varint(data, start)
+    assert 0 <= action <= 4
 
-    @payload.setter
-    def payload(self, it: bytes | bytearray | _Iterator[int]) -> None:
+    n, start = _byte.parse_varint(data, start)
 
-        it = iter(it)
-        self.flags = next(it)
-        self.flying_speed = _iter.consume_float(it)
-        self.fov_modifier = _iter.consume_float(it)
-        () = it
+    updates: dict[_UUID, dict[str, _Any] | None] = {}
+    for _ in range(n):
+        uuid = _UUID(bytes=bytes(data[start:start + 16]))
+        start += 16
 
-        assert not (self.flags & ~0xf)
-        assert _math.isfinite(self.flying_speed) and self.flying_speed >= 0
-        assert _math.isfinite(self.fov_modifier) and self.fov_modifier >= 0
+        if action == 4:
+            updates[uuid] = None
+            continue
 
+        update: dict[str, _Any] = {}
+        updates[uuid] = update
 
-class PlayerInfo(Packet):
+        if action == 0:
+            update['name'], start = _byte.parse_varstr(data, start)
 
-    id = 0x36
+            properties: dict[str, tuple[str, str | None]] = {}
+            update['properties'] = properties
+            num_properties, start = _byte.parse_varint(data, start)
+            for __ in range(num_properties):
+                name, start = _byte.parse_varstr(data, start)
+                value, start = _byte.parse_varstr(data, start)
 
-    def __init__(
-            self,
-            action: int = 0,
-            updates: dict[_UUID, dict[str, int | str | dict] | None] = None,
-    ) -> None:
+                start += 1
+                if data[start - 1]:
+                    signature, start = _byte.parse_varstr(data, start)
+                else:
+                    signature = None
 
-        super().__init__()
+                properties[name] = (value, signature)
 
-        self.action = action
-        self.updates = updates
+        if action in (0, 1):
+            update['gamemode'], start = _byte.parse_varint(data, start)
 
-    def __getstate__(self) -> dict[str, object]:
+        if action in (0, 2):
+            update['ping'], start = _byte.parse_varint(data, start)
 
-        return {key: getattr(self, key) for key in [
-            'action',
-            'updates',
-        ]}
+        if action in (0, 3):
+            start += 1
+            if data[start - 1]:
+                update['display_name'], start = _byte.parse_varstr(data,
+                                                                   start)
+            else:
+                update['display_name'] = None
 
-    @property
-    def payload(self) -> bytes | bytearray:
+    return (action, updates), start
 
-        payload = _byte.render_varint(self.action)
 
-        payload += _byte.render_varint(len(self.updates))
-        for uuid, update in self.updates.items():
-            payload += uuid.bytes
+def _render_player_info(
+        action: int,
+        updates: dict[_UUID, dict[str, _Any] | None],
+) -> bytes:
 
-            if self.action == 0:
-                payload += _byte.render_varstr(update['name'])
+    payload = _byte.render_varint(action)
 
-                properties = update['properties']
-                payload += _byte.render_varint(len(properties))
-                for name, (value, signature) in properties.items():
-                    payload += _byte.render_varstr(name)
-                    payload += _byte.render_varstr(value)
-                    payload += (b'\x00' if signature is None else
-                                b'\x01' + _byte.render_varstr(signature))
+    payload += _byte.render_varint(len(updates))
+    for uuid, update in updates.items():
+        payload += uuid.bytes
 
-            if self.action in (0, 1):
-                payload += _byte.render_varint(update['gamemode'])
+        if action == 4:
+            continue
 
-            if self.action in (0, 2):
-                payload += _byte.render_varint(update['ping'])
+        assert update is not None
 
-            if self.action in (0, 3):
-                display_name = update['display_name']
-                payload += (b'\x00' if display_name is None else
-                            b'\x01' + _byte.render_varstr(display_name))
+        if action == 0:
+            payload += _byte.render_varstr(update['name'])
 
-        return payload
+            properties = update['properties']
+            payload += _byte.render_varint(len(properties))
+            for name, (value, signature) in properties.items():
+                payload += _byte.render_varstr(name)
+                payload += _byte.render_varstr(value)
+                payload += (b'\x00' if signature is None else
+                            b'\x01' + _byte.render_varstr(signature))
 
-    @payload.setter
-    def payload(self, it: bytes | bytearray | _Iterator[int]) -> None:
+        if action in (0, 1):
+            payload += _byte.render_varint(update['gamemode'])
 
-        it = iter(it)
-        self.action = _iter.consume_varint(it)
-        assert 0 <= self.action <= 4
+        if action in (0, 2):
+            payload += _byte.render_varint(update['ping'])
 
-        self.updates = {}
-        for _ in range(_iter.consume_varint(it)):
-            uuid = _UUID(bytes=bytes(_islice(it, 16)))
-            if self.action == 4:
-                self.updates[uuid] = None
-                continue
+        if action in (0, 3):
+            display_name = update['display_name']
+            payload += (b'\x00' if display_name is None else
+                        b'\x01' + _byte.render_varstr(display_name))
 
-            update = self.updates[uuid] = {}
+    return payload
 
-            if self.action == 0:
-                update['name'] = _iter.consume_varstr(it)
-                properties = update['properties'] = {}
-                for __ in range(_iter.consume_varint(it)):
-                    name = _iter.consume_varstr(it)
-                    value = _iter.consume_varstr(it)
-                    signature = _iter.consume_varstr(it) if next(it) else None
-                    properties[name] = (value, signature)
-                update['properties'] = properties
 
-            if self.action in (0, 1):
-                update['gamemode'] = _iter.consume_varint(it)
+class PlayerInfo(Packet):
 
-            if self.action in (0, 2):
-                update['ping'] = _iter.consume_varint(it)
+    id = 0x36
 
-            if self.action in (0, 3):
-                update['display_name'] = (_iter.consume_varstr(it)
-                                          if next(it) else None)
-        () = it
+    schema = _schema.Schema(
+        _schema.Custom('action', 'updates',
+                       parse=_parse_player_info,
+                       render=_render_player_info,
+                       default=(0, None)),
+    )
 
 
 class PlayerPositionAndLook(Packet):
 
     id = 0x38
+    pool_size = 1024
 
-    def __init__(
-            self,
-            x: float = 0.0,
-            y: float = 0.0,
-            z: float = 0.0,
-            yaw: float = 0.0,
-            pitch: float = 0.0,
-            flags: int = 0,
-            teleport_id: int = 0,
-            dismount_vehicle: bool = False,
-    ) -> None:
-
-        super().__init__()
-
-        self.x = x
-        self.y = y
-        self.z = z
-        self.yaw = yaw
-        self.pitch = pitch
-        self.flags = flags
-        self.teleport_id = teleport_id
-        self.dismount_vehicle = dismount_vehicle
-
-    def __getstate__(self) -> dict[str, object]:
-
-        return {key: getattr(self, key) for key in [
-            'x',
-            'y',
-            'z',
-            'yaw',
-            'pitch',
-            'flags',
-            'teleport_id',
-            'dismount_vehicle',
-        ]}
+    schema = _schema.Schema(
+        _schema.Double('x', default=0.0),
+        _schema.Double('y', default=0.0),
+        _schema.Double('z', default=0.0),
+        _schema.Float('yaw', default=0.0),
+        _schema.Float('pitch', default=0.0),
+        _schema.UByte('flags', default=0),
+        _schema.VarInt('teleport_id', default=0),
+        _schema.Bool('dismount_vehicle', default=False),
+    )
 
-    @property
-    def payload(self) -> bytes | bytearray:
-
-        return b'%b%b%b%b%b%c%b%c' % (
-            _byte.render_double(self.x),
-            _byte.render_double(self.y),
-            _byte.render_double(self.z),
-            _byte.render_float(self.yaw),
-            _byte.render_float(self.pitch),
-            self.flags,
-            _byte.render_varint(self.teleport_id),
-            self.dismount_vehicle,
-        )
-
-    @payload.setter
-    def payload(self, it: bytes | bytearray | _Iterator[int]) -> None:
-
-        it = iter(it)
-        self.x = _iter.consume_double(it)
-        self.y = _iter.consume_double(it)
-        self.z = _iter.consume_double(it)
-        self.yaw = _iter.consume_float(it)
-        self.pitch = _iter.consume_float(it)
-        self.flags = next(it)
-        self.teleport_id = _iter.consume_varint(it)
-        self.dismount_vehicle = bool(next(it))
-        () = it
+    def _validate(self) -> None:
 
         assert _math.isfinite(self.x)
         assert _math.isfinite(self.y)
@@ -867,70 +544,50 @@ class PlayerPositionAndLook(Packet):
         assert not (self.flags & ~0x1f)
 
 
-class EntityHeadLook(Packet):
-
-    id = 0x3e
+def _parse_entity_ids(data: memoryview, start: int) -> tuple[
+        list[int], int]:
 
-    def __init__(self, entity_id: int, head_yaw: float) -> None:
+    n, start = _byte.parse_varint(data, start)
+    return _varint.decode_varints(data, n, start)
 
-        super().__init__()
 
-        self.entity_id = entity_id
-        self.head_yaw = head_yaw
+def _render_entity_ids(entity_ids: list[int]) -> bytes:
 
-    def __getstate__(self) -> dict[str, object]:
+    return (_byte.render_varint(len(entity_ids))
+            + _varint.encode_varints(entity_ids))
 
-        return {key: getattr(self, key) for key in [
-            'entity_id',
-            'head_yaw',
-        ]}
 
-    @property
-    def payload(self) -> bytes | bytearray:
+class DestroyEntities(Packet):
 
-        return b'%b%c' % (
-            _byte.render_varint(self.entity_id),
-            round(self.head_yaw / 1.40625) & 0xff,
-        )
+    id = 0x3a
 
-    @payload.setter
-    def payload(self, it: bytes | bytearray | _Iterator[int]) -> None:
+    schema = _schema.Schema(
+        _schema.Custom('entity_ids',
+                       parse=_parse_entity_ids,
+                       render=_render_entity_ids),
+    )
 
-        it = iter(it)
-        self.entity_id = _iter.consume_varint(it)
-        self.head_yaw = next(it) * 1.40625
-        () = it
-
-
-class HeldItemChange(Packet):
 
-    id = 0x48
-
-    def __init__(self, slot: int = 0) -> None:
-
-        super().__init__()
+class EntityHeadLook(Packet):
 
-        self.slot = slot
+    id = 0x3e
+    pool_size = 1024
 
-    def __getstate__(self) -> dict[str, object]:
+    schema = _schema.Schema(
+        _schema.VarInt('entity_id'),
+        _schema.Angle('head_yaw'),
+    )
 
-        return {key: getattr(self, key) for key in [
-            'slot',
-        ]}
 
-    @property
-    def payload(self) -> bytes | bytearray:
+class HeldItemChange(Packet):
 
-        return b'%c' % (
-            self.slot,
-        )
+    id = 0x48
 
-    @payload.setter
-    def payload(self, it: bytes | bytearray | _Iterator[int]) -> None:
+    schema = _schema.Schema(
+        _schema.UByte('slot', default=0),
+    )
 
-        it = iter(it)
-        self.slot = next(it)
-        () = it
+    def _validate(self) -> None:
 
         assert 0 <= self.slot <= 8
 
@@ -939,204 +596,84 @@ class UpdateViewPosition(Packet):
 
     id = 0x49
 
-    def __init__(self, chunk_x: int, chunk_z: int) -> None:
-
-        super().__init__()
-
-        self.chunk_x = chunk_x
-        self.chunk_z = chunk_z
-
-    def __getstate__(self) -> dict[str, object]:
-
-        return {key: getattr(self, key) for key in [
-            'chunk_x',
-            'chunk_z',
-        ]}
-
-    @property
-    def payload(self) -> bytes | bytearray:
-
-        return b'%b%b' % (
-            _byte.render_varint(self.chunk_x),
-            _byte.render_varint(self.chunk_z),
-        )
-
-    @payload.setter
-    def payload(self, it: bytes | bytearray | _Iterator[int]) -> None:
-
-        it = iter(it)
-        self.chunk_x = _iter.consume_varint(it)
-        self.chunk_z = _iter.consume_varint(it)
-        () = it
+    schema = _schema.Schema(
+        _schema.VarInt('chunk_x'),
+        _schema.VarInt('chunk_z'),
+    )
 
 
 class SpawnPosition(Packet):
 
     id = 0x4b
 
-    def __init__(self, x: int, y: int, z: int, angle: float) -> None:
-
-        super().__init__()
-
-        self.x = x
-        self.y = y
-        self.z = z
-        self.angle = angle
-
-    def __getstate__(self) -> dict[str, object]:
-
-        return {key: getattr(self, key) for key in [
-            'x',
-            'y',
-            'z',
-            'angle',
-        ]}
-
-    @property
-    def payload(self) -> bytes | bytearray:
-
-        location = (
-                (self.x & 0x3_fff_fff) << 38 |
-                (self.z & 0x3_fff_fff) << 12 |
-                (self.y & 0xfff)
-        )
-
-        return b'%b%b' % (
-            location.to_bytes(8, 'big'),
-            _byte.render_float(self.angle),
-        )
-
-    @payload.setter
-    def payload(self, it: bytes | bytearray | _Iterator[int]) -> None:
+    schema = _schema.Schema(
+        _schema.Position('x', 'y', 'z'),
+        _schema.Float('angle'),
+    )
 
-        it = iter(it)
-        location = int.from_bytes(_islice(it, 8), 'big', signed=True)
 
-        self.y = location | -0x800 if location & 0x800 else location & 0x7ff
-
-        location >>= 12
-        self.z = (location | -0x2_000_000 if location & 0x2_000_000
-                  else location & 0x1_fff_fff)
-
-        self.x = location >> 26
-
-        self.angle = _iter.consume_float(it)
-        () = it
-
-
-# TODO: complete
 class EntityMetadata(Packet):
 
     id = 0x4d
 
-    def __init__(self, entity_id: int, metadata: bytes | bytearray) -> None:
-
-        super().__init__()
-
-        self.entity_id = entity_id
-        self.metadata = metadata
-        # ...
-
-    def __getstate__(self) -> dict[str, object]:
-
-        return {key: getattr(self, key) for key in [
-            'entity_id',
-            'metadata',
-            # ...,
-        ]}
-
-    @property
-    def payload(self) -> bytes | bytearray:
+    schema = _schema.Schema(
+        _schema.VarInt('entity_id'),
+        _schema.Custom('metadata',
+                       parse=_metadata.parse_metadata,
+                       render=bytes,
+                       default=_metadata.Metadata()),
+    )
 
-        return b'%b%b' % (
-            _byte.render_varint(self.entity_id),
-            self.metadata,
-        )
 
-    @payload.setter
-    def payload(self, it: bytes | bytearray | _Iterator[int]) -> None:
-
-        it = iter(it)
-        self.entity_id = _iter.consume_varint(it)
-        self.metadata = bytes(it)
-        # ...
-        # () = it
-
-
-# TODO: complete
 class EntityEquipment(Packet):
 
     id = 0x50
 
-    def __init__(self, entity_id: int, equipment: bytes | bytearray) -> None:
-
-        super().__init__()
-
-        self.entity_id = entity_id
-        self.equipment = equipment
-        # ...
-
-    def __getstate__(self) -> dict[str, object]:
-
-        return {key: getattr(self, key) for key in [
-            'entity_id',
-            'equipment',
-            # ...,
-        ]}
-
-    @property
-    def payload(self) -> bytes | bytearray:
-
-        return b'%b%b' % (
-            _byte.render_varint(self.entity_id),
-            self.equipment,
-        )
-
-    @payload.setter
-    def payload(self, it: bytes | bytearray | _Iterator[int]) -> None:
-
-        it = iter(it)
-        self.entity_id = _iter.consume_varint(it)
-        self.equipment = bytes(it)
-        # ...
-        # () = it
+    schema = _schema.Schema(
+        _schema.VarInt('entity_id'),
+        _schema.Custom('equipment',
+                       parse=_item.parse_equipment,
+                       render=_item.render_equipment),
+    )
 
 
 class TimeUpdate(Packet):
 
     id = 0x59
+    pool_size = 1024
 
-    def __init__(self, world_age: int = 0, time_of_day: int = 0) -> None:
+    schema = _schema.Schema(
+        _schema.Long('world_age', default=0),
+        _schema.Long('time_of_day', default=0),
+    )
 
-        super().__init__()
+    def _validate(self) -> None:
 
-        self.world_age = world_age
-        self.time_of_day = time_of_day
+        assert self.world_age >= 0
 
-    def __getstate__(self) -> dict[str, object]:
 
-        return {key: getattr(self, key) for key in [
-            'world_age',
-            'time_of_day',
-        ]}
+class EntityTeleport(Packet):
 
-    @property
-    def payload(self) -> bytes | bytearray:
+    """Absolute move of an entity."""
 
-        return b'%b%b' % (
-            self.world_age.to_bytes(8, 'big', signed=True),
-            self.time_of_day.to_bytes(8, 'big', signed=True),
-        )
+    id = 0x62
+    pool_size = 1024
 
-    @payload.setter
-    def payload(self, it: bytes | bytearray | _Iterator[int]) -> None:
+    schema = _schema.Schema(
+        _schema.VarInt('entity_id'),
+        _schema.Double('x'),
+        _schema.Double('y'),
+        _schema.Double('z'),
+        _schema.Angle('yaw'),
+        _schema.Angle('pitch'),
+        _schema.Bool('on_ground'),
+    )
 
-        it = iter(it)
-        self.world_age = int.from_bytes(_islice(it, 8), 'big', signed=True)
-        self.time_of_day = int.from_bytes(_islice(it, 8), 'big', signed=True)
-        () = it
+    def _validate(self) -> None:
 
-        assert self.world_age >= 0
+        assert _math.isfinite(self.x)
+        assert _math.isfinite(self.y)
+        assert _math.isfinite(self.z)
 
 
 # TODO: complete
@@ -1144,39 +681,11 @@ class EntityProperties(Packet):
 
     id = 0x64
 
-    def __init__(self, entity_id: int, raw_tail: bytes | bytearray) -> None:
-
-        super().__init__()
-
-        self.entity_id = entity_id
-        # ...
-        self.raw_tail = raw_tail
-
-    def __getstate__(self) -> dict[str, object]:
-
-        return {key: getattr(self, key) for key in [
-            'entity_id',
-            # ...,
-            'raw_tail',
-        ]}
-
-    @property
-    def payload(self) -> bytes | bytearray:
-
-        return b'%b%b' % (
-            _byte.render_varint(self.entity_id),
-            # ...,
-            self.raw_tail,
-        )
-
-    @payload.setter
-    def payload(self, it: bytes | bytearray | _Iterator[int]) -> None:
-
-        it = iter(it)
-        self.entity_id = _iter.consume_varint(it)
+    schema = _schema.Schema(
+        _schema.VarInt('entity_id'),
         # ...
-        self.raw_tail = bytes(it)
-        # () = it
+        _schema.Rest('raw_tail'),
+    )
 
 
 # TODO: complete
@@ -1184,35 +693,12 @@ class DeclareRecipes(Packet):
 
     id = 0x66
 
-    def __init__(self, raw_tail: bytes) -> None:
-
-        super().__init__()
-
-        # ...
-        self.raw_tail = raw_tail
-
-    def __getstate__(self) -> dict[str, object]:
-
-        return {key: getattr(self, key) for key in [
-            # ...,
-            'raw_tail',
-        ]}
-
-    @property
-    def payload(self) -> bytes | bytearray:
-
-        return b'%b' % (
-            # ...,
-            self.raw_tail,
-        )
-
-    @payload.setter
-    def payload(self, it: bytes | bytearray | _Iterator[int]) -> None:
-
-        it = iter(it)
+    schema = _schema.Schema(
         # ...
-        self.raw_tail = bytes(it)
-        # () = it
+        _schema.Custom('raw_tail',
+                       parse=_blob.parse_rest,
+                       render=bytes),
+    )
 
 
 # TODO: complete
@@ -1220,32 +706,9 @@ class Tags(Packet):
 
     id = 0x67
 
-    def __init__(self, raw_tail: bytes) -> None:
-
-        super().__init__()
-
-        # ...
-        self.raw_tail = raw_tail
-
-    def __getstate__(self) -> dict[str, object]:
-
-        return {key: getattr(self, key) for key in [
-            # ...,
-            'raw_tail',
-        ]}
-
-    @property
-    def payload(self) -> bytes | bytearray:
-
-        return b'%b' % (
-            # ...,
-            self.raw_tail,
-        )
-
-    @payload.setter
-    def payload(self, it: bytes | bytearray | _Iterator[int]) -> None:
-
-        it = iter(it)
+    schema = _schema.Schema(
         # ...
-        self.raw_tail = bytes(it)
-        # () = it
+        _schema.Custom('raw_tail',
+                       parse=_blob.parse_rest,
+                       render=bytes),
+    )
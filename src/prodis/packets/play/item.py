@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+
+"""Item stacks of the play state."""
+
+from __future__ import annotations
+
+from typing import (
+    NamedTuple as _NamedTuple,
+)
+
+from collections.abc import (
+    Iterable as _Iterable,
+)
+
+from ...utils import byte as _byte
+from ...utils import nbt as _nbt
+
+
+class Slot(_NamedTuple):
+
+    """Item stack in a slot.
+
+    `nbt` is the NBT of the stack, left undecoded until `tag` is accessed.
+    """
+
+    item_id: int
+    # not `count`, which would shadow `tuple.count()`
+    item_count: int
+    nbt: bytes = b'\x00'
+
+    @property
+    def tag(self) -> object:
+
+        return _nbt.parse(self.nbt)[0]
+
+
+def parse_slot(data: memoryview, start: int = 0) -> tuple[Slot | None, int]:
+
+    """Parse a slot, which is `None` if empty."""
+
+    present, start = _byte.parse_bool(data, start)
+    if not present:
+        return None, start
+
+    item_id, start = _byte.parse_varint(data, start)
+    count, start = _byte.parse_byte(data, start)
+    nbt, start = _nbt.parse_raw(data, start)
+
+    # copied, since it is small and this keeps the slots picklable
+    return Slot(item_id, count, bytes(nbt)), start
+
+
+def render_slot(slot: Slot | None) -> bytes:
+
+    if slot is None:
+        return b'\x00'
+
+    return (b'\x01' + _byte.render_varint(slot.item_id)
+            + (slot.item_count & 0xff).to_bytes(1, 'big') + slot.nbt)
+
+
+def parse_slots(data: memoryview, start: int = 0) -> tuple[
+        list[Slot | None], int]:
+
+    n, start = _byte.parse_varint(data, start)
+
+    slots = []
+    for _ in range(n):
+        slot, start = parse_slot(data, start)
+        slots.append(slot)
+
+    return slots, start
+
+
+def render_slots(slots: _Iterable[Slot | None]) -> bytes:
+
+    slots = list(slots)
+
+    return _byte.render_varint(len(slots)) + b''.join(map(render_slot,
+                                                            slots))
+
+
+def parse_equipment(data: memoryview, start: int = 0) -> tuple[
+        list[tuple[int, Slot | None]], int]:
+
+    """Parse equipment, a list of slot indexes and the stacks in them."""
+
+    equipment = []
+    while True:
+        index, start = _byte.parse_ubyte(data, start)
+        slot, start = parse_slot(data, start)
+        equipment.append((index & 0x7f, slot))
+
+        # the top bit marks that another entry follows
+        if not index & 0x80:
+            return equipment, start
+
+
+def render_equipment(equipment: _Iterable[tuple[int, Slot | None]]
+                     ) -> bytes:
+
+    equipment = list(equipment)
+    if not equipment:
+        raise ValueError("equipment needs at least one entry")
+
+    last = len(equipment) - 1
+
+    return b''.join(
+        bytes((index & 0x7f | (0x80 if i < last else 0),)) + render_slot(slot)
+        for i, (index, slot) in enumerate(equipment)
+    )
@@ -0,0 +1,467 @@
+#!/usr/bin/env python3
+
+"""Entity metadata of the play state, decoded on lookup.
+
+Metadata is a list of entries, each with an index, a type and a value,
+terminated by an index of 0xff. Looking up an index only skips over the
+entries before it instead of decoding them, so watching a single entry of
+many entities stays cheap.
+"""
+
+from __future__ import annotations
+
+from typing import (
+    Any as _Any,
+    NamedTuple as _NamedTuple,
+)
+
+from collections.abc import (
+    Callable as _Callable,
+    Iterable as _Iterable,
+    Iterator as _Iterator,
+    Mapping as _Mapping,
+)
+
+from struct import (
+    Struct as _Struct,
+    error as _StructError,
+)
+
+from uuid import UUID as _UUID
+
+from ..schema import (
+    _pack_position,
+    _unpack_position,
+)
+
+from . import item as _item
+
+from ...utils import byte as _byte
+from ...utils import nbt as _nbt
+
+
+(BYTE, VARINT, FLOAT, STRING, CHAT, OPT_CHAT, SLOT, BOOLEAN, ROTATION,
+ POSITION, OPT_POSITION, DIRECTION, OPT_UUID, OPT_BLOCK_ID, NBT, PARTICLE,
+ VILLAGER_DATA, OPT_VARINT, POSE) = range(19)
+
+END = 0xff
+
+# particles with data, as of protocol 757
+PARTICLE_BLOCK = 2
+PARTICLE_BLOCK_MARKER = 3
+PARTICLE_DUST = 14
+PARTICLE_DUST_COLOR_TRANSITION = 15
+PARTICLE_FALLING_DUST = 24
+PARTICLE_ITEM = 35
+PARTICLE_VIBRATION = 36
+
+_FLOAT = _Struct('>f')
+_DUST = _Struct('>4f')
+_DUST_COLOR_TRANSITION = _Struct('>7f')
+_ROTATION = _Struct('>3f')
+_VIBRATION_ORIGIN = _Struct('>3d')
+_LONG = _Struct('>q')
+
+
+class Entry(_NamedTuple):
+
+    # not `index`, which would shadow `tuple.index()`
+    slot_index: int
+    type: int
+    value: object
+
+
+class Particle(_NamedTuple):
+
+    """Particle with the data specific to its id, if any.
+
+    The data is the block state for block particles, the color components
+    and scale for dust particles, a single slot for item particles and the
+    origin, destination and ticks for vibration particles.
+    """
+
+    id: int
+    data: tuple = ()
+
+
+def _unpack(s: _Struct) -> _Callable[[memoryview, int], tuple[tuple, int]]:
+
+    def parse(data: memoryview, start: int) -> tuple[tuple, int]:
+
+        try:
+            values = s.unpack_from(data, start)
+
+        except _StructError:
+            raise ValueError("end of data reached") from None
+
+        return values, start + s.size
+
+    return parse
+
+
+_parse_dust = _unpack(_DUST)
+_parse_dust_color_transition = _unpack(_DUST_COLOR_TRANSITION)
+_parse_rotation = _unpack(_ROTATION)
+_parse_vibration_origin = _unpack(_VIBRATION_ORIGIN)
+
+
+def _optional(parse: _Callable[[memoryview, int], tuple[object, int]]
+              ) -> _Callable[[memoryview, int], tuple[object, int]]:
+
+    def parse_optional(data: memoryview, start: int) -> tuple[object, int]:
+
+        present, start = _byte.parse_bool(data, start)
+        if not present:
+            return None, start
+
+        return parse(data, start)
+
+    return parse_optional
+
+
+def _parse_position(data: memoryview, start: int) -> tuple[
+        tuple[int, int, int], int]:
+
+    location, start = _byte.parse_long(data, start)
+    return _unpack_position(location), start
+
+
+def _parse_uuid(data: memoryview, start: int) -> tuple[_UUID, int]:
+
+    end = start + 16
+    if end > len(data):
+        raise ValueError("end of data reached")
+
+    return _UUID(bytes=bytes(data[start:end])), end
+
+
+def _parse_opt_block_id(data: memoryview, start: int) -> tuple[
+        int | None, int]:
+
+    value, start = _byte.parse_varint(data, start)
+    return value or None, start
+
+
+def _parse_opt_varint(data: memoryview, start: int) -> tuple[
+        int | None, int]:
+
+    value, start = _byte.parse_varint(data, start)
+    return value - 1 if value else None, start
+
+
+def _parse_nbt(data: memoryview, start: int) -> tuple[bytes, int]:
+
+    nbt, start = _nbt.parse_raw(data, start)
+    return bytes(nbt), start
+
+
+def _parse_villager_data(data: memoryview, start: int) -> tuple[
+        tuple[int, int, int], int]:
+
+    type_, start = _byte.parse_varint(data, start)
+    profession, start = _byte.parse_varint(data, start)
+    level, start = _byte.parse_varint(data, start)
+
+    return (type_, profession, level), start
+
+
+def parse_particle(data: memoryview, start: int = 0) -> tuple[Particle, int]:
+
+    id_, start = _byte.parse_varint(data, start)
+
+    if id_ in (PARTICLE_BLOCK, PARTICLE_BLOCK_MARKER, PARTICLE_FALLING_DUST):
+        state, start = _byte.parse_varint(data, start)
+        return Particle(id_, (state,)), start
+
+    if id_ == PARTICLE_DUST:
+        values, start = _parse_dust(data, start)
+        return Particle(id_, values), start
+
+    if id_ == PARTICLE_DUST_COLOR_TRANSITION:
+        values, start = _parse_dust_color_transition(data, start)
+        return Particle(id_, values), start
+
+    if id_ == PARTICLE_ITEM:
+        slot, start = _item.parse_slot(data, start)
+        return Particle(id_, (slot,)), start
+
+    if id_ == PARTICLE_VIBRATION:
+        origin, start = _parse_vibration_origin(data, start)
+        kind, start = _byte.parse_identifier(data, start)
+
+        destination: object
+        if kind == ('minecraft', 'block'):
+            destination, start = _parse_position(data, start)
+
+        elif kind == ('minecraft', 'entity'):
+            destination, start = _byte.parse_varint(data, start)
+
+        else:
+            raise ValueError(f"unknown position source {kind[0]}:{kind[1]}")
+
+        ticks, start = _byte.parse_varint(data, start)
+        return Particle(id_, (*origin, kind, destination, ticks)), start
+
+    return Particle(id_), start
+
+
+def render_particle(particle: Particle) -> bytes:
+
+    id_, values = particle
+    prefix = _byte.render_varint(id_)
+
+    if id_ in (PARTICLE_BLOCK, PARTICLE_BLOCK_MARKER, PARTICLE_FALLING_DUST):
+        return prefix + _byte.render_varint(*values)
+
+    if id_ == PARTICLE_DUST:
+        return prefix + _DUST.pack(*values)
+
+    if id_ == PARTICLE_DUST_COLOR_TRANSITION:
+        return prefix + _DUST_COLOR_TRANSITION.pack(*values)
+
+    if id_ == PARTICLE_ITEM:
+        return prefix + _item.render_slot(*values)
+
+    if id_ == PARTICLE_VIBRATION:
+        x, y, z, kind, destination, ticks = values
+        prefix += _VIBRATION_ORIGIN.pack(x, y, z) + _byte.render_identifier(
+            *kind)
+
+        if kind == ('minecraft', 'block'):
+            prefix += _LONG.pack(_pack_position(*destination))
+
+        else:
+            prefix += _byte.render_varint(destination)
+
+        return prefix + _byte.render_varint(ticks)
+
+    return prefix
+
+
+_PARSERS: dict[int, _Callable[[memoryview, int], tuple[object, int]]] = {
+    BYTE: _byte.parse_byte,
+    VARINT: _byte.parse_varint,
+    FLOAT: _byte.parse_float,
+    STRING: _byte.parse_varstr,
+    CHAT: _byte.parse_varstr,
+    OPT_CHAT: _optional(_byte.parse_varstr),
+    SLOT: _item.parse_slot,
+    BOOLEAN: _byte.parse_bool,
+    ROTATION: _parse_rotation,
+    POSITION: _parse_position,
+    OPT_POSITION: _optional(_parse_position),
+    DIRECTION: _byte.parse_varint,
+    OPT_UUID: _optional(_parse_uuid),
+    OPT_BLOCK_ID: _parse_opt_block_id,
+    NBT: _parse_nbt,
+    PARTICLE: parse_particle,
+    VILLAGER_DATA: _parse_villager_data,
+    OPT_VARINT: _parse_opt_varint,
+    POSE: _byte.parse_varint,
+}
+
+
+def _optional_render(render: _Callable[..., bytes]
+                     ) -> _Callable[[object], bytes]:
+
+    def render_optional(value: object) -> bytes:
+
+        return b'\x00' if value is None else b'\x01' + render(value)
+
+    return render_optional
+
+
+def _render_position(position: tuple[int, int, int]) -> bytes:
+
+    return _LONG.pack(_pack_position(*position))
+
+
+def _render_uuid(uuid: _UUID | str) -> bytes:
+
+    return (uuid if isinstance(uuid, _UUID) else _UUID(uuid)).bytes
+
+
+_RENDERERS: dict[int, _Callable[[_Any], bytes]] = {
+    BYTE: lambda value: (value & 0xff).to_bytes(1, 'big'),
+    VARINT: _byte.render_varint,
+    FLOAT: _FLOAT.pack,
+    STRING: _byte.render_varstr,
+    CHAT: _byte.render_varstr,
+    OPT_CHAT: _optional_render(_byte.render_varstr),
+    SLOT: _item.render_slot,
+    BOOLEAN: lambda value: b'\x01' if value else b'\x00',
+    ROTATION: lambda value: _ROTATION.pack(*value),
+    POSITION: _render_position,
+    OPT_POSITION: _optional_render(_render_position),
+    DIRECTION: _byte.render_varint,
+    OPT_UUID: _optional_render(_render_uuid),
+    OPT_BLOCK_ID: lambda value: _byte.render_varint(value or 0),
+    NBT: bytes,
+    PARTICLE: render_particle,
+    VILLAGER_DATA: lambda value: b''.join(map(_byte.render_varint, value)),
+    OPT_VARINT: lambda value: _byte.render_varint(
+        0 if value is None else value + 1),
+    POSE: _byte.render_varint,
+}
+
+# payload sizes of the fixed-size types
+_SIZES = {BYTE: 1, FLOAT: 4, BOOLEAN: 1, ROTATION: 12, POSITION: 8}
+
+_VARINT_TYPES = frozenset((VARINT, DIRECTION, OPT_BLOCK_ID, OPT_VARINT,
+                           POSE))
+
+
+def _parser(type_: int) -> _Callable[[memoryview, int], tuple[object, int]]:
+
+    try:
+        return _PARSERS[type_]
+
+    except KeyError:
+        raise ValueError(f"invalid metadata type {type_}") from None
+
+
+def _skip(data: memoryview, type_: int, pos: int) -> int:
+
+    if (size := _SIZES.get(type_)) is not None:
+        return pos + size
+
+    if type_ in _VARINT_TYPES:
+        while data[pos] & 0x80:
+            pos += 1
+
+        return pos + 1
+
+    if type_ in (STRING, CHAT):
+        n, pos = _byte.parse_varint(data, pos)
+        if n < 0:
+            # skipping backwards would misread or loop over earlier entries
+            raise ValueError("negative string length")
+
+        return pos + n
+
+    return _parser(type_)(data, pos)[1]
+
+
+class Metadata(_Mapping[int, object]):
+
+    """Entity metadata, mapping the indexes of its entries to their values.
+
+    Values are decoded on lookup, which skips over the entries before the
+    one looked up. `entries()` decodes all of them at once.
+
+    Chat values are kept as their JSON text, NBT values as raw NBT.
+    """
+
+    __slots__ = ('_data',)
+
+    _data: memoryview
+
+    def __init__(self, data: bytes | bytearray | memoryview = b'\xff'
+                 ) -> None:
+
+        self._data = _byte.view(data)
+
+    @classmethod
+    def from_entries(cls, entries: _Iterable[tuple[int, int, object]]
+                     ) -> Metadata:
+
+        return cls(b''.join(
+            bytes((index, type_)) + _RENDERERS[type_](value)
+            for index, type_, value in entries
+        ) + b'\xff')
+
+    def _find(self, index: int) -> tuple[int, int]:
+
+        data = self._data
+        pos = 0
+
+        try:
+            while (current := data[pos]) != END:
+                type_ = data[pos + 1]
+                if current == index:
+                    return type_, pos + 2
+
+                pos = _skip(data, type_, pos + 2)
+
+        except IndexError:
+            raise ValueError("end of data reached") from None
+
+        raise KeyError(index)
+
+    def type_of(self, index: int) -> int:
+
+        return self._find(index)[0]
+
+    def __getitem__(self, index: int) -> object:
+
+        type_, pos = self._find(index)
+        return _parser(type_)(self._data, pos)[0]
+
+    def __contains__(self, index: object) -> bool:
+
+        if not isinstance(index, int):
+            return False
+
+        try:
+            self._find(index)
+
+        except KeyError:
+            return False
+
+        return True
+
+    def __iter__(self) -> _Iterator[int]:
+
+        data = self._data
+        pos = 0
+
+        try:
+            while (index := data[pos]) != END:
+                yield index
+                pos = _skip(data, data[pos + 1], pos + 2)
+
+        except IndexError:
+            raise ValueError("end of data reached") from None
+
+    def __len__(self) -> int:
+
+        return sum(1 for _ in self)
+
+    def entries(self) -> tuple[Entry, ...]:
+
+        data = self._data
+        pos = 0
+        entries = []
+
+        try:
+            while (index := data[pos]) != END:
+                type_ = data[pos + 1]
+                value, pos = _parser(type_)(data, pos + 2)
+                entries.append(Entry(index, type_, value))
+
+        except IndexError:
+            raise ValueError("end of data reached") from None
+
+        return tuple(entries)
+
+    def __bytes__(self) -> bytes:
+
+        return bytes(self._data)
+
+    def __reduce__(self) -> tuple:
+
+        return type(self), (bytes(self._data),)
+
+    def __repr__(self) -> str:
+
+        return f"{type(self).__name__}({list(self.entries())!r})"
+
+
+def parse_metadata(data: memoryview, start: int = 0) -> tuple[Metadata, int]:
+
+    """Take the remaining bytes of the payload as metadata.
+
+    The entries are only checked as far as they are accessed.
+    """
+
+    return Metadata(data[start:]), len(data)
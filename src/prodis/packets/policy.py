@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+from typing import (
+    Type as _Type,
+)
+
+from collections.abc import (
+    Mapping as _Mapping,
+)
+
+from threading import Lock as _Lock
+from time import thread_time_ns as _thread_time_ns
+from zlib import compress as _compress
+
+
+class CompressionStats:
+
+    __slots__ = ('count', 'skipped', 'size', 'compressed_size', 'cpu_ns')
+
+    count: int
+    skipped: int
+    size: int
+    compressed_size: int
+    cpu_ns: int
+
+    def __init__(self) -> None:
+
+        self.count = 0
+        self.skipped = 0
+        self.size = 0
+        self.compressed_size = 0
+        self.cpu_ns = 0
+
+    def __repr__(self) -> str:
+
+        return (f"{type(self).__qualname__}(count={self.count}, "
+                f"skipped={self.skipped}, ratio={self.ratio:.3f}, "
+                f"cpu_time={self.cpu_time:.6f})")
+
+    @property
+    def ratio(self) -> float:
+
+        """Compressed size relative to the uncompressed size."""
+
+        return self.compressed_size / self.size if self.size else 1.0
+
+    @property
+    def cpu_time(self) -> float:
+
+        return self.cpu_ns / 1e9
+
+
+class CompressionPolicy:
+
+    """Choose how to compress outgoing frames, per packet class and size.
+
+    Frames get compressed at `level`, unless `levels` maps the packet class
+    to a different level or to `None`, which means sending the frame
+    uncompressed. Frames of at least `bulk_size` bytes use `bulk_level` if
+    both are given and the class has no explicit level.
+
+    If `max_ratio` is given, classes which compress worse than that on
+    average after `min_samples` frames are considered dense and sent
+    uncompressed, except for every `min_samples`th frame, which keeps
+    sampling in case the payloads change.
+
+    The achieved compression ratio and the CPU time spent are recorded per
+    class in `stats`.
+    """
+
+    level: int
+    levels: dict[type, int | None]
+    bulk_size: int | None
+    bulk_level: int | None
+    max_ratio: float | None
+    min_samples: int
+    stats: dict[type, CompressionStats]
+
+    def __init__(
+            self,
+            level: int = 1,
+            levels: _Mapping[type, int | None] | None = None,
+            bulk_size: int | None = None,
+            bulk_level: int | None = None,
+            max_ratio: float | None = None,
+            min_samples: int = 16,
+    ) -> None:
+
+        if (bulk_size is None) != (bulk_level is None):
+            raise ValueError("bulk_size and bulk_level must be given together")
+
+        self.level = level
+        self.levels = dict(levels or {})
+        self.bulk_size = bulk_size
+        self.bulk_level = bulk_level
+        self.max_ratio = max_ratio
+        self.min_samples = min_samples
+        self.stats = {}
+
+        self._lock = _Lock()
+
+    def choose(self, packet_type: _Type, size: int) -> int | None:
+
+        """Return the level to compress a frame at, or `None` to skip it."""
+
+        if packet_type in self.levels:
+            return self.levels[packet_type]
+
+        if self.max_ratio is not None:
+            stats = self.stats.get(packet_type)
+            if (stats is not None and stats.count >= self.min_samples
+                    and stats.ratio > self.max_ratio
+                    and (stats.count + stats.skipped) % self.min_samples):
+                return None
+
+        if (self.bulk_level is not None and self.bulk_size is not None
+                and size >= self.bulk_size):
+            return self.bulk_level
+
+        return self.level
+
+    def compress(self, packet_type: _Type,
+                 data: bytes | bytearray | memoryview) -> bytes | None:
+
+        """Compress a frame according to the policy and record the result.
+
+        Returns `None` if the frame should be sent uncompressed.
+        """
+
+        level = self.choose(packet_type, len(data))
+
+        if level is None:
+            with self._lock:
+                self._stats(packet_type).skipped += 1
+
+            return None
+
+        start = _thread_time_ns()
+        compressed = _compress(data, level=level)
+        elapsed = _thread_time_ns() - start
+
+        with self._lock:
+            stats = self._stats(packet_type)
+            stats.count += 1
+            stats.size += len(data)
+            stats.compressed_size += len(compressed)
+            stats.cpu_ns += elapsed
+
+        return compressed
+
+    def _stats(self, packet_type: _Type) -> CompressionStats:
+
+        try:
+            return self.stats[packet_type]
+
+        except KeyError:
+            stats = self.stats[packet_type] = CompressionStats()
+            return stats
@@ -0,0 +1,681 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+from typing import (
+    Any as _Any,
+    Type as _Type,
+)
+
+from collections.abc import (
+    Callable as _Callable,
+    Iterator as _Iterator,
+)
+
+import json as _json
+
+from struct import (
+    Struct as _Struct,
+    error as _StructError,
+)
+
+from types import MemberDescriptorType as _MemberDescriptorType
+from uuid import UUID as _UUID
+
+from ..utils import byte as _byte
+from ..utils import varint as _varint
+
+
+_MISSING = object()
+
+
+def _unpack_position(location: int) -> tuple[int, int, int]:
+
+    y = location | -0x800 if location & 0x800 else location & 0x7ff
+
+    location >>= 12
+    z = (location | -0x2_000_000 if location & 0x2_000_000
+         else location & 0x1_fff_fff)
+
+    return location >> 26, y, z
+
+
+def _pack_position(x: int, y: int, z: int) -> int:
+
+    location = (
+            (x & 0x3_fff_fff) << 38 |
+            (z & 0x3_fff_fff) << 12 |
+            (y & 0xfff)
+    )
+
+    return location - (1 << 64) if location >> 63 else location
+
+
+def _parse_rest(data: memoryview, start: int) -> tuple[memoryview, int]:
+
+    return data[start:], len(data)
+
+
+def _render_rest(data: bytes | bytearray | memoryview
+                 ) -> bytes | bytearray | memoryview:
+
+    return data
+
+
+def _parse_json(data: memoryview, start: int) -> tuple[object, int]:
+
+    s, end = _byte.parse_varstr(data, start)
+    return _json.loads(s), end
+
+
+def _render_json(obj: object) -> bytes:
+
+    return _byte.render_varstr(_json.dumps(obj, separators=(',', ':')))
+
+
+# names available to the expressions of the generated code
+_GLOBALS = {
+    '_UUID': _UUID,
+    '_StructError': _StructError,
+    '_view': _byte.view,
+    '_unpack_position': _unpack_position,
+    '_pack_position': _pack_position,
+}
+
+
+class Field:
+
+    """A field of a packet schema, decoded into the attributes `names`.
+
+    Most fields have a single name, but some wire types like `Position` or
+    `Identifier` are split into several attributes. `default` is the
+    default value of the generated `__init__` parameter, or a tuple of them
+    for several names.
+
+    If `when` is given, the field is only present on the wire if that
+    Python expression over the preceding field names is true. `optional`
+    fields are preceded by a bool telling whether they are present. Absent
+    fields are `None`.
+
+    Numeric values are divided by `scale` when decoding and multiplied by
+    it and rounded when encoding. `show` is applied to the value in
+    `__getstate__`, e.g. for displaying it differently.
+    """
+
+    fmt: str | None = None
+
+    names: tuple[str, ...]
+    defaults: tuple[object, ...]
+    when: str | None
+    optional: bool
+    scale: float | None
+    show: _Callable[[_Any], object] | None
+
+    def __init__(
+            self,
+            *names: str,
+            default: _Any = _MISSING,
+            when: str | None = None,
+            optional: bool = False,
+            scale: float | None = None,
+            show: _Callable[[_Any], object] | None = None,
+    ) -> None:
+
+        if not names:
+            raise TypeError("a field needs at least one name")
+
+        if len(names) > 1 and scale is not None:
+            raise TypeError("only a single value can be scaled")
+
+        if len(names) == 1:
+            default = (default,)
+
+        elif default is _MISSING:
+            default = (_MISSING,) * len(names)
+
+        elif len(default) != len(names):
+            raise ValueError("need a default for each name")
+
+        self.names = names
+        self.defaults = tuple(default)
+        self.when = when
+        self.optional = optional
+        self.scale = scale
+        self.show = show
+
+    def __repr__(self) -> str:
+
+        return f"{type(self).__name__}({', '.join(map(repr, self.names))})"
+
+    @property
+    def targets(self) -> str:
+
+        return ', '.join(self.names)
+
+    def decode_expr(self, raw: str) -> str:
+
+        """Python expression converting the `raw` wire value."""
+
+        return raw
+
+    def encode_expr(self, *values: str) -> str:
+
+        """Python expression converting `values` into the wire value."""
+
+        value, = values
+        return value
+
+    def convert_expr(self, value: str) -> str | None:
+
+        """Python expression coercing an `__init__` argument, if needed."""
+
+        return None
+
+    def decode_value(self, raw: str) -> str:
+
+        expr = self.decode_expr(raw)
+        if self.scale is not None:
+            expr = f'{expr} / {self.scale!r}'
+
+        return expr
+
+    def encode_value(self) -> str:
+
+        if self.scale is not None:
+            return self.encode_expr(f'round({self.names[0]} * '
+                                    f'{self.scale!r})')
+
+        return self.encode_expr(*self.names)
+
+
+class _Variable(Field):
+
+    """Field of variable size, decoded by `parse` and encoded by `render`.
+
+    `parse` takes a buffer and an offset and returns the value and the
+    offset following it, while `render` returns the encoded bytes. For
+    fields with several names, the value is a tuple of them.
+    """
+
+    parse: _Callable[[memoryview, int], tuple[object, int]]
+    render: _Callable[..., bytes | bytearray | memoryview]
+
+
+class Bool(Field):
+    fmt = '?'
+
+
+class Byte(Field):
+    fmt = 'b'
+
+
+class UByte(Field):
+    fmt = 'B'
+
+
+class Short(Field):
+    fmt = 'h'
+
+
+class UShort(Field):
+    fmt = 'H'
+
+
+class Int(Field):
+    fmt = 'i'
+
+
+class Long(Field):
+    fmt = 'q'
+
+
+class Float(Field):
+    fmt = 'f'
+
+
+class Double(Field):
+    fmt = 'd'
+
+
+class Angle(Field):
+
+    """Angle in degrees, stored as steps of 1/256 of a full turn."""
+
+    fmt = 'B'
+
+    def decode_expr(self, raw: str) -> str:
+
+        return f'{raw} * 1.40625'
+
+    def encode_expr(self, *values: str) -> str:
+
+        value, = values
+        return f'round({value} / 1.40625) & 0xff'
+
+
+class UUID(Field):
+
+    fmt = '16s'
+
+    def decode_expr(self, raw: str) -> str:
+
+        return f'_UUID(bytes={raw})'
+
+    def encode_expr(self, *values: str) -> str:
+
+        value, = values
+        return f'{value}.bytes'
+
+    def convert_expr(self, value: str) -> str | None:
+
+        return (f'_UUID({value}) if {value} and '
+                f'not isinstance({value}, _UUID) else {value}')
+
+
+class Position(Field):
+
+    """Block position packed into a long, decoded into x, y and z."""
+
+    fmt = 'q'
+
+    def __init__(self, *names: str, **kwargs) -> None:
+
+        if len(names) != 3:
+            raise TypeError("a position needs names for x, y and z")
+
+        super().__init__(*names, **kwargs)
+
+    def decode_expr(self, raw: str) -> str:
+
+        return f'_unpack_position({raw})'
+
+    def encode_expr(self, *values: str) -> str:
+
+        return f'_pack_position({", ".join(values)})'
+
+
+class VarInt(_Variable):
+    parse = staticmethod(_varint.decode_varint)
+    render = staticmethod(_varint.encode_varint)
+
+
+class VarLong(_Variable):
+    parse = staticmethod(_varint.decode_varlong)
+    render = staticmethod(_varint.encode_varlong)
+
+
+class String(_Variable):
+    parse = staticmethod(_byte.parse_varstr)
+    render = staticmethod(_byte.render_varstr)
+
+
+class Identifier(_Variable):
+
+    """Namespaced identifier, decoded into the namespace and the name."""
+
+    parse = staticmethod(_byte.parse_identifier)
+    render = staticmethod(_byte.render_identifier)
+
+    def __init__(self, *names: str, **kwargs) -> None:
+
+        if len(names) != 2:
+            raise TypeError("an identifier needs names for namespace and name")
+
+        super().__init__(*names, **kwargs)
+
+
+class VarBytes(_Variable):
+    parse = staticmethod(_byte.parse_varbytes)
+    render = staticmethod(_byte.render_varbytes)
+
+
+class Json(_Variable):
+    parse = staticmethod(_parse_json)
+    render = staticmethod(_render_json)
+
+
+class Rest(_Variable):
+
+    """The remaining bytes of the payload, kept as a view."""
+
+    parse = staticmethod(_parse_rest)
+    render = staticmethod(_render_rest)
+
+
+class Custom(_Variable):
+
+    """Field with its own `parse` and `render` functions.
+
+    For several names, `parse` returns a tuple and `render` takes the
+    values as separate arguments.
+    """
+
+    def __init__(
+            self,
+            *names: str,
+            parse: _Callable[[memoryview, int], tuple[object, int]],
+            render: _Callable[..., bytes | bytearray | memoryview],
+            **kwargs
+    ) -> None:
+
+        super().__init__(*names, **kwargs)
+
+        self.parse = parse
+        self.render = render
+
+
+def _indent(lines: list[str], level: int = 1) -> list[str]:
+
+    return ['    ' * level + line for line in lines]
+
+
+class _Namespace(dict):
+
+    def add(self, prefix: str, value: object) -> str:
+
+        name = f'_{prefix}{len(self)}'
+        self[name] = value
+        return name
+
+
+class Schema:
+
+    """Wire layout of a packet's fields, generating the code to handle it.
+
+    Assigned to the `schema` attribute of a packet class, it provides the
+    class with an `__init__` taking the fields as arguments, a
+    `__getstate__` and a `payload` property encoding and decoding them, as
+    far as the class doesn't define them itself. Consecutive fixed-size
+    fields are handled by a single `struct.Struct`.
+
+    If the class has a `_validate()` method, it is called after decoding.
+    Packet classes get a slot for each field instead of an instance
+    `__dict__`, unless they declare `__slots__` themselves.
+    """
+
+    fields: tuple[Field, ...]
+    names: tuple[str, ...]
+
+    def __init__(self, *fields: Field) -> None:
+
+        self.fields = fields
+        self.names = tuple(name for field in fields for name in field.names)
+
+        if len(set(self.names)) != len(self.names):
+            raise ValueError("duplicate field names")
+
+    def __iter__(self) -> _Iterator[Field]:
+
+        return iter(self.fields)
+
+    def __repr__(self) -> str:
+
+        return f"{type(self).__name__}({', '.join(map(repr, self.fields))})"
+
+    def build(self, cls: _Type) -> None:
+
+        ns = _Namespace(_GLOBALS)
+        ns['__name__'] = cls.__module__
+        ns['_cls'] = cls
+
+        validate = callable(getattr(cls, '_validate', None))
+
+        source = '\n'.join([
+            *self._init_lines(ns), '',
+            *self._getstate_lines(ns), '',
+            *self._encode_lines(ns), '',
+            *self._decode_lines(ns, cls, validate), '',
+        ])
+        exec(source, ns)
+
+        for name in ('__init__', '__getstate__',
+                     '_encode_fields', '_decode_fields'):
+            function = ns[name]
+            function.__qualname__ = f'{cls.__qualname__}.{name}'
+
+            if name not in cls.__dict__:
+                setattr(cls, name, function)
+
+        if 'payload' not in cls.__dict__:
+            cls.payload = property(cls._encode_fields, cls._decode_fields)
+
+    def _init_lines(self, ns: _Namespace) -> list[str]:
+
+        params = ['self']
+        body = ['super(_cls, self).__init__()']
+
+        # positional in field order, except that fields without a default
+        # following one with a default have to be passed by keyword
+        defaulted = keyword = False
+
+        for field in self.fields:
+            for name, default in zip(field.names, field.defaults):
+                if default is _MISSING:
+                    if defaulted and not keyword:
+                        params.append('*')
+                        keyword = True
+
+                    params.append(name)
+
+                else:
+                    defaulted = True
+                    params.append(f'{name}={ns.add("default", default)}')
+
+                convert = field.convert_expr(name)
+                body.append(f'self.{name} = {convert or name}')
+
+        return [f'def __init__({", ".join(params)}):', *_indent(body)]
+
+    def _getstate_lines(self, ns: _Namespace) -> list[str]:
+
+        items = []
+        for field in self.fields:
+            show = field.show and ns.add('show', field.show)
+            for name in field.names:
+                value = f'self.{name}'
+                items.append(f'{name!r}: {show}({value})' if show
+                             else f'{name!r}: {value}')
+
+        return [
+            'def __getstate__(self):',
+            f'    return {{{", ".join(items)}}}',
+        ]
+
+    @staticmethod
+    def _runs(fields: tuple[Field, ...]) -> _Iterator[list[Field]]:
+
+        """Group consecutive fixed-size fields that are always present."""
+
+        run = []
+        for field in fields:
+            if field.fmt and field.when is None and not field.optional:
+                run.append(field)
+                continue
+
+            if run:
+                yield run
+                run = []
+
+            yield [field]
+
+        if run:
+            yield run
+
+    def _encode_lines(self, ns: _Namespace) -> list[str]:
+
+        body = [f'{name} = self.{name}' for name in self.names]
+        body.append('_parts = []')
+
+        for run in self._runs(self.fields):
+            field = run[0]
+
+            if field.fmt:
+                pack = ns.add('pack', _Struct(
+                    '>' + ''.join(f.fmt or '' for f in run)
+                ).pack)
+                expr = f'{pack}({", ".join(f.encode_value() for f in run)})'
+
+            else:
+                assert isinstance(field, _Variable)
+                render = ns.add('render', field.render)
+                args = (field.encode_value() if field.scale is not None
+                        else ', '.join(field.names))
+                expr = f'{render}({args})'
+
+            if field.optional:
+                expr = (f"b'\\x00' if {field.names[0]} is None "
+                        f"else b'\\x01' + {expr}")
+
+            if field.when is not None:
+                body.append(f'if {field.when}:')
+                body.append(f'    _parts.append({expr})')
+
+            else:
+                body.append(f'_parts.append({expr})')
+
+        body.append("return b''.join(_parts)")
+
+        return ['def _encode_fields(self):', *_indent(body)]
+
+    def reader(self, *names: str) -> _Callable[..., tuple[_Any, ...]]:
+
+        """Return a function decoding just the fields `names` of a payload.
+
+        It takes the encoded fields and the offset of the first of `names`,
+        and returns their values as decoded into a packet, in that order.
+        Only the fields from the first to the last of them are decoded, and
+        without creating a packet, which suits looking at a few fields of
+        many packets. Conditions of those fields may only refer to fields
+        among them.
+        """
+
+        if not names:
+            raise ValueError("no fields to read")
+
+        unknown = set(names) - set(self.names)
+        if unknown:
+            raise ValueError(f"unknown fields {', '.join(sorted(unknown))}")
+
+        indices = [self.names.index(name) for name in names]
+        first = min(indices)
+        last = max(indices)
+
+        # the fields holding the names from the first to the last needed
+        fields = []
+        index = 0
+        for field in self.fields:
+            if first < index + len(field.names) and index <= last:
+                fields.append(field)
+
+            index += len(field.names)
+
+        ns = _Namespace(_GLOBALS)
+        source = '\n'.join([
+            'def _read(_data, _pos=0):',
+            '    try:',
+            *_indent(self._decode_body(ns, tuple(fields)), 2),
+            '    except (_StructError, IndexError):',
+            '        raise ValueError("end of data reached") from None',
+            f'    return ({"".join(f"{name}, " for name in names)})',
+        ])
+        exec(source, ns)
+
+        function = ns['_read']
+        function.__qualname__ = f'{type(self).__name__}.reader.<locals>._read'
+        return function
+
+    def _decode_lines(self, ns: _Namespace, cls: _Type,
+                      validate: bool) -> list[str]:
+
+        body = self._decode_body(ns, self.fields)
+
+        body.extend([
+            'if _pos != len(_data):',
+            '    raise ValueError(f"{len(_data) - _pos} bytes of trailing '
+            'data")',
+        ])
+
+        # store into the slots directly, bypassing any lazy descriptors
+        store = []
+        for name in self.names:
+            member = cls.__dict__.get(name)
+            if isinstance(member, _MemberDescriptorType):
+                setter = ns.add('set', member.__set__)
+                store.append(f'{setter}(self, {name})')
+            else:
+                store.append(f'self.{name} = {name}')
+
+        if validate:
+            store.append('self._validate()')
+
+        return [
+            'def _decode_fields(self, _data):',
+            '    _data = _view(_data)',
+            '    _pos = 0',
+            '    try:',
+            *_indent(body, 2),
+            '    except (_StructError, IndexError):',
+            '        raise ValueError("end of data reached") from None',
+            *_indent(store),
+        ]
+
+    def _decode_body(self, ns: _Namespace,
+                     fields: tuple[Field, ...]) -> list[str]:
+
+        body = []
+
+        for run in self._runs(fields):
+            field = run[0]
+            absent = ' = '.join(field.names) + ' = None'
+
+            if field.fmt:
+                s = _Struct('>' + ''.join(f.fmt or '' for f in run))
+                unpack = ns.add('unpack', s.unpack_from)
+
+                targets = []
+                converts = []
+                for i, f in enumerate(run):
+                    raw = f'_r{i}'
+                    value = f.decode_value(raw)
+                    if value == raw and len(f.names) == 1:
+                        targets.append(f.names[0])
+                    else:
+                        targets.append(raw)
+                        converts.append(f'{f.targets} = {value}')
+
+                lines = [
+                    f'{", ".join(targets)}, = {unpack}(_data, _pos)',
+                    f'_pos += {s.size}',
+                    *converts,
+                ]
+
+            else:
+                assert isinstance(field, _Variable)
+                parse = ns.add('parse', field.parse)
+                target = (f'({field.targets})' if len(field.names) > 1
+                          else field.targets)
+                lines = [f'{target}, _pos = {parse}(_data, _pos)']
+                if field.scale is not None:
+                    name, = field.names
+                    lines.append(f'{name} = {name} / {field.scale!r}')
+
+            if field.optional:
+                lines = [
+                    '_pos += 1',
+                    'if _data[_pos - 1]:',
+                    *_indent(lines),
+                    'else:',
+                    f'    {absent}',
+                ]
+
+            if field.when is not None:
+                lines = [
+                    f'if {field.when}:',
+                    *_indent(lines),
+                    'else:',
+                    f'    {absent}',
+                ]
+
+            body.extend(lines)
+
+        return body
@@ -2,16 +2,13 @@
 
 from __future__ import annotations
 
-from collections.abc import (
-    Iterator as _Iterator,
-)
-
 import json as _json
 
 from ..packet import MinecraftPacketWithID as _MinecraftPacketWithID
 
+from .. import schema as _schema
+
 from ...utils import byte as _byte
-from ...utils import iter as _iter
 
 
 class Packet(_MinecraftPacketWithID):
@@ -19,125 +16,104 @@ class Packet(_MinecraftPacketWithID):
     pass
 
 
-class Response(Packet):
+def _parse_response(data: memoryview, start: int) -> tuple[tuple, int]:
 
-    id = 0x0
+    json, end = _byte.parse_varstr(data, start)
+    response = _json.loads(json)
 
-    def __init__(
-            self,
-            name: str = "Minecraft Server",
-            protocol: int = 757,
-            players_max: int = 20,
-            players_online: int = 0,
-            description: str = "",
-            favicon=None,
-    ) -> None:
+    version = response['version']
+    players = response['players']
 
-        super().__init__()
+    return (
+        version['name'],
+        version['protocol'],
+        players['max'],
+        players['online'],
+        response['description']['text'],
+        None,
+    ), end
 
-        self.name = name
-        self.protocol = protocol
-        self.players_max = players_max
-        self.players_online = players_online
-        self.description = description
-        self.favicon = None
 
-    def __getstate__(self) -> dict[str, object]:
+def _render_response(name: str, protocol: int, players_max: int,
+                     players_online: int, description: str,
+                     favicon: None) -> bytes:
 
-        return {key: getattr(self, key) for key in [
+    json = _json.dumps({
+        'version': {
+            'name': name,
+            'protocol': protocol,
+        },
+        'players': {
+            'max': players_max,
+            'online': players_online,
+            'sample': [],
+        },
+        'description': {
+            'text': description,
+        },
+    }, separators=(',', ':'))
+
+    return _byte.render_varstr(json)
+
+
+class Response(Packet):
+
+    id = 0x0
+
+    schema = _schema.Schema(
+        _schema.Custom(
             'name',
             'protocol',
             'players_max',
             'players_online',
             'description',
             'favicon',
-        ]}
-
-    @property
-    def payload(self) -> bytes | bytearray:
-
-        json = _json.dumps({
-            'version': {
-                'name': self.name,
-                'protocol': self.protocol,
-            },
-            'players': {
-                'max': self.players_max,
-                'online': self.players_online,
-                'sample': [],
-            },
-            'description': {
-                'text': self.description,
-            },
-        }, separators=(',', ':'))
-
-        return _byte.render_varstr(json)
-
-    @payload.setter
-    def payload(self, it: bytes | bytearray | _Iterator[int]) -> None:
+            parse=_parse_response,
+            render=_render_response,
+            default=("Minecraft Server", 757, 20, 0, "", None),
+        ),
+    )
 
-        it = iter(it)
-
-        json = _iter.consume_varstr(it)
-        () = it
-
-        data = _json.loads(json)
-
-        version = data['version']
-        self.name = version['name']
-        self.protocol = version['protocol']
-
-        players = data['players']
-        self.players_max = players['max']
-        self.players_online = players['online']
-
-        self.description = data['description']['text']
-        self.favicon = None
+    def _validate(self) -> None:
 
         assert isinstance(self.name, str)
-        assert self.protocol == 757
+        assert isinstance(self.protocol, int)
         assert self.players_max >= 0
         assert self.players_online >= 0
         assert isinstance(self.description, str)
         assert self.favicon is None
 
 
-# noinspection DuplicatedCode
 class Pong(Packet):
 
-    id = 0x1
+    """Answer to a `Ping`, echoing its long.
 
-    def __init__(self, value: float = 0) -> None:
+    The client sends the time in milliseconds, so `value` is in seconds,
+    while `raw_value` is the long as sent, which is passed on exactly.
+    """
 
-        super().__init__()
+    id = 0x1
 
-        self.value = value
+    schema = _schema.Schema(
+        _schema.Long('raw_value', default=0),
+    )
 
-    def __getstate__(self) -> dict[str, object]:
+    def __init__(self, value: float = 0,
+                 raw_value: int | None = None) -> None:
 
-        return {key: getattr(self, key) for key in [
-            'value',
-        ]}
+        super().__init__()
+
+        if raw_value is None:
+            self.value = value
+        else:
+            self.raw_value = raw_value
 
     @property
     def value(self) -> float:
 
-        return self._value / 1000
+        return self.raw_value / 1000
 
     @value.setter
     def value(self, value: float) -> None:
 
-        self._value = int(value * 1000)
-
-    @property
-    def payload(self) -> bytes | bytearray:
-
-        return self._value.to_bytes(8, 'big', signed=True)
-
-    @payload.setter
-    def payload(self, it: bytes | bytearray | _Iterator[int]) -> None:
-
-        eight_bytes = bytes(it)
-        assert len(eight_bytes) == 8
-
-        self._value = int.from_bytes(eight_bytes, 'big', signed=True)
+        self.raw_value = int(value * 1000)
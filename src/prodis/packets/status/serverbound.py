@@ -2,12 +2,10 @@
 
 from __future__ import annotations
 
-from collections.abc import (
-    Iterator as _Iterator,
-)
-
 from ..packet import MinecraftPacketWithID as _MinecraftPacketWithID
 
+from .. import schema as _schema
+
 
 class Packet(_MinecraftPacketWithID):
 
@@ -18,61 +16,39 @@ class Request(Packet):
 
     id = 0x0
 
-    def __init__(self) -> None:
-
-        super().__init__()
-
-    def __getstate__(self) -> dict[str, object]:
+    schema = _schema.Schema()
 
-        return {}
 
-    @property
-    def payload(self) -> bytes | bytearray:
-
-        return b''
-
-    @payload.setter
-    def payload(self, it: bytes | bytearray | _Iterator[int]) -> None:
-
-        () = it
+class Ping(Packet):
 
+    """Ping sent by the client, carrying an opaque long.
 
-# noinspection DuplicatedCode
-class Ping(Packet):
+    The client sends the time in milliseconds, so `value` is in seconds,
+    while `raw_value` is the long as sent, which is passed on exactly.
+    """
 
     id = 0x1
 
-    def __init__(self, value: float = 0) -> None:
-
-        super().__init__()
+    schema = _schema.Schema(
+        _schema.Long('raw_value', default=0),
+    )
 
-        self.value = value
+    def __init__(self, value: float = 0,
+                 raw_value: int | None = None) -> None:
 
-    def __getstate__(self) -> dict[str, object]:
+        super().__init__()
 
-        return {key: getattr(self, key) for key in [
-            'value',
-        ]}
+        if raw_value is None:
+            self.value = value
+        else:
+            self.raw_value = raw_value
 
     @property
     def value(self) -> float:
 
-        return self._value / 1000
+        return self.raw_value / 1000
 
     @value.setter
     def value(self, value: float) -> None:
 
-        self._value = int(value * 1000)
-
-    @property
-    def payload(self) -> bytes | bytearray:
-
-        return self._value.to_bytes(8, 'big', signed=True)
-
-    @payload.setter
-    def payload(self, it: bytes | bytearray | _Iterator[int]) -> None:
-
-        eight_bytes = bytes(it)
-        assert len(eight_bytes) == 8
-
-        self._value = int.from_bytes(eight_bytes, 'big', signed=True)
+        self.raw_value = int(value * 1000)
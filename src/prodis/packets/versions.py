@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+
+"""Protocol versions covered by the packet definitions.
+
+Packet classes declare the versions they apply to as a range passed as the
+`versions` class argument, which their subclasses inherit. Classes without
+one apply to all versions, as do those of the handshaking and status states.
+"""
+
+from __future__ import annotations
+
+V1_18 = range(757, 758)  # 1.18 and 1.18.1
+
+SUPPORTED = (V1_18,)
+LATEST = SUPPORTED[-1][-1]
+
+
+def is_supported(version: int) -> bool:
+
+    return any(version in versions for versions in SUPPORTED)
+
+
+def overlap(a: range | None, b: range | None) -> bool:
+
+    """Check whether two version ranges (`None` for all) share a version."""
+
+    if a is None or b is None:
+        return True
+
+    return max(a.start, b.start) < min(a.stop, b.stop)
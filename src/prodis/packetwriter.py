@@ -2,9 +2,20 @@
 
 from __future__ import annotations
 
+from collections.abc import (
+    AsyncIterator as _AsyncIterator,
+)
+
+from contextlib import asynccontextmanager as _asynccontextmanager
+
 import trio as _trio
 
-from .packets import Packet as _Packet
+from . import offload as _offload
+
+from .packets import (
+    Packet as _Packet,
+    MinecraftPacketWithID as _MinecraftPacketWithID,
+)
 
 from .logger import Logger as _Logger
 _log = _Logger(__name__)
@@ -12,13 +23,175 @@ _log = _Logger(__name__)
 
 class PacketWriter:
 
-    def __init__(self, send_stream: _trio.abc.SendStream) -> None:
+    """Write packets to a trio send stream.
+
+    By default, every packet is sent right away. Packets written with
+    `flush=False` are gathered in a buffer instead and sent with a single
+    `send_all` once `flush_size` bytes have accumulated or `flush()` is
+    called.
+
+    Within `sending()`, a background task sends whatever has been buffered
+    in the meantime, so writes don't wait for the peer at all until
+    `high_water` bytes are unsent. Then they block until the peer has caught
+    up to `low_water` bytes. The number of unsent bytes is available as
+    `unsent` and the number of times writes got blocked as `stalls`.
+    """
+
+    flush_size: int
+    high_water: int
+    low_water: int
+    offload_size: int
+    stalls: int
+
+    _send_stream: _trio.abc.SendStream
+    _buffer: list[bytes | bytearray]
+    _unsent: int
+    _sending: bool
+    _closing: bool
+    _buffered: _trio.Event
+    _progress: _trio.Event
+
+    def __init__(self, send_stream: _trio.abc.SendStream,
+                 flush_size: int = 0x10000,
+                 high_water: int = 0x40000,
+                 low_water: int = 0x10000,
+                 offload_size: int = _offload.DEFAULT_SIZE) -> None:
+
+        if low_water > high_water:
+            raise ValueError("low_water must not exceed high_water")
 
         self._send_stream = send_stream
+        self._buffer = []
+        self._unsent = 0
+        self._sending = False
+        self._closing = False
+        self._buffered = _trio.Event()
+        self._progress = _trio.Event()
+
+        self.flush_size = flush_size
+        self.high_water = high_water
+        self.low_water = low_water
+        self.offload_size = offload_size
+        self.stalls = 0
+
+    @property
+    def unsent(self) -> int:
+
+        """Bytes written, but not yet handed over to the stream."""
+
+        return self._unsent
+
+    @property
+    def congested(self) -> bool:
+
+        """Whether the next write is going to block for the peer."""
+
+        return self._unsent >= self.high_water
+
+    async def write(self, packet: _Packet, drain=True, flush=True,
+                    release=False) -> None:
+
+        """Write a packet.
+
+        With `release`, the caller hands its ownership of the packet over
+        and the packet is released once it has been rendered (see
+        `MinecraftPacketWithID.release()`).
+        """
+
+        if packet.wrapping_cost() >= self.offload_size:
+            data = await _offload.run_sync(packet.wrapped)
+        else:
+            data = packet.wrapped()
+
+        if release and isinstance(packet, _MinecraftPacketWithID):
+            packet.release()
+
+        self._buffer.append(data)
+        self._unsent += len(data)
+
+        if self._sending:
+            self._buffered.set()
+
+            if self._unsent >= self.high_water:
+                self.stalls += 1
+                await self._wait_unsent(self.low_water)
+
+        elif flush or self._unsent >= self.flush_size:
+            await self.flush(drain)
 
-    async def write(self, packet: _Packet, drain=True) -> None:
+    async def flush(self, drain=True) -> None:
 
-        await self._send_stream.send_all(packet.wrapped())
+        if self._sending:
+            await self._wait_unsent(0)
+            return
+
+        if not self._buffer:
+            return
+
+        await self._send_buffered()
 
         if drain:
             await self._send_stream.wait_send_all_might_not_block()
+
+    @_asynccontextmanager
+    async def sending(self) -> _AsyncIterator[PacketWriter]:
+
+        """Send buffered packets in the background while in this context.
+
+        On leaving the context normally, everything written is sent.
+        """
+
+        if self._sending:
+            raise RuntimeError("already sending in the background")
+
+        async with _trio.open_nursery() as nursery:
+            self._sending = True
+            self._closing = False
+            nursery.start_soon(self._sender)
+
+            try:
+                yield self
+
+            finally:
+                self._closing = True
+                self._buffered.set()
+
+        self._sending = False
+
+    async def _sender(self) -> None:
+
+        while True:
+            if not self._buffer:
+                if self._closing:
+                    return
+
+                if self._buffered.is_set():
+                    self._buffered = _trio.Event()
+
+                await self._buffered.wait()
+                continue
+
+            await self._send_buffered()
+
+            self._progress.set()
+
+    async def _send_buffered(self) -> None:
+
+        data = (self._buffer[0] if len(self._buffer) == 1
+                else b''.join(self._buffer))
+
+        self._buffer.clear()
+
+        try:
+            await self._send_stream.send_all(data)
+
+        finally:
+            self._unsent -= len(data)
+
+    async def _wait_unsent(self, limit: int) -> None:
+
+        while self._unsent > limit:
+            if self._progress.is_set():
+                self._progress = _trio.Event()
+
+            await self._progress.wait()
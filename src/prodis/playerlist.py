@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+from typing import (
+    Any as _Any,
+    NamedTuple as _NamedTuple,
+)
+
+from collections.abc import (
+    Iterator as _Iterator,
+    Mapping as _Mapping,
+)
+
+from sys import intern as _intern
+from types import MappingProxyType as _MappingProxyType
+from uuid import UUID as _UUID
+
+from .packets import play as _play
+from .packets.play.clientbound import (
+    PlayerInfo as _PlayerInfo,
+    JoinGame as _JoinGame,
+)
+
+
+(ADD_PLAYER, UPDATE_GAMEMODE, UPDATE_LATENCY, UPDATE_DISPLAY_NAME,
+ REMOVE_PLAYER) = range(5)
+
+
+class Property(_NamedTuple):
+
+    name: str
+    value: str
+    signature: str | None
+
+
+class PlayerListEntry(_NamedTuple):
+
+    uuid: _UUID
+    name: str
+    properties: tuple[Property, ...]
+    gamemode: int
+    ping: int
+    display_name: str | None
+
+
+def _properties(properties: dict[str, tuple[str, str | None]]
+                ) -> tuple[Property, ...]:
+
+    # there are only a few property names, e.g. "textures", so they are
+    # interned, unlike the values and signatures specific to each player
+    return tuple(
+        Property(_intern(name), value, signature)
+        for name, (value, signature) in properties.items()
+    )
+
+
+class PlayerList:
+
+    """The player list the server has sent over a connection.
+
+    Feed it the clientbound play packets with `update()` to keep it up to
+    date. Only the entries named by a packet are touched. The entries are
+    immutable and replaced when they change, so `snapshot()` can share them
+    and only has to be copied once after each change.
+    """
+
+    _entries: dict[_UUID, PlayerListEntry]
+    _snapshot: _Mapping[_UUID, PlayerListEntry] | None
+
+    def __init__(self) -> None:
+
+        self._entries = {}
+        self._snapshot = None
+
+    def __len__(self) -> int:
+
+        return len(self._entries)
+
+    def __contains__(self, uuid: _UUID) -> bool:
+
+        return uuid in self._entries
+
+    def __iter__(self) -> _Iterator[PlayerListEntry]:
+
+        return iter(self.snapshot().values())
+
+    def get(self, uuid: _UUID) -> PlayerListEntry | None:
+
+        return self._entries.get(uuid)
+
+    def snapshot(self) -> _Mapping[_UUID, PlayerListEntry]:
+
+        """Return a read-only copy of the entries, keyed by UUID."""
+
+        if self._snapshot is None:
+            self._snapshot = _MappingProxyType(self._entries.copy())
+
+        return self._snapshot
+
+    def update(self, packet: _play.ClientBound) -> None:
+
+        """Update the list from a packet, ignoring irrelevant ones."""
+
+        cls = packet.dispatched_class()
+        if cls is _JoinGame:
+            # joining a game, e.g. on another server behind a proxy, starts
+            # over with the players of that game
+            self.clear()
+            return
+
+        if cls is not _PlayerInfo:
+            return
+
+        if type(packet) is not _PlayerInfo:
+            # passed on undecoded, e.g. in passthrough mode, so its fields
+            # are decoded from the data received
+            packet = _PlayerInfo(packet.field_data())
+
+        self._apply(packet.action, packet.updates)
+
+    def clear(self) -> None:
+
+        self._entries.clear()
+        self._snapshot = None
+
+    def _apply(self, action: int,
+               updates: dict[_UUID, dict[str, _Any] | None]) -> None:
+
+        if not updates:
+            return
+
+        entries = self._entries
+        self._snapshot = None
+
+        if action == ADD_PLAYER:
+            for uuid, update in updates.items():
+                assert update is not None
+                entries[uuid] = PlayerListEntry(
+                    uuid,
+                    update['name'],
+                    _properties(update['properties']),
+                    update['gamemode'],
+                    update['ping'],
+                    update['display_name'],
+                )
+
+        elif action == REMOVE_PLAYER:
+            for uuid in updates:
+                entries.pop(uuid, None)
+
+        else:
+            for uuid, update in updates.items():
+                entry = entries.get(uuid)
+                if entry is not None and update is not None:
+                    entries[uuid] = entry._replace(**update)
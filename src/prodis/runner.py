@@ -1,5 +1,9 @@
 #!/usr/bin/env python3
 
+from typing import (
+    Any as _Any,
+)
+
 import trio as _trio
 
 from .clientlistener import ClientListener as _ClientListener
@@ -9,9 +13,11 @@ from .logger import Logger as _Logger
 _log = _Logger(__name__)
 
 
-async def main_coroutine() -> None:
+async def main_coroutine(**options: _Any) -> None:
+
+    """Run the proxy, passing `options` on to the `ClientListener`."""
 
-    client_listener = _ClientListener()
+    client_listener = _ClientListener(**options)
     server_connector = _ServerConnector()
 
     async with _trio.open_nursery() as nursery:
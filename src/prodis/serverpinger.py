@@ -15,6 +15,7 @@ from .utils.context import let as _let
 
 from .packets import (
     protocol as _protocol,
+    versions as _versions,
     handshaking as _handshaking,
     status as _status,
     login as _login,
@@ -28,16 +29,18 @@ _log = _Logger(__name__)
 class ServerPinger:
 
     _stream: _trio.abc.HalfCloseableStream
+    _packet_reader: _PacketReader
 
     def __init__(self, stream: _trio.abc.HalfCloseableStream) -> None:
 
         self._stream = stream
+        self._packet_reader = _PacketReader(stream, _status.ClientBound)
 
     async def run(self) -> None:
 
         try:
 
-            with _let(_protocol, 757):
+            with _let(_protocol, _versions.LATEST):
 
                 first_state = self._handshaking()
                 await self._state_machine(first_state)
@@ -58,7 +61,7 @@ class ServerPinger:
 
         await self._stream.wait_send_all_might_not_block()
 
-        if await self._stream.receive_some(1):
+        if not await self._packet_reader.at_eof():
             raise ValueError("unexpected data while waiting for EOF")
 
     async def _handshaking(self) -> _Coroutine | None:
@@ -72,7 +75,8 @@ class ServerPinger:
     async def _status(self) -> _Coroutine | None:
 
         packet_writer = _PacketWriter(self._stream)
-        packet_reader = _PacketReader(self._stream, _status.ClientBound)
+        packet_reader = self._packet_reader
+        packet_reader.packet_type = _status.ClientBound
 
         packet = _status.serverbound.Request()
         await packet_writer.write(packet)
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+
+"""Content-addressed store for large payloads shared between connections.
+
+Some data is sent identically to every player on a server, like the tags,
+the recipes, the commands and the dimension codec. Interning it in a
+`BlobStore` keeps a single copy, keyed by a hash of the data, and lets any
+decoded form of it be computed once for all connections.
+"""
+
+from __future__ import annotations
+
+from collections import deque as _deque
+from collections.abc import Callable as _Callable
+from hashlib import blake2b as _blake2b
+from typing import (
+    TypeVar as _TypeVar,
+    cast as _cast,
+)
+from weakref import WeakValueDictionary as _WeakValueDictionary
+
+
+_T = _TypeVar('_T')
+
+
+class Blob:
+
+    """Immutable data interned in a `BlobStore`.
+
+    `bytes(blob)` returns the data without copying it.
+    """
+
+    __slots__ = ('data', 'digest', '_decoded', '__weakref__')
+
+    data: bytes
+    digest: bytes
+
+    _decoded: dict[_Callable[[bytes], object], object]
+
+    def __init__(self, data: bytes, digest: bytes) -> None:
+
+        self.data = data
+        self.digest = digest
+        self._decoded = {}
+
+    def decoded(self, decoder: _Callable[[bytes], _T]) -> _T:
+
+        """Return `decoder(data)`, calling `decoder` only the first time."""
+
+        try:
+            return _cast(_T, self._decoded[decoder])
+
+        except KeyError:
+            pass
+
+        value = self._decoded[decoder] = decoder(self.data)
+        return value
+
+    def __bytes__(self) -> bytes:
+
+        return self.data
+
+    def __len__(self) -> int:
+
+        return len(self.data)
+
+    def __eq__(self, other: object) -> bool:
+
+        if isinstance(other, Blob):
+            return self.digest == other.digest
+
+        if isinstance(other, (bytes, bytearray, memoryview)):
+            return self.data == other
+
+        return NotImplemented
+
+    def __hash__(self) -> int:
+
+        return hash(self.data)
+
+    def __reduce__(self) -> tuple:
+
+        return intern, (self.data,)
+
+    def __repr__(self) -> str:
+
+        return (f"<{type(self).__name__} {self.digest.hex()[:16]}"
+                f" ({len(self.data)} bytes)>")
+
+
+class BlobStore:
+
+    """Interned blobs, looked up by a hash of their data.
+
+    Blobs are kept as long as they are referenced, and the `keep` most
+    recently interned ones regardless, so that data sent on login survives
+    between logins. `hits` and `misses` count the lookups.
+    """
+
+    hits: int
+    misses: int
+
+    _blobs: _WeakValueDictionary[bytes, Blob]
+    _recent: _deque[Blob]
+
+    def __init__(self, keep: int = 16) -> None:
+
+        self.hits = 0
+        self.misses = 0
+
+        self._blobs = _WeakValueDictionary()
+        self._recent = _deque(maxlen=keep)
+
+    def __len__(self) -> int:
+
+        return len(self._blobs)
+
+    def intern(self, data: bytes | bytearray | memoryview) -> Blob:
+
+        """Return the blob for `data`, storing a copy if there is none."""
+
+        digest = _blake2b(data, digest_size=32).digest()
+
+        blob = self._blobs.get(digest)
+        if blob is None:
+            self.misses += 1
+            blob = self._blobs[digest] = Blob(bytes(data), digest)
+
+        else:
+            self.hits += 1
+
+        if blob not in self._recent:
+            self._recent.append(blob)
+
+        return blob
+
+    @property
+    def bytes_held(self) -> int:
+
+        return sum(len(blob) for blob in self._blobs.values())
+
+
+store = BlobStore()
+
+
+def intern(data: bytes | bytearray | memoryview) -> Blob:
+
+    """Intern `data` in the process-wide store."""
+
+    return store.intern(data)
+
+
+def parse_rest(data: memoryview, start: int) -> tuple[Blob, int]:
+
+    """Intern the remaining bytes of the payload."""
+
+    return intern(data[start:]), len(data)
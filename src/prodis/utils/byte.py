@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from typing import (
+    Any as _Any,
     TypeAlias as _TypeAlias,
     TypeVar as _TypeVar,
 )
@@ -14,20 +15,37 @@ from collections.abc import (
     Iterator as _Iterator,
 )
 
-from struct import Struct as _Struct
+from struct import (
+    Struct as _Struct,
+    error as _StructError,
+)
 
 from . import parse as _parse
+from . import varint as _varint
 
 
 _T = _TypeVar('_T')
-_Requester: _TypeAlias = _Generator[int, bytes | bytearray, _T]
+_Requester: _TypeAlias = _Generator[int, bytes | bytearray | memoryview, _T]
+
+
+def view(data: bytes | bytearray | memoryview | _Iterable[int]) -> memoryview:
+
+    if isinstance(data, memoryview):
+        if data.ndim == 1 and data.format == 'B':
+            return data
+
+        return data.cast('B')
+
+    if isinstance(data, (bytes, bytearray)):
+        return memoryview(data)
+
+    return memoryview(bytes(data))
 
 
 def _to_consumer(requester: _Requester,
                  mv: memoryview) -> tuple[_T, memoryview]:
 
-    if not isinstance(mv, memoryview) or mv.itemsize != 1 or mv.ndim != 1:
-        mv = memoryview(bytes(mv))
+    mv = view(mv)
 
     to_send = None
     while True:
@@ -37,7 +55,7 @@ def _to_consumer(requester: _Requester,
         except StopIteration as exc:
             return exc.value, mv
 
-        to_send = bytes(mv[:num_bytes])
+        to_send = mv[:num_bytes]
         if len(to_send) < num_bytes:
             raise ValueError("end of data reached")
 
@@ -45,9 +63,10 @@ def _to_consumer(requester: _Requester,
 
 
 def _to_parser(requester: _Requester,
-               data: bytes | bytearray, start: int = 0) -> tuple[_T, int]:
+               data: bytes | bytearray | memoryview,
+               start: int = 0) -> tuple[_T, int]:
 
-    if not isinstance(data, (bytes, bytearray)):
+    if not isinstance(data, (bytes, bytearray, memoryview)):
         data = bytes(data)
 
     to_send = None
@@ -65,9 +84,10 @@ def _to_parser(requester: _Requester,
         start += num_bytes
 
 
-def _to_converter(requester: _Requester, data: bytes | bytearray) -> _T:
+def _to_converter(requester: _Requester,
+                  data: bytes | bytearray | memoryview) -> _T:
 
-    if not isinstance(data, (bytes, bytearray)):
+    if not isinstance(data, (bytes, bytearray, memoryview)):
         data = bytes(data)
 
     result, end = _to_parser(requester, data)
@@ -79,62 +99,160 @@ def _to_converter(requester: _Requester, data: bytes | bytearray) -> _T:
 
 def consume_varint(mv: memoryview) -> tuple[int, memoryview]:
 
-    return _to_consumer(_parse.request_varint(), mv)
+    mv = view(mv)
+    value, end = _varint.decode_varint(mv)
+    return value, mv[end:]
 
 
-def parse_varint(data: bytes | bytearray, start: int = 0) -> tuple[int, int]:
+def consume_varstr(mv: memoryview) -> tuple[str, memoryview]:
 
-    return _to_parser(_parse.request_varint(), data, start=start)
+    mv = view(mv)
+    value, end = parse_varstr(mv)
+    return value, mv[end:]
 
 
-def from_varint(data: bytes | bytearray) -> int:
+def consume_identifier(mv: memoryview) -> tuple[tuple[str, str], memoryview]:
 
-    return _to_converter(_parse.request_varint(), data)
+    mv = view(mv)
+    value, end = parse_identifier(mv)
+    return value, mv[end:]
 
 
-render_float = _Struct('>f').pack
-render_double = _Struct('>d').pack
+# The parse_* functions decode a value from a buffer at an offset and return
+# it together with the offset following it. They are the counterparts of the
+# request_* generators in utils.parse for data which is buffered completely.
+
+def _slice(data: memoryview, start: int, n: int) -> tuple[memoryview, int]:
+
+    if n < 0:
+        raise ValueError("negative length")
+
+    end = start + n
+    if end > len(data):
+        raise ValueError("end of data reached")
+
+    return data[start:end], end
 
 
-def render_varint(v: int) -> bytes:
+def parse_varint(data: bytes | bytearray | memoryview,
+                 start: int = 0) -> tuple[int, int]:
 
-    if 0 <= v <= 0x7f:
-        return v.to_bytes(1, 'little')
+    return _varint.decode_varint(view(data), start)
 
-    assert -0x80000000 <= v <= 0x7fffffff
-    v &= 0xffffffff
 
-    l = []
+def parse_varlong(data: bytes | bytearray | memoryview,
+                  start: int = 0) -> tuple[int, int]:
 
-    while v >= 0x80:
-        l.append(v & 0x7f | 0x80)
-        v >>= 7
+    return _varint.decode_varlong(view(data), start)
 
-    return bytes(l + [v])
 
+def parse_varbytes(data: bytes | bytearray | memoryview,
+                   start: int = 0) -> tuple[memoryview, int]:
 
-def render_varlong(v: int) -> bytes:
+    data = view(data)
+    n, start = _varint.decode_varint(data, start)
+    return _slice(data, start, n)
 
-    if 0 <= v <= 0x7f:
-        return v.to_bytes(1, 'little')
 
-    assert -0x8000_0000_0000_0000 <= v <= 0x7fff_ffff_ffff_ffff
-    v &= 0xffff_ffff_ffff_ffff
+def parse_varstr(data: bytes | bytearray | memoryview,
+                 start: int = 0) -> tuple[str, int]:
 
-    l = []
+    b, end = parse_varbytes(data, start)
+    return str(b, 'utf-8'), end
 
-    while v >= 0x80:
-        l.append(v & 0x7f | 0x80)
-        v >>= 7
 
-    return bytes(l + [v])
+def parse_identifier(data: bytes | bytearray | memoryview,
+                     start: int = 0) -> tuple[tuple[str, str], int]:
 
+    b, end = parse_varbytes(data, start)
+    return _parse.split_identifier(str(b, 'ascii')), end
+
+
+def parse_bitset(data: bytes | bytearray | memoryview,
+                 start: int = 0) -> tuple[int, int]:
+
+    """Parse a bit set, sent as an array of longs, into an int."""
+
+    data = view(data)
+    n, start = _varint.decode_varint(data, start)
+    longs, end = _slice(data, start, n * 8)
+
+    # the first long holds the lowest bits
+    value = 0
+    for pos in range(n * 8 - 8, -8, -8):
+        value = value << 64 | int.from_bytes(longs[pos:pos + 8], 'big')
+
+    return value, end
+
+
+def _struct_parser(fmt: str) -> _Callable[[bytes | bytearray | memoryview,
+                                           int], tuple[_Any, int]]:
+
+    s = _Struct(fmt)
+    unpack_from = s.unpack_from
+    size = s.size
+
+    def parse(data: bytes | bytearray | memoryview,
+              start: int = 0) -> tuple[_Any, int]:
+
+        try:
+            value, = unpack_from(data, start)
 
-def render_varbytes(b: bytes | bytearray) -> bytes:
+        except _StructError:
+            raise ValueError("end of data reached") from None
+
+        return value, start + size
+
+    return parse
+
+
+parse_bool = _struct_parser('>?')
+parse_byte = _struct_parser('>b')
+parse_ubyte = _struct_parser('>B')
+parse_short = _struct_parser('>h')
+parse_ushort = _struct_parser('>H')
+parse_int = _struct_parser('>i')
+parse_long = _struct_parser('>q')
+parse_float = _struct_parser('>f')
+parse_double = _struct_parser('>d')
+
+
+def from_varint(data: bytes | bytearray | memoryview) -> int:
+
+    data = view(data)
+
+    value, end = _varint.decode_varint(data)
+    if end < len(data):
+        raise ValueError("data too long")
+
+    return value
+
+
+render_float = _Struct('>f').pack
+render_double = _Struct('>d').pack
+
+
+render_varint = _varint.encode_varint
+render_varlong = _varint.encode_varlong
+
+
+def render_varbytes(b: bytes | bytearray | memoryview) -> bytes:
 
     return render_varint(len(b)) + b
 
 
+def render_bitset(value: int) -> bytes:
+
+    if value < 0:
+        raise ValueError("bit set cannot be negative")
+
+    n = -(-value.bit_length() // 64)
+    return render_varint(n) + b''.join(
+        (value >> shift & 0xffff_ffff_ffff_ffff).to_bytes(8, 'big')
+        for shift in range(0, n * 64, 64)
+    )
+
+
 def render_varstr(s: str) -> bytes:
 
     b = s.encode()
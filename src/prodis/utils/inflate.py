@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+from collections.abc import (
+    Iterator as _Iterator,
+)
+
+from zlib import decompressobj as _decompressobj
+
+from . import byte as _byte
+
+
+def inflate_chunks(data: bytes | bytearray | memoryview, limit: int,
+                   chunk_size: int = 0x10000) -> _Iterator[bytes]:
+
+    """Decompress zlib data incrementally, yielding chunks of output.
+
+    Neither the input nor the output is processed in pieces larger than
+    `chunk_size`, and a `ValueError` is raised as soon as the output would
+    exceed `limit` bytes, so a hostile stream can't exhaust memory.
+    """
+
+    data = _byte.view(data)
+    decompressor = _decompressobj()
+
+    pos = 0
+    total = 0
+    tail: bytes | memoryview = b''
+
+    while not decompressor.eof:
+        if not tail and pos < len(data):
+            tail = data[pos:pos + chunk_size]
+            pos += len(tail)
+
+        chunk = decompressor.decompress(tail, chunk_size)
+        tail = decompressor.unconsumed_tail
+
+        if not chunk:
+            if tail or pos < len(data):
+                continue
+
+            break
+
+        total += len(chunk)
+        if total > limit:
+            raise ValueError(f"decompressed data exceeds {limit} bytes")
+
+        yield chunk
+
+    if not decompressor.eof:
+        raise ValueError("compressed data is truncated")
+
+
+def inflate(data: bytes | bytearray | memoryview, size: int,
+            limit: int) -> bytes:
+
+    """Decompress zlib data that is declared to inflate to `size` bytes."""
+
+    if size > limit:
+        raise ValueError(f"declared size {size} exceeds {limit} bytes")
+
+    # the declared size bounds the output, possibly tighter than the limit
+    result = b''.join(inflate_chunks(data, size))
+    if len(result) != size:
+        raise ValueError(f"decompressed to {len(result)} bytes instead of "
+                         f"the declared {size}")
+
+    return result
@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+
+"""Named Binary Tag (NBT) data as used by the network protocol.
+
+Network NBT consists of a single named root tag, usually a compound, or a
+lone `TAG_End` for no data at all.
+
+`skip()` finds the end of NBT data without decoding anything, while
+`parse()` decodes it lazily: compounds and lists are only decoded as far as
+they are accessed, and arrays end up in NumPy arrays or `array.array`s.
+"""
+
+from __future__ import annotations
+
+from typing import (
+    overload as _overload,
+)
+
+from collections.abc import (
+    Iterator as _Iterator,
+    Mapping as _Mapping,
+    Sequence as _Sequence,
+)
+
+from array import array as _array
+from sys import byteorder as _byteorder
+
+from struct import (
+    Struct as _Struct,
+    error as _StructError,
+)
+
+from . import byte as _byte
+from . import optional as _optional
+
+
+END, BYTE, SHORT, INT, LONG, FLOAT, DOUBLE = range(7)
+BYTE_ARRAY, STRING, LIST, COMPOUND, INT_ARRAY, LONG_ARRAY = range(7, 13)
+
+# the same limit as vanilla's
+MAX_DEPTH = 512
+
+# payload sizes of the fixed-size tags
+_SIZES = {BYTE: 1, SHORT: 2, INT: 4, LONG: 8, FLOAT: 4, DOUBLE: 8}
+
+# element sizes of the array tags
+_ELEMENT_SIZES = {BYTE_ARRAY: 1, INT_ARRAY: 4, LONG_ARRAY: 8}
+
+_MISSING = object()
+
+_USHORT = _Struct('>H')
+_INT = _Struct('>i')
+
+# struct formats of the fixed-size tags
+_FORMATS = {BYTE: 'b', SHORT: 'h', INT: 'i', LONG: 'q',
+            FLOAT: 'f', DOUBLE: 'd'}
+_STRUCTS = {tag: _Struct('>' + fmt) for tag, fmt in _FORMATS.items()}
+
+# array typecodes and NumPy dtypes of the array tags
+_ARRAY_TYPES = {BYTE_ARRAY: ('b', '>i1'), INT_ARRAY: ('i', '>i4'),
+                LONG_ARRAY: ('q', '>i8')}
+
+
+def skip(data: bytes | bytearray | memoryview, start: int = 0) -> int:
+
+    """Find the end of the NBT data in `data` at `start`.
+
+    Nothing is decoded apart from the sizes needed to get past the tags.
+    """
+
+    try:
+        tag = data[start]
+        if tag == END:
+            return start + 1
+
+        n, = _USHORT.unpack_from(data, start + 1)
+        end = _skip_payload(data, tag, start + 3 + n, 0)
+
+    except (IndexError, _StructError):
+        raise ValueError("end of data reached") from None
+
+    if end > len(data):
+        raise ValueError("end of data reached")
+
+    return end
+
+
+def parse_raw(data: memoryview, start: int = 0) -> tuple[memoryview, int]:
+
+    """Slice the NBT data at `start` out of `data` without decoding it."""
+
+    end = skip(data, start)
+    return data[start:end], end
+
+
+def _length(data: bytes | bytearray | memoryview, pos: int) -> int:
+
+    n, = _INT.unpack_from(data, pos)
+    if n < 0:
+        raise ValueError("negative NBT length")
+
+    return n
+
+
+def _skip_payload(data: bytes | bytearray | memoryview, tag: int, pos: int,
+                  depth: int) -> int:
+
+    if (size := _SIZES.get(tag)) is not None:
+        return pos + size
+
+    if (size := _ELEMENT_SIZES.get(tag)) is not None:
+        return pos + 4 + _length(data, pos) * size
+
+    if tag == STRING:
+        n, = _USHORT.unpack_from(data, pos)
+        return pos + 2 + n
+
+    if depth >= MAX_DEPTH:
+        raise ValueError("NBT nested too deeply")
+
+    if tag == LIST:
+        element = data[pos]
+        n = _length(data, pos + 1)
+        pos += 5
+
+        if (size := _SIZES.get(element)) is not None:
+            return pos + n * size
+
+        for _ in range(n):
+            pos = _skip_payload(data, element, pos, depth + 1)
+
+        return pos
+
+    if tag == COMPOUND:
+        while (tag := data[pos]) != END:
+            n, = _USHORT.unpack_from(data, pos + 1)
+            pos = _skip_payload(data, tag, pos + 3 + n, depth + 1)
+
+        return pos + 1
+
+    raise ValueError(f"invalid NBT tag type {tag}")
+
+
+def parse(data: bytes | bytearray | memoryview,
+          start: int = 0) -> tuple[object, int]:
+
+    """Decode the NBT data in `data` at `start`.
+
+    Returns the value of the root tag, or `None` for no data, and the offset
+    following it. Compounds and lists are returned as `Compound` and `List`,
+    which decode their contents on access and keep referring to `data`.
+    """
+
+    data = _byte.view(data)
+    end = skip(data, start)
+
+    tag = data[start]
+    if tag == END:
+        return None, end
+
+    n, = _USHORT.unpack_from(data, start + 1)
+    return _decode(data, tag, start + 3 + n, 0), end
+
+
+def materialize(value: object) -> object:
+
+    """Turn compounds and lists into dicts and lists, recursively."""
+
+    if isinstance(value, Compound):
+        return {name: materialize(item) for name, item in value.items()}
+
+    if isinstance(value, List):
+        return [materialize(item) for item in value]
+
+    return value
+
+
+def _decode_string(b: memoryview) -> str:
+
+    try:
+        return str(b, 'utf-8')
+
+    except UnicodeDecodeError:
+        pass
+
+    # Java's modified UTF-8 encodes NUL as two octets and supplementary
+    # characters as surrogate pairs
+    s = bytes(b).replace(b'\xc0\x80', b'\x00').decode('utf-8',
+                                                       'surrogatepass')
+    return s.encode('utf-16', 'surrogatepass').decode('utf-16')
+
+
+def _decode_array(data: memoryview, tag: int, pos: int) -> _Sequence[int]:
+
+    n = _length(data, pos)
+    typecode, dtype = _ARRAY_TYPES[tag]
+
+    np = _optional.numpy()
+    if np is not None:
+        return np.frombuffer(data, dtype=dtype, count=n, offset=pos + 4)
+
+    values = _array(typecode)
+    values.frombytes(data[pos + 4:pos + 4 + n * values.itemsize])
+    if values.itemsize > 1 and _byteorder == 'little':
+        values.byteswap()
+
+    return values
+
+
+def _decode(data: memoryview, tag: int, pos: int, depth: int) -> object:
+
+    # the data has been checked by skipping it already
+
+    if (s := _STRUCTS.get(tag)) is not None:
+        value, = s.unpack_from(data, pos)
+        return value
+
+    if tag == STRING:
+        n, = _USHORT.unpack_from(data, pos)
+        return _decode_string(data[pos + 2:pos + 2 + n])
+
+    if tag == COMPOUND:
+        return Compound(data, pos, depth)
+
+    if tag == LIST:
+        return List(data, pos, depth)
+
+    return _decode_array(data, tag, pos)
+
+
+class Compound(_Mapping[str, object]):
+
+    """NBT compound, decoded on access.
+
+    The names of its tags are only decoded when it is first accessed, and
+    the value of each tag when it is first looked up.
+    """
+
+    __slots__ = ('_data', '_start', '_depth', '_tags', '_values')
+
+    _tags: dict[str, tuple[int, int]] | None
+    _values: dict[str, object]
+
+    def __init__(self, data: memoryview, start: int, depth: int = 0) -> None:
+
+        self._data = data
+        self._start = start
+        self._depth = depth
+        self._tags = None
+        self._values = {}
+
+    def _index(self) -> dict[str, tuple[int, int]]:
+
+        if self._tags is None:
+            data = self._data
+            pos = self._start
+            depth = self._depth + 1
+            tags = {}
+
+            while (tag := data[pos]) != END:
+                n, = _USHORT.unpack_from(data, pos + 1)
+                name = _decode_string(data[pos + 3:pos + 3 + n])
+                pos += 3 + n
+
+                tags[name] = tag, pos
+                pos = _skip_payload(data, tag, pos, depth)
+
+            self._tags = tags
+
+        return self._tags
+
+    def tag_type(self, name: str) -> int:
+
+        return self._index()[name][0]
+
+    def __getitem__(self, name: str) -> object:
+
+        try:
+            return self._values[name]
+
+        except KeyError:
+            pass
+
+        tag, pos = self._index()[name]
+        value = self._values[name] = _decode(self._data, tag, pos,
+                                             self._depth + 1)
+        return value
+
+    def __iter__(self) -> _Iterator[str]:
+
+        return iter(self._index())
+
+    def __len__(self) -> int:
+
+        return len(self._index())
+
+    def __repr__(self) -> str:
+
+        return f"Compound({dict(self.items())!r})"
+
+
+class List(_Sequence[object]):
+
+    """NBT list, decoded on access.
+
+    Lists of numbers are decoded at once when first accessed, the elements
+    of other lists one at a time.
+    """
+
+    __slots__ = ('element', '_data', '_start', '_depth', '_n', '_offsets',
+                 '_values')
+
+    element: int
+
+    _offsets: list[int] | None
+    _values: list[object] | None
+
+    def __init__(self, data: memoryview, start: int, depth: int = 0) -> None:
+
+        self.element = data[start]
+        self._data = data
+        self._start = start + 5
+        self._depth = depth
+        self._n = _length(data, start + 1)
+        self._offsets = None
+        self._values = None
+
+    def __len__(self) -> int:
+
+        return self._n
+
+    @_overload
+    def __getitem__(self, index: int) -> object: ...
+
+    @_overload
+    def __getitem__(self, index: slice) -> list[object]: ...
+
+    def __getitem__(self, index: int | slice) -> object:
+
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._n))]
+
+        if not -self._n <= index < self._n:
+            raise IndexError("list index out of range")
+
+        index %= self._n
+
+        if self._values is None:
+            if (fmt := _FORMATS.get(self.element)) is not None:
+                self._values = list(_Struct(f'>{self._n}{fmt}').unpack_from(
+                    self._data, self._start
+                ))
+                return self._values[index]
+
+            self._values = [_MISSING] * self._n
+
+        value = self._values[index]
+        if value is _MISSING:
+            value = self._values[index] = _decode(
+                self._data, self.element, self._offset(index), self._depth + 1
+            )
+
+        return value
+
+    def _offset(self, index: int) -> int:
+
+        if self._offsets is None:
+            pos = self._start
+            offsets = []
+
+            for _ in range(self._n):
+                offsets.append(pos)
+                pos = _skip_payload(self._data, self.element, pos,
+                                    self._depth + 1)
+
+            self._offsets = offsets
+
+        return self._offsets[index]
+
+    def __repr__(self) -> str:
+
+        return f"List({list(self)!r})"
+
@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+
+"""Optional dependencies, imported on first use.
+
+Each function returns the module, or `None` if it isn't installed, in which
+case callers fall back to pure Python.
+"""
+
+from __future__ import annotations
+
+from functools import cache as _cache
+from types import ModuleType as _ModuleType
+
+
+@_cache
+def numpy() -> _ModuleType | None:
+
+    try:
+        import numpy
+
+    except ImportError:
+        return None
+
+    return numpy
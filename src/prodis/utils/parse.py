@@ -66,13 +66,18 @@ def request_varbytes() -> _Generator[int, bytes | bytearray, bytes]:
 def request_varstr() -> _Generator[int, bytes | bytearray, str]:
 
     n = yield from request_varint()
-    return (yield n).decode()
+    return str((yield n), 'utf-8')
 
 
 def request_identifier() -> _Generator[int, bytes | bytearray, tuple[str, str]]:
 
     n = yield from request_varint()
-    match (yield n).decode('ascii').split(':'):
+    return split_identifier(str((yield n), 'ascii'))
+
+
+def split_identifier(s: str) -> tuple[str, str]:
+
+    match s.split(':'):
         case namespace, name:
             pass
         case name,:
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+from collections.abc import (
+    Iterable as _Iterable,
+)
+
+
+# encodings of the values fitting into one or two octets
+_ENCODED = tuple(
+    bytes((v,)) if v < 0x80 else bytes((v & 0x7f | 0x80, v >> 7))
+    for v in range(0x4000)
+)
+
+# the same as the lowest two octets of larger values
+_CONTINUED = tuple(bytes((v & 0x7f | 0x80, v >> 7 | 0x80))
+                   for v in range(0x4000))
+
+
+def _encode(v: int) -> bytes:
+
+    high = v >> 14
+    if high < 0x4000:
+        return _CONTINUED[v & 0x3fff] + _ENCODED[high]
+
+    return _CONTINUED[v & 0x3fff] + _encode(high)
+
+
+def encode_varint(v: int) -> bytes:
+
+    if 0 <= v < 0x4000:
+        return _ENCODED[v]
+
+    if not -0x8000_0000 <= v <= 0x7fff_ffff:
+        raise ValueError("varint out of range")
+
+    return _encode(v & 0xffff_ffff)
+
+
+def encode_varlong(v: int) -> bytes:
+
+    if 0 <= v < 0x4000:
+        return _ENCODED[v]
+
+    if not -0x8000_0000_0000_0000 <= v <= 0x7fff_ffff_ffff_ffff:
+        raise ValueError("varlong out of range")
+
+    return _encode(v & 0xffff_ffff_ffff_ffff)
+
+
+def encode_varints(values: _Iterable[int]) -> bytes:
+
+    """Encode a sequence of varints back to back."""
+
+    encoded = _ENCODED
+    return b''.join(
+        encoded[v] if 0 <= v < 0x4000 else encode_varint(v)
+        for v in values
+    )
+
+
+def decode_varint(buf: bytes | bytearray | memoryview,
+                  offset: int = 0) -> tuple[int, int]:
+
+    """Decode a varint from `buf` at `offset`.
+
+    Returns the value and the offset following the varint. `buf` has to
+    yield ints when indexed, i.e. memoryviews need to be of format 'B'.
+    """
+
+    try:
+        octet = buf[offset]
+        if octet < 0x80:
+            return octet, offset + 1
+
+        value = octet & 0x7f
+        for shift in (7, 14, 21):
+            offset += 1
+            octet = buf[offset]
+            if octet < 0x80:
+                return value | octet << shift, offset + 1
+
+            value |= (octet & 0x7f) << shift
+
+        offset += 1
+        octet = buf[offset]
+
+    except IndexError:
+        raise ValueError("end of data reached") from None
+
+    if octet > 0xf:
+        raise ValueError("varint out of range")
+
+    if octet & 0x8:
+        octet |= -0x8
+
+    return value | octet << 28, offset + 1
+
+
+def decode_varlong(buf: bytes | bytearray | memoryview,
+                   offset: int = 0) -> tuple[int, int]:
+
+    """Decode a varlong from `buf` at `offset`, like `decode_varint()`."""
+
+    try:
+        octet = buf[offset]
+        if octet < 0x80:
+            return octet, offset + 1
+
+        value = octet & 0x7f
+        for shift in range(7, 63, 7):
+            offset += 1
+            octet = buf[offset]
+            if octet < 0x80:
+                return value | octet << shift, offset + 1
+
+            value |= (octet & 0x7f) << shift
+
+        offset += 1
+        octet = buf[offset]
+
+    except IndexError:
+        raise ValueError("end of data reached") from None
+
+    if octet > 1:
+        raise ValueError("varlong out of range")
+
+    return (value | -0x8000_0000_0000_0000 if octet else value), offset + 1
+
+
+def decode_varints(buf: bytes | bytearray | memoryview, count: int,
+                   offset: int = 0) -> tuple[list[int], int]:
+
+    """Decode `count` varints following each other in `buf` at `offset`.
+
+    Returns the list of values and the offset following the last varint.
+    """
+
+    values: list[int] = []
+    append = values.append
+
+    try:
+        while count:
+            # fast path for the single-octet values dominating most sequences
+            octet = buf[offset]
+            if octet < 0x80:
+                append(octet)
+                offset += 1
+
+            else:
+                value, offset = decode_varint(buf, offset)
+                append(value)
+
+            count -= 1
+
+    except IndexError:
+        raise ValueError("end of data reached") from None
+
+    return values, offset
@@ -0,0 +1,107 @@
+"""Content-addressed interning of payloads shared between connections."""
+
+import gc
+import pickle
+
+from prodis.packets import play
+from prodis.packets.play.clientbound import Tags
+from prodis.utils import blob
+from prodis.utils.blob import BlobStore
+
+
+DATA = bytes(range(256)) * 40
+
+
+def test_dedup():
+
+    store = BlobStore()
+
+    first = store.intern(DATA)
+    second = store.intern(bytearray(DATA))
+    third = store.intern(memoryview(b'x' + DATA)[1:])
+
+    assert first is second is third
+    assert (store.hits, store.misses) == (2, 1)
+    assert len(store) == 1
+    assert store.bytes_held == len(DATA)
+
+
+def test_lookup_by_content():
+
+    store = BlobStore()
+
+    a = store.intern(DATA)
+    b = store.intern(DATA[:-1] + b'\x00')
+
+    assert a is not b and a != b
+    assert a.digest != b.digest
+    assert a == DATA and b == bytearray(DATA[:-1] + b'\x00')
+    assert len(store) == 2
+    assert store.intern(DATA[:-1] + b'\x00') is b
+
+
+def test_copied():
+
+    store = BlobStore()
+
+    data = bytearray(DATA)
+    interned = store.intern(data)
+    data[0] = 0xff
+
+    # the store holds data of its own, immune to changes of the original
+    assert bytes(interned) == DATA
+    assert store.intern(DATA) is interned
+
+
+def test_kept_while_recent():
+
+    store = BlobStore(keep=2)
+
+    for i in range(3):
+        store.intern(bytes((i,)) * 100)
+
+    gc.collect()
+    # the oldest one was neither referenced nor among the recent ones
+    assert len(store) == 2
+    assert store.misses == 3
+
+    store.intern(b'\x00' * 100)
+    assert store.misses == 4
+
+
+def test_decoded_once():
+
+    store = BlobStore()
+    calls = []
+
+    def decoder(data):
+
+        calls.append(data)
+        return len(data)
+
+    assert store.intern(DATA).decoded(decoder) == len(DATA)
+    assert store.intern(DATA).decoded(decoder) == len(DATA)
+    assert len(calls) == 1
+
+
+def test_pickled():
+
+    interned = blob.intern(DATA)
+
+    assert pickle.loads(pickle.dumps(interned)) is interned
+
+
+def test_shared_between_packets():
+
+    data = b''.join(bytes(Tags(raw_tail=DATA).wrapped()) for _ in range(2))
+
+    packets = []
+    start = 0
+    while start < len(data):
+        dispatched, frame, start = play.ClientBound.parse_frame(data, start)
+        packets.append(dispatched.from_frame(frame))
+
+    first, second = packets
+    assert first is not second
+    assert first.raw_tail is second.raw_tail
+    assert first.raw_tail == DATA
@@ -0,0 +1,66 @@
+import pytest
+
+from prodis.utils import byte
+from prodis.utils.varint import encode_varint
+
+
+def test_parse_varbytes():
+
+    data = b'\xff' + encode_varint(3) + b'abcd'
+
+    value, end = byte.parse_varbytes(data, 1)
+
+    assert bytes(value) == b'abc'
+    assert end == 5
+
+
+def test_parse_varstr_and_identifier():
+
+    data = byte.render_varstr('héllo') + byte.render_identifier('a', 'b')
+
+    s, end = byte.parse_varstr(data)
+    assert s == 'héllo'
+
+    identifier, end = byte.parse_identifier(data, end)
+    assert identifier == ('a', 'b')
+    assert end == len(data)
+
+
+@pytest.mark.parametrize('parse', [
+    byte.parse_varbytes,
+    byte.parse_varstr,
+    byte.parse_identifier,
+    byte.parse_bitset,
+])
+def test_negative_length(parse):
+
+    data = encode_varint(-2) + b'x' * 32
+
+    with pytest.raises(ValueError, match="negative length"):
+        parse(data)
+
+
+@pytest.mark.parametrize('parse', [
+    byte.parse_varbytes,
+    byte.parse_bitset,
+])
+def test_truncated(parse):
+
+    with pytest.raises(ValueError, match="end of data"):
+        parse(encode_varint(2) + b'x')
+
+
+@pytest.mark.parametrize('value', [0, 1, 1 << 63, (1 << 64) - 1, 1 << 200])
+def test_bitset(value):
+
+    data = byte.render_bitset(value)
+
+    assert byte.parse_bitset(data) == (value, len(data))
+
+
+def test_parse_struct():
+
+    assert byte.parse_short(b'\x00\xff\xfe', 1) == (-2, 3)
+
+    with pytest.raises(ValueError, match="end of data"):
+        byte.parse_long(b'\x00' * 7)
@@ -0,0 +1,132 @@
+"""Caching of the chunks sent over a connection."""
+
+from prodis.chunkcache import ChunkCache
+from prodis.packets import play
+from prodis.packets.play import clientbound
+
+
+def _chunk(chunk_x, chunk_z, size=1000):
+
+    # the heightmaps are just padding to give the chunks a size
+    heightmaps = (b'\x0a\x00\x00\x07\x00\x01a' + size.to_bytes(4, 'big')
+                  + bytes(size) + b'\x00')
+
+    return clientbound.ChunkData(chunk_x=chunk_x, chunk_z=chunk_z,
+                                 heightmaps=heightmaps)
+
+
+def _generic(packet):
+
+    decoder, frame, _ = play.ClientBound.parse_frame(packet.wrapped(),
+                                                     inspect=())
+    return decoder.from_frame(frame)
+
+
+def test_lookup():
+
+    cache = ChunkCache()
+    cache.update(_chunk(1, -2))
+
+    assert (1, -2) in cache
+    assert cache.get(1, -2).chunk.chunk_z == -2
+    assert cache.get(2, -2) is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_decoded_on_access():
+
+    cache = ChunkCache()
+    cache.update(_generic(_chunk(3, 4)))
+
+    cached = cache.get(3, 4)
+    assert cached._chunk is None
+
+    assert type(cached.chunk) is clientbound.ChunkData
+    assert (cached.chunk.chunk_x, cached.chunk.chunk_z) == (3, 4)
+    assert cache.bytes_held == len(_chunk(3, 4).payload)
+
+
+def test_light():
+
+    cache = ChunkCache()
+    cache.update(_chunk(0, 0))
+    held = cache.bytes_held
+
+    light = clientbound.UpdateLight(chunk_x=0, chunk_z=0, trust_edges=False)
+    cache.update(_generic(light))
+
+    cached = cache.get(0, 0)
+    assert cached.light.trust_edges is False
+    assert cache.bytes_held == held + len(light.payload)
+
+    cache.update(clientbound.UpdateLight(chunk_x=5, chunk_z=5))
+    assert (5, 5) not in cache
+
+
+def test_eviction():
+
+    size = len(_chunk(0, 0).payload)
+    cache = ChunkCache(max_bytes=3 * size)
+
+    for chunk_x in range(3):
+        cache.update(_chunk(chunk_x, 0))
+
+    cache.get(0, 0)
+    cache.update(_chunk(3, 0))
+
+    assert (1, 0) not in cache
+    assert (0, 0) in cache
+    assert cache.evictions == 1
+    assert cache.bytes_held == 3 * size
+
+
+def test_unload_and_join():
+
+    cache = ChunkCache()
+    cache.update(_chunk(0, 0))
+    cache.update(_chunk(1, 0))
+
+    cache.update(_generic(clientbound.UnloadChunk(chunk_x=0, chunk_z=0)))
+    assert (0, 0) not in cache
+    assert len(cache) == 1
+
+    # only its type matters, so it is never decoded
+    cache.update(play.ClientBound(bytes([clientbound.JoinGame.id])))
+    assert len(cache) == 0
+    assert cache.bytes_held == 0
+
+
+def test_decoded_only_while_hot():
+
+    cache = ChunkCache(max_decoded=2)
+    for chunk_x in range(3):
+        cache.update(_chunk(chunk_x, 0))
+
+    cached = []
+    for chunk_x in range(3):
+        cached.append(cache.get(chunk_x, 0))
+        assert cached[-1].chunk.chunk_x == chunk_x
+
+    # the chunk looked up least recently went cold and lost its decoded form
+    assert [c._chunk is None for c in cached] == [True, False, False]
+    assert cached[0].chunk.chunk_x == 0
+    assert cache.bytes_held == 3 * len(_chunk(0, 0).payload)
+
+
+def test_decoded_dropped_when_evicted():
+
+    size = len(_chunk(0, 0).payload)
+    cache = ChunkCache(max_bytes=2 * size)
+
+    cache.update(_chunk(0, 0))
+    cache.update(_generic(clientbound.UpdateLight(chunk_x=0, chunk_z=0)))
+    cached = cache.get(0, 0)
+    assert cached.chunk is not None and cached.light is not None
+
+    cache.update(_chunk(1, 0))
+    assert (0, 0) not in cache
+    assert (cached._chunk, cached._light) == (None, None)
+
+    cache.get(1, 0).chunk
+    cache.update(_generic(clientbound.UnloadChunk(chunk_x=1, chunk_z=0)))
+    assert not cache._hot
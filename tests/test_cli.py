@@ -0,0 +1,43 @@
+"""Options given on the command line."""
+
+import pytest
+
+from prodis.cli import parse_args
+from prodis.packets.play import clientbound, serverbound
+
+
+def test_defaults():
+
+    args = parse_args([])
+
+    assert args.inspect is None
+    assert args.chunk_cache_size is None
+    assert not args.track_entities
+    assert not args.track_players
+
+
+def test_inspect():
+
+    assert parse_args(['--inspect']).inspect == []
+
+    args = parse_args(['--inspect', 'ChunkData', '0x22', 'PluginMessage'])
+    assert args.inspect == [clientbound.ChunkData, 0x22,
+                            clientbound.PluginMessage,
+                            serverbound.PluginMessage]
+
+
+@pytest.mark.parametrize('name', ['Packet', 'Nonexistent', '_log'])
+def test_inspect_unknown(name):
+
+    with pytest.raises(SystemExit):
+        parse_args(['--inspect', name])
+
+
+def test_tracking():
+
+    args = parse_args(['--chunk-cache-size', '1000000', '--track-entities',
+                       '--track-players'])
+
+    assert args.chunk_cache_size == 1000000
+    assert args.track_entities
+    assert args.track_players
@@ -0,0 +1,106 @@
+"""Dispatch of packet ids through the frozen per-version tables."""
+
+import pytest
+
+from prodis.packets import handshaking, play
+from prodis.packets.packet import MinecraftPacketWithID, protocol
+from prodis.packets.play import clientbound
+from prodis.utils.context import let
+
+
+def _frame(id_, payload=b''):
+
+    data = bytes((id_,)) + payload
+    return bytes((len(data),)) + data
+
+
+def test_indexed_by_id():
+
+    table = play.ClientBound.dispatch_table(757)
+
+    assert isinstance(table, tuple)
+    assert table[clientbound.TimeUpdate.id] is clientbound.TimeUpdate
+    assert table[clientbound.ChunkData.id] is clientbound.ChunkData
+    assert all(t is None or t.id == id_ for id_, t in enumerate(table))
+
+
+def test_immutable():
+
+    table = play.ClientBound.dispatch_table(757)
+
+    with pytest.raises(TypeError):
+        table[clientbound.TimeUpdate.id] = clientbound.ChunkData
+
+    assert table[clientbound.TimeUpdate.id] is clientbound.TimeUpdate
+
+
+def test_cached_per_version():
+
+    table = play.ClientBound.dispatch_table(757)
+
+    assert play.ClientBound.dispatch_table(757) is table
+    with let(protocol, 757):
+        assert play.ClientBound.dispatch_table() is table
+
+
+def test_specific_class():
+
+    # a specific packet only dispatches its own id
+    table = clientbound.TimeUpdate.dispatch_table(757)
+
+    assert table[clientbound.TimeUpdate.id] is clientbound.TimeUpdate
+    assert [t for t in table if t is not None] == [clientbound.TimeUpdate]
+
+
+def test_unknown_id():
+
+    id_ = len(play.ClientBound.dispatch_table(757))
+
+    dispatched, frame, end = play.ClientBound.parse_frame(_frame(id_, b'x'))
+    assert dispatched is play.ClientBound
+    assert end == 3
+
+    packet = dispatched.from_frame(frame)
+    assert packet.id == id_
+    assert packet.dispatched_class() is None
+
+    with pytest.raises(ValueError, match="unknown packet id"):
+        clientbound.TimeUpdate.parse_frame(_frame(id_))
+
+
+def test_explicit_table():
+
+    # tables selected once per connection are passed in, bypassing lookups
+    table = (None, clientbound.HeldItemChange)
+
+    dispatched, _, _ = play.ClientBound.parse_frame(_frame(1, b'\x07'),
+                                                    table=table)
+    assert dispatched is clientbound.HeldItemChange
+
+    dispatched, _, _ = play.ClientBound.parse_frame(_frame(0), table=table)
+    assert dispatched is play.ClientBound
+
+
+def test_invalidated_by_registration():
+
+    class Root(MinecraftPacketWithID):
+        pass
+
+    class First(Root):
+        id = 0
+
+    table = Root.dispatch_table(757)
+    assert table == (First,)
+
+    class Third(Root):
+        id = 2
+
+    assert Root.dispatch_table(757) == (First, None, Third)
+    assert table == (First,)
+
+
+def test_handshaking_for_all_versions():
+
+    for version in (0, 757, 10000):
+        table = handshaking.ServerBound.dispatch_table(version)
+        assert table == (handshaking.serverbound.Handshake,)
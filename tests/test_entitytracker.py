@@ -0,0 +1,147 @@
+"""Tracking of the entities spawned over a connection."""
+
+from uuid import UUID
+
+import pytest
+
+from prodis.entitytracker import PLAYER, EntityTracker
+from prodis.packets import play
+from prodis.packets.play import clientbound
+
+
+U = UUID('1b0a6f3e-9c8d-4f4e-8a55-3b2f1f6c7d10')
+
+
+def _generic(packet):
+
+    return _passed_on(packet.wrapped())
+
+
+def _passed_on(wrapped):
+
+    decoder, frame, _ = play.ClientBound.parse_frame(wrapped, inspect=())
+    return decoder.from_frame(frame)
+
+
+def _received(packet):
+
+    # dispatched, but not decoded yet
+    return play.ClientBound(bytes(packet.wrapped())[1:])
+
+
+@pytest.fixture(params=[lambda packet: packet, _generic, _received],
+                ids=['decoded', 'generic', 'received'])
+def send(request):
+
+    tracker = EntityTracker()
+
+    def send(packet):
+        tracker.update(request.param(packet))
+        return tracker
+
+    return send
+
+
+def test_spawn(send):
+
+    send(clientbound.SpawnEntity(
+        entity_id=1, entity_uuid=U, entity_type=2, x=1.5, y=2.0, z=-3.0,
+        pitch=45.0, yaw=90.0,
+    ))
+    send(clientbound.SpawnLivingEntity(
+        entity_id=2, entity_uuid=U, entity_type=3, x=0.0, y=0.0, z=0.0,
+        yaw=90.0, pitch=-45.0, head_pitch=180.0,
+        velocity_x=0.0, velocity_y=0.0, velocity_z=0.0,
+    ))
+    tracker = send(clientbound.SpawnPlayer(
+        entity_id=3, player_uuid=U, x=0.0, y=64.0, z=0.0,
+        yaw=270.0, pitch=0.0,
+    ))
+
+    assert len(tracker) == 3
+    assert tracker.get(1) == (1, U, 2, 1.5, 2.0, -3.0, 90.0, 45.0, 90.0)
+    assert tracker.get(2)[-3:] == (90.0, 315.0, 180.0)
+    assert tracker.get(3).type == PLAYER
+    assert tracker.get(3).head_yaw == 270.0
+
+
+def test_move_and_rotate(send):
+
+    send(clientbound.SpawnPlayer(
+        entity_id=7, player_uuid=U, x=0.0, y=64.0, z=0.0,
+        yaw=0.0, pitch=0.0,
+    ))
+    send(clientbound.EntityPosition(
+        entity_id=7, delta_x=1.0, delta_y=-0.5, delta_z=0.25,
+        on_ground=True,
+    ))
+    send(clientbound.EntityPositionAndRotation(
+        entity_id=7, delta_x=1.0, delta_y=0.0, delta_z=0.0,
+        yaw=90.0, pitch=45.0, on_ground=True,
+    ))
+    send(clientbound.EntityHeadLook(entity_id=7, head_yaw=180.0))
+    tracker = send(clientbound.EntityHeadLook(entity_id=8, head_yaw=180.0))
+
+    entity = tracker.get(7)
+    assert (entity.x, entity.y, entity.z) == (2.0, 63.5, 0.25)
+    assert (entity.yaw, entity.pitch, entity.head_yaw) == (90.0, 45.0, 180.0)
+    assert 8 not in tracker
+
+    send(clientbound.EntityRotation(entity_id=7, yaw=0.0, pitch=0.0,
+                                    on_ground=True))
+    tracker = send(clientbound.EntityTeleport(
+        entity_id=7, x=100.0, y=70.0, z=-100.0, yaw=180.0, pitch=0.0,
+        on_ground=False,
+    ))
+
+    entity = tracker.get(7)
+    assert (entity.x, entity.y, entity.z) == (100.0, 70.0, -100.0)
+    assert (entity.yaw, entity.pitch) == (180.0, 0.0)
+    assert tracker.within(0.0, 0.0, 50.0) == []
+    assert tracker.within(100.0, -100.0, 1.0) == [7]
+
+
+def test_destroy_and_join(send):
+
+    for entity_id in range(4):
+        send(clientbound.SpawnPlayer(
+            entity_id=entity_id, player_uuid=U, x=float(entity_id), y=0.0,
+            z=0.0, yaw=0.0, pitch=0.0,
+        ))
+
+    tracker = send(clientbound.DestroyEntities(entity_ids=[0, 2, 9]))
+    assert len(tracker) == 2
+    assert sorted(tracker.within(0.0, 0.0, 10.0)) == [1, 3]
+    assert tracker.get(3).x == 3.0
+
+    tracker.update(play.ClientBound(bytes([clientbound.JoinGame.id])))
+    assert len(tracker) == 0
+
+
+def test_irrelevant():
+
+    tracker = EntityTracker()
+    tracker.update(play.ClientBound(b'\x7f\x00'))
+    tracker.update(_generic(clientbound.HeldItemChange(slot=1)))
+
+    assert len(tracker) == 0
+
+
+@pytest.mark.parametrize('data', [
+    '00' + '01',
+    '04' + '01' + U.hex + '00',
+    '29' + '01',
+    '3a' + 'ffffffff0f',
+    '3a' + '0201',
+])
+def test_truncated(data):
+
+    tracker = EntityTracker()
+    tracker.update(_generic(clientbound.SpawnPlayer(
+        entity_id=1, player_uuid=U, x=0.0, y=0.0, z=0.0, yaw=0.0, pitch=0.0,
+    )))
+
+    payload = bytes.fromhex(data)
+
+    with pytest.raises(ValueError):
+        tracker.update(_passed_on(bytes([len(payload)]) + payload))
@@ -0,0 +1,10 @@
+import pytest
+
+from prodis.packets import play
+from prodis.utils.varint import encode_varint
+
+
+def test_parse_frame_negative_length():
+
+    with pytest.raises(ValueError, match="negative frame length"):
+        play.ClientBound.parse_frame(encode_varint(-1) + b'\x00' * 8)
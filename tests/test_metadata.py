@@ -0,0 +1,116 @@
+"""Entity metadata, including what a hostile server might send."""
+
+import pytest
+
+from prodis.packets.play.metadata import (
+    BYTE,
+    OPT_UUID,
+    PARTICLE,
+    STRING,
+    VARINT,
+    Metadata,
+    Particle,
+    parse_particle,
+)
+from prodis.utils.varint import encode_varint
+
+
+ENTRIES = [
+    (0, BYTE, 5),
+    (2, STRING, 'hi'),
+    (5, PARTICLE, Particle(14, (1.0, 0.5, 0.0, 1.0))),
+    (7, OPT_UUID, None),
+    (9, VARINT, 300),
+]
+
+
+def test_round_trip():
+
+    metadata = Metadata.from_entries(ENTRIES)
+    parsed = Metadata(bytes(metadata))
+
+    assert list(parsed) == [0, 2, 5, 7, 9]
+    assert len(parsed) == 5
+    assert [tuple(entry) for entry in parsed.entries()] == ENTRIES
+
+
+def test_entry_fields():
+
+    entry = Metadata.from_entries(ENTRIES).entries()[1]
+
+    assert (entry.slot_index, entry.type, entry.value) == (2, STRING, 'hi')
+    # the methods of tuples are not shadowed by the fields
+    assert entry.index('hi') == 2
+    assert entry.count(2) == 1
+
+
+def test_lookup():
+
+    metadata = Metadata.from_entries(ENTRIES)
+
+    assert metadata[9] == 300
+    assert metadata.type_of(2) == STRING
+    assert 7 in metadata
+    assert 3 not in metadata
+    assert 'x' not in metadata
+
+    with pytest.raises(KeyError):
+        metadata[3]
+
+
+def test_empty():
+
+    assert len(Metadata()) == 0
+
+
+@pytest.mark.parametrize('data', [
+    b'',
+    b'\x00',
+    b'\x00\x00\x05',
+    b'\x02\x03\x05hi\xff',
+    b'\x09\x01\x80',
+])
+def test_truncated(data):
+
+    metadata = Metadata(data)
+
+    with pytest.raises(ValueError):
+        metadata.entries()
+
+    with pytest.raises(ValueError):
+        list(metadata)
+
+
+def test_negative_string_length():
+
+    # a length of -3 would skip back onto the entry itself
+    metadata = Metadata(b'\x02\x03' + encode_varint(-3) + b'\x04\x00\x00\xff')
+
+    with pytest.raises(ValueError):
+        metadata[4]
+
+    with pytest.raises(ValueError):
+        list(metadata)
+
+    with pytest.raises(ValueError):
+        metadata.entries()
+
+
+def test_invalid_type():
+
+    metadata = Metadata(b'\x00\x7f\x00\xff')
+
+    with pytest.raises(ValueError):
+        metadata[0]
+
+    with pytest.raises(ValueError):
+        list(metadata)
+
+
+def test_unknown_vibration_source():
+
+    data = (encode_varint(36) + bytes(24) + b'\x09minecraft\x03foo'
+            + encode_varint(1))
+
+    with pytest.raises(ValueError):
+        parse_particle(memoryview(data))
@@ -0,0 +1,113 @@
+"""Lazily decoded NBT, including what a hostile server might send."""
+
+import struct
+
+import pytest
+
+from prodis.utils import nbt
+
+
+def _name(name):
+
+    encoded = name.encode()
+    return struct.pack('>H', len(encoded)) + encoded
+
+
+def _tag(tag, name, payload):
+
+    return bytes((tag,)) + _name(name) + payload
+
+
+# a compound with one tag of most types, including a nested compound
+DATA = _tag(nbt.COMPOUND, '', b''.join([
+    _tag(nbt.BYTE, 'b', b'\xfe'),
+    _tag(nbt.INT, 'i', struct.pack('>i', -5)),
+    _tag(nbt.DOUBLE, 'd', struct.pack('>d', 0.5)),
+    _tag(nbt.STRING, 's', _name('héllo')),
+    _tag(nbt.LIST, 'l', bytes((nbt.SHORT,)) + struct.pack('>ihh', 2, 1, -1)),
+    _tag(nbt.LIST, 'ls', bytes((nbt.STRING,)) + struct.pack('>i', 2)
+         + _name('a') + _name('bc')),
+    _tag(nbt.LONG_ARRAY, 'la', struct.pack('>iqq', 2, 1, -2)),
+    _tag(nbt.COMPOUND, 'c', _tag(nbt.BYTE_ARRAY, 'ba', b'\x00\x00\x00\x01\x07')
+         + b'\x00'),
+]) + b'\x00')
+
+
+def test_parse():
+
+    value, end = nbt.parse(b'\x00' + DATA, 1)
+
+    assert end == len(DATA) + 1
+    assert value['b'] == -2
+    assert value['i'] == -5
+    assert value['d'] == 0.5
+    assert value['s'] == 'héllo'
+    assert list(value['l']) == [1, -1]
+    assert list(value['ls']) == ['a', 'bc']
+    assert list(value['la']) == [1, -2]
+    assert list(value['c']['ba']) == [7]
+    assert value.tag_type('c') == nbt.COMPOUND
+
+
+def test_empty():
+
+    assert nbt.parse(b'\x00') == (None, 1)
+    assert nbt.skip(b'\x00') == 1
+
+
+def test_skip_and_raw():
+
+    data = memoryview(DATA + b'rest')
+
+    assert nbt.skip(data) == len(DATA)
+    raw, end = nbt.parse_raw(data)
+    assert bytes(raw) == DATA and end == len(DATA)
+
+
+def test_truncated():
+
+    for size in range(len(DATA)):
+        with pytest.raises(ValueError):
+            nbt.parse(DATA[:size])
+
+
+@pytest.mark.parametrize('data', [
+    _tag(nbt.COMPOUND, '', _tag(nbt.INT_ARRAY, 'a', struct.pack('>i', -1))
+         + b'\x00'),
+    _tag(nbt.COMPOUND, '', _tag(nbt.LIST, 'l', bytes((nbt.BYTE,))
+                                + struct.pack('>i', -4)) + b'\x00'),
+    _tag(nbt.LIST, '', bytes((nbt.COMPOUND,)) + struct.pack('>i', -1)),
+])
+def test_negative_length(data):
+
+    with pytest.raises(ValueError, match="negative NBT length"):
+        nbt.parse(data)
+
+
+def test_huge_length():
+
+    # a length far beyond the data must not be trusted for allocation
+    data = _tag(nbt.LONG_ARRAY, '', struct.pack('>i', 0x7fffffff))
+
+    with pytest.raises(ValueError, match="end of data"):
+        nbt.parse(data)
+
+
+def test_invalid_tag():
+
+    with pytest.raises(ValueError, match="invalid NBT tag type"):
+        nbt.parse(_tag(nbt.COMPOUND, '', _tag(13, 'x', b'') + b'\x00'))
+
+
+def test_nested_too_deeply():
+
+    def nested(depth):
+        return (_tag(nbt.COMPOUND, '', b'')
+                + _tag(nbt.COMPOUND, 'x', b'') * depth
+                + b'\x00' * (depth + 1))
+
+    assert nbt.skip(nested(nbt.MAX_DEPTH - 1)) == len(
+        nested(nbt.MAX_DEPTH - 1))
+
+    with pytest.raises(ValueError, match="nested too deeply"):
+        nbt.skip(nested(nbt.MAX_DEPTH))
@@ -0,0 +1,324 @@
+"""Round trips of the schema packets against payloads captured from the
+hand-written codecs they replaced."""
+
+import pickle
+
+from uuid import UUID
+
+import pytest
+
+from prodis.packets import handshaking, login, play, status
+from prodis.packets.packet import MinecraftPacketWithID
+from prodis.packets.play.item import Slot
+from prodis.utils.varint import decode_varint, encode_varint
+
+
+U = UUID('1b0a6f3e-9c8d-4f4e-8a55-3b2f1f6c7d10')
+
+# an NBT compound with a single byte array
+NBT = bytes.fromhex('0a0000070001610000000301020300')
+
+CASES = [
+    # (packet class, fields, payload of the hand-written codec)
+    (play.clientbound.SpawnLivingEntity, dict(
+        entity_id=5, entity_uuid=U, entity_type=3, x=1.5, y=-2.25, z=3.0,
+        yaw=90.0, pitch=-45.0, head_pitch=180.0,
+        velocity_x=0.5, velocity_y=-0.25, velocity_z=1.0,
+    ),
+     ('051b0a6f3e9c8d4f4e8a553b2f1f6c7d10033ff8000000000000c00200000000'
+      '0000400800000000000040e0800fa0f8301f40')),
+    (play.clientbound.ServerDifficulty, dict(difficulty=1, locked=False),
+     '0100'),
+    (play.clientbound.ChatMessage, dict(
+        data={'text': 'hi'}, position=1, sender=U,
+    ),
+     '0d7b2274657874223a226869227d011b0a6f3e9c8d4f4e8a553b2f1f6c7d10'),
+    (play.clientbound.DeclareCommands, dict(raw_tail=b'abc'),
+     '616263'),
+    (play.clientbound.WindowItems, dict(
+        window_id=1, state_id=300, items=[None, Slot(1, 64, NBT)],
+        carried_item=Slot(7, 1),
+    ),
+     '01ac0202000101400a000007000161000000030102030001070100'),
+    (play.clientbound.PluginMessage, dict(
+        namespace='minecraft', channel='brand', data=b'vanilla',
+    ),
+     '0f6d696e6563726166743a6272616e6476616e696c6c61'),
+    (play.clientbound.EntityTrigger, dict(entity_id=77, trigger=9),
+     '0000004d09'),
+    (play.clientbound.InitializeWorldBorder, dict(
+        x=0.0, z=1.0, old_diameter=100.0, new_diameter=200.0, speed=1.5,
+        portal_teleport_boundary=29999984, warning_blocks=5, warning_time=15,
+    ),
+     ('00000000000000003ff000000000000040590000000000004069000000000000'
+      'dc0bf086a70e050f')),
+    (play.clientbound.ChunkData, dict(
+        chunk_x=-3, chunk_z=7, heightmaps=NBT,
+    ),
+     'fffffffd000000070a0000070001610000000301020300000001000000000000'),
+    (play.clientbound.UpdateLight, dict(
+        chunk_x=-3, chunk_z=7, trust_edges=True,
+    ),
+     'fdffffff0f0701000000000000'),
+    (play.clientbound.JoinGame, dict(
+        entity_id=42, hardcore=False, gamemode=1, previous_gamemode=-1,
+        worlds=[('minecraft', 'overworld')], dimension_codec=NBT,
+        dimension=NBT, world_namespace='minecraft', world_name='overworld',
+        hashed_seed=-5, max_players=20, view_distance=10,
+        simulation_distance=8, reduced_debug_info=False,
+        enable_respawn_screen=True, is_debug=False, is_flat=True,
+    ),
+     ('0000002a0001ff01136d696e6563726166743a6f766572776f726c640a000007'
+      '00016100000003010203000a0000070001610000000301020300136d696e6563'
+      '726166743a6f766572776f726c64fffffffffffffffb140a0800010001')),
+    (play.clientbound.PlayerAbilities, dict(
+        flags=3, flying_speed=0.05, fov_modifier=0.1,
+    ),
+     '033d4ccccd3dcccccd'),
+    (play.clientbound.PlayerInfo, dict(action=0, updates={U: {
+        'name': 'bob',
+        'properties': {'textures': ('v', 'sig'), 'x': ('y', None)},
+        'gamemode': 1, 'ping': 20, 'display_name': None,
+    }}),
+     ('00011b0a6f3e9c8d4f4e8a553b2f1f6c7d1003626f6202087465787475726573'
+      '017601037369670178017900011400')),
+    (play.clientbound.PlayerInfo, dict(action=2, updates={U: {'ping': 5}}),
+     '02011b0a6f3e9c8d4f4e8a553b2f1f6c7d1005'),
+    (play.clientbound.PlayerInfo, dict(action=4, updates={U: None}),
+     '04011b0a6f3e9c8d4f4e8a553b2f1f6c7d10'),
+    (play.clientbound.PlayerPositionAndLook, dict(
+        x=1.0, y=64.0, z=-5.5, yaw=10.0, pitch=5.0, flags=1,
+        teleport_id=500, dismount_vehicle=True,
+    ),
+     ('3ff00000000000004050000000000000c0160000000000004120000040a00000'
+      '01f40301')),
+    (play.clientbound.EntityHeadLook, dict(entity_id=1000, head_yaw=-90.0),
+     'e807c0'),
+    (play.clientbound.HeldItemChange, dict(slot=4),
+     '04'),
+    (play.clientbound.UpdateViewPosition, dict(chunk_x=-1, chunk_z=2),
+     'ffffffff0f02'),
+    (play.clientbound.SpawnPosition, dict(x=-100, y=-60, z=2000, angle=0.5),
+     'ffffe700007d0fc43f000000'),
+    (play.clientbound.EntityMetadata, dict(
+        entity_id=3, metadata=b'\x00\x00\x02\x01\x01\x80\x02\xff',
+    ),
+     '0300000201018002ff'),
+    (play.clientbound.EntityEquipment, dict(
+        entity_id=3, equipment=[(0, None), (5, Slot(1, 1))],
+    ),
+     '0380000501010100'),
+    (play.clientbound.TimeUpdate, dict(world_age=100, time_of_day=-6000),
+     '0000000000000064ffffffffffffe890'),
+    (play.clientbound.EntityProperties, dict(entity_id=3, raw_tail=b'\x00'),
+     '0300'),
+    (play.clientbound.DeclareRecipes, dict(raw_tail=b'\x00'),
+     '00'),
+    (play.clientbound.Tags, dict(raw_tail=b'\x00'),
+     '00'),
+    (play.serverbound.ClientSettings, dict(),
+     '05656e5f55532000017f010001'),
+    (play.serverbound.PluginMessage, dict(
+        namespace='minecraft', channel='brand', data=b'x',
+    ),
+     '0f6d696e6563726166743a6272616e6478'),
+    (login.clientbound.EncryptionRequest, dict(
+        server_id='', public_key=b'k' * 5, verify_token=b'v' * 4,
+    ),
+     '00056b6b6b6b6b0476767676'),
+    (login.clientbound.LoginSuccess, dict(uuid=U, username='bob'),
+     '1b0a6f3e9c8d4f4e8a553b2f1f6c7d1003626f62'),
+    (login.clientbound.SetCompression, dict(threshold=256),
+     '8002'),
+    (login.serverbound.LoginStart, dict(name='bob'),
+     '03626f62'),
+    (status.clientbound.Response, dict(name='x', players_online=3),
+     ('6d7b2276657273696f6e223a7b226e616d65223a2278222c2270726f746f636f'
+      '6c223a3735377d2c22706c6179657273223a7b226d6178223a32302c226f6e6c'
+      '696e65223a332c2273616d706c65223a5b5d7d2c226465736372697074696f6e'
+      '223a7b2274657874223a22227d7d')),
+    (status.clientbound.Pong, dict(value=12.345),
+     '0000000000003039'),
+    (status.serverbound.Request, dict(),
+     ''),
+    (status.serverbound.Ping, dict(value=12.345),
+     '0000000000003039'),
+    (status.serverbound.Ping, dict(value=-0.0019),
+     'ffffffffffffffff'),
+    (handshaking.serverbound.Handshake, dict(
+        protocol=757, address='localhost', port=25565, next_state=2,
+    ),
+     'f505096c6f63616c686f737463dd02'),
+]
+
+
+def _normalize(value):
+
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return bytes(value)
+
+    if hasattr(type(value), '__bytes__'):
+        return bytes(value)
+
+    return value
+
+
+@pytest.mark.parametrize('cls, fields, payload', CASES,
+                         ids=[cls.__name__ for cls, _, _ in CASES])
+def test_encode(cls, fields, payload):
+
+    assert bytes(cls(**fields).payload).hex() == payload
+
+
+@pytest.mark.parametrize('cls, fields, payload', CASES,
+                         ids=[cls.__name__ for cls, _, _ in CASES])
+def test_decode(cls, fields, payload):
+
+    packet = cls(bytes.fromhex(payload))
+    decoded = {name: getattr(packet, name) for name in fields}
+
+    for name, value in fields.items():
+        if not isinstance(value, float):
+            assert _normalize(decoded[name]) == _normalize(value), name
+
+    # scaled values may come back quantized, but encode the same again
+    assert bytes(cls(**decoded).payload).hex() == payload
+
+
+@pytest.mark.parametrize('cls', [status.serverbound.Ping,
+                                 status.clientbound.Pong])
+@pytest.mark.parametrize('raw_value', [
+    2 ** 62 + 1, 123456789012345678, -2 ** 63, 2 ** 63 - 1,
+])
+def test_ping_exact(cls, raw_value):
+
+    payload = raw_value.to_bytes(8, 'big', signed=True)
+
+    packet = cls(payload)
+    assert packet.raw_value == raw_value
+    assert packet.value == raw_value / 1000
+
+    # proxied pings come back bit for bit, even beyond a float's precision
+    copy = cls(**packet.__getstate__())
+    assert bytes(copy.payload) == payload
+    assert bytes(cls(raw_value=raw_value).payload) == payload
+
+
+def test_slot_fields():
+
+    slot = play.clientbound.WindowItems(bytes.fromhex(
+        '01ac0202000101400a000007000161000000030102030001070100'
+    )).items[1]
+
+    assert (slot.item_id, slot.item_count, slot.nbt) == (1, 64, NBT)
+    assert slot.count(1) == 1
+
+
+def test_positional_arguments():
+
+    assert (play.clientbound.EntityHeadLook(1000, -90.0).payload
+            == play.clientbound.EntityHeadLook(entity_id=1000,
+                                               head_yaw=-90.0).payload)
+    assert status.serverbound.Ping(12.345).raw_value == 12345
+    assert bytes(handshaking.serverbound.Handshake(
+        'localhost', 25565, 2,
+    ).payload).hex() == 'f505096c6f63616c686f737463dd02'
+
+    packet = play.clientbound.SpawnLivingEntity(
+        5, U, 3, 1.5, -2.25, 3.0, 90.0, -45.0, 180.0, 0.5, -0.25, 1.0,
+    )
+    assert packet.entity_uuid == U and packet.velocity_z == 1.0
+
+    # a lone bytes-like argument is still the payload
+    assert play.clientbound.HeldItemChange(b'\x04').slot == 4
+
+
+@pytest.mark.parametrize('cls, fields, payload', CASES,
+                         ids=[cls.__name__ for cls, _, _ in CASES])
+def test_reader(cls, fields, payload):
+
+    names = cls.schema.names
+    if not names:
+        pytest.skip("no fields")
+
+    read = dict(zip(names, cls.schema.reader(*names)(
+        memoryview(bytes.fromhex(payload))
+    )))
+
+    for name, value in fields.items():
+        if not isinstance(value, float):
+            assert _normalize(read[name]) == _normalize(value), name
+
+
+def test_reader_subset():
+
+    cls = play.clientbound.SpawnLivingEntity
+    data = memoryview(bytes.fromhex(CASES[0][2]))
+
+    # the offset is that of the first field wanted, in wire order
+    read = cls.schema.reader('z', 'x', 'yaw')
+    assert read(data, 1 + 16 + 1) == (3.0, 1.5, 90.0)
+
+    assert cls.schema.reader('entity_id', 'entity_uuid')(data) == (5, U)
+
+    with pytest.raises(ValueError, match="end of data"):
+        cls.schema.reader('velocity_z')(data[:-1], len(data) - 2)
+
+    with pytest.raises(ValueError, match="unknown fields"):
+        cls.schema.reader('x', 'w')
+
+
+@pytest.mark.parametrize('cls, fields, payload', CASES,
+                         ids=[cls.__name__ for cls, _, _ in CASES])
+def test_pickle(cls, fields, payload):
+
+    packet = cls(bytes.fromhex(payload))
+    copy = pickle.loads(pickle.dumps(packet))
+
+    assert type(copy) is cls
+    assert bytes(copy.payload).hex() == payload
+
+
+class _Root(MinecraftPacketWithID):
+
+    pass
+
+
+class _Slotted(_Root):
+
+    """A packet without a schema, keeping its field in a slot."""
+
+    __slots__ = ('value',)
+
+    id = 0
+
+    def __init__(self, value: int = 0) -> None:
+
+        super().__init__()
+        self.value = value
+
+    @property
+    def payload(self):
+
+        return encode_varint(self.value)
+
+    @payload.setter
+    def payload(self, data):
+
+        self.value, _ = decode_varint(data)
+
+
+def test_slotted_state():
+
+    packet = _Slotted(300)
+
+    assert not hasattr(packet, '__dict__')
+    assert packet.__getstate__() == {'value': 300}
+    assert repr(packet) == '_Slotted(value=300)'
+
+    copy = pickle.loads(pickle.dumps(packet))
+    assert type(copy) is _Slotted and copy.value == 300
+
+    generic = _Root(b'\x01\x02')
+    assert type(generic) is _Root
+    assert generic.__getstate__() == {'payload': b'\x01\x02'}
@@ -0,0 +1,171 @@
+"""Framing of the packets read from a stream, however it is chunked."""
+
+import pytest
+import trio
+
+from prodis.packetreader import PacketReader
+from prodis.packets import packet, play
+from prodis.packets.play import clientbound
+from prodis.utils.context import let
+
+
+class ChunkedStream(trio.abc.ReceiveStream):
+
+    """Receive stream handing out its data `step` bytes at a time."""
+
+    def __init__(self, data, step):
+
+        self.data = data
+        self.step = step
+        self.calls = 0
+
+    async def receive_some(self, max_bytes=None):
+
+        await trio.lowlevel.checkpoint()
+
+        self.calls += 1
+        n = min(self.step, max_bytes or self.step)
+        data, self.data = self.data[:n], self.data[n:]
+        return data
+
+    async def aclose(self):
+
+        pass
+
+
+def _heightmaps(size):
+
+    return (b'\x0a\x00\x00\x07\x00\x01a' + size.to_bytes(4, 'big')
+            + bytes(range(256)) * (size // 256) + bytes(size % 256) + b'\x00')
+
+
+def _packets():
+
+    packets = [clientbound.TimeUpdate(world_age=i, time_of_day=-i)
+               for i in range(20)]
+    packets.append(clientbound.EntityHeadLook(entity_id=300, head_yaw=90.0))
+    packets.append(clientbound.ChunkData(chunk_x=1, chunk_z=-2,
+                                         heightmaps=_heightmaps(20000)))
+    packets.append(clientbound.HeldItemChange(slot=7))
+    return packets
+
+
+async def _read(data, step, **kwargs):
+
+    reader = PacketReader(ChunkedStream(data, step), play.ClientBound,
+                          **kwargs)
+    return [p async for p in reader]
+
+
+def _fields(packets):
+
+    return [(type(p), bytes(p.payload)) for p in packets]
+
+
+@pytest.mark.parametrize('step', [1, 3, 1000, 0x10000, 1 << 20])
+async def test_framing(step):
+
+    packets = _packets()
+    data = b''.join(p.wrapped() for p in packets)
+
+    assert _fields(await _read(data, step)) == _fields(packets)
+
+
+@pytest.mark.parametrize('step', [1, 5, 0x10000])
+async def test_few_receive_calls(step):
+
+    packets = _packets()
+    stream = ChunkedStream(b''.join(p.wrapped() for p in packets), step)
+    reader = PacketReader(stream, play.ClientBound, chunk_size=0x10000)
+
+    assert len([p async for p in reader]) == len(packets)
+    if step == 0x10000:
+        # many frames are sliced from each chunk received
+        assert stream.calls < len(packets)
+
+
+@pytest.mark.parametrize('threshold', [0, 8, 9, 64, 0x10000])
+@pytest.mark.parametrize('step', [1, 7, 0x10000])
+async def test_compression(threshold, step):
+
+    packets = _packets()
+
+    with let(packet.compression, threshold):
+        data = b''.join(p.wrapped() for p in packets)
+        read = await _read(data, step)
+
+    assert _fields(read) == _fields(packets)
+
+
+async def test_offloaded_inflation():
+
+    packets = _packets()
+
+    with let(packet.compression, 64):
+        data = b''.join(p.wrapped() for p in packets)
+        read = await _read(data, 0x10000, offload_size=1000)
+
+    assert _fields(read) == _fields(packets)
+
+
+@pytest.mark.parametrize('inspect, inflated', [
+    (None, False),
+    ((), False),
+    ([clientbound.ChunkData], True),
+])
+async def test_offloaded_only_for_decoding(inspect, inflated):
+
+    with let(packet.compression, 64):
+        data = b''.join(p.wrapped() for p in _packets())
+        read = await _read(data, 0x10000, inspect=inspect, offload_size=1000)
+
+    # lazy packets only inflate their frames on first access to a field
+    chunk = read[-2]
+    assert chunk._frame.inflated is inflated
+    assert chunk.dispatched_class() is clientbound.ChunkData
+
+
+@pytest.mark.parametrize('threshold', [-1, 64])
+async def test_forwarded_verbatim(threshold):
+
+    packets = _packets()
+
+    with let(packet.compression, threshold):
+        data = b''.join(p.wrapped() for p in packets)
+
+        for inspect in (None, ()):
+            read = await _read(data, 0x10000, inspect=inspect)
+            assert b''.join(bytes(p.wrapped()) for p in read) == data
+
+
+async def test_passthrough():
+
+    packets = _packets()
+    data = b''.join(p.wrapped() for p in packets)
+
+    read = await _read(data, 7, inspect=[clientbound.HeldItemChange])
+
+    assert [type(p) for p in read] == (
+        [play.ClientBound] * (len(packets) - 1) + [clientbound.HeldItemChange]
+    )
+    assert read[0].dispatched_class() is clientbound.TimeUpdate
+    assert read[-1].slot == 7
+
+
+async def test_truncated_stream():
+
+    data = b''.join(p.wrapped() for p in _packets())
+
+    read = await _read(data[:-1], 7)
+    assert len(read) == len(_packets()) - 1
+
+
+async def test_at_eof():
+
+    reader = PacketReader(ChunkedStream(bytes(clientbound.HeldItemChange(
+        slot=1,
+    ).wrapped()), 3), play.ClientBound)
+
+    assert not await reader.at_eof()
+    assert (await reader.__anext__()).slot == 1
+    assert await reader.at_eof()
@@ -0,0 +1,137 @@
+"""Coalescing and backpressure of the packets written to a stream."""
+
+import pytest
+import trio
+
+from prodis.packets.play.clientbound import TimeUpdate
+from prodis.packetwriter import PacketWriter
+
+
+class SlowStream(trio.abc.SendStream):
+
+    """Send stream taking `delay` seconds for every `send_all`."""
+
+    def __init__(self, delay=0.0):
+
+        self.delay = delay
+        self.sent = []
+
+    async def send_all(self, data):
+
+        await trio.sleep(self.delay)
+        self.sent.append(bytes(data))
+
+    async def wait_send_all_might_not_block(self):
+
+        await trio.lowlevel.checkpoint()
+
+    async def aclose(self):
+
+        pass
+
+
+def _packet(i):
+
+    return TimeUpdate(world_age=i, time_of_day=0)
+
+
+SIZE = len(_packet(0).wrapped())
+
+
+async def test_immediate():
+
+    stream = SlowStream()
+    writer = PacketWriter(stream)
+
+    for i in range(3):
+        await writer.write(_packet(i))
+
+    assert stream.sent == [bytes(_packet(i).wrapped()) for i in range(3)]
+    assert writer.unsent == 0
+
+
+async def test_coalescing():
+
+    stream = SlowStream()
+    writer = PacketWriter(stream, flush_size=3 * SIZE)
+
+    for i in range(5):
+        await writer.write(_packet(i), flush=False)
+
+    # the first three reached flush_size and went out in a single send
+    assert stream.sent == [b''.join(_packet(i).wrapped() for i in range(3))]
+    assert writer.unsent == 2 * SIZE
+
+    await writer.flush()
+    assert len(stream.sent) == 2
+    assert b''.join(stream.sent) == b''.join(
+        _packet(i).wrapped() for i in range(5)
+    )
+    assert writer.unsent == 0
+
+
+async def test_flush_empty():
+
+    stream = SlowStream()
+    await PacketWriter(stream).flush()
+
+    assert stream.sent == []
+
+
+@pytest.mark.parametrize('high_water, low_water', [
+    (10 * SIZE, 2 * SIZE),
+    (10 * SIZE, 10 * SIZE),
+    (SIZE, 0),
+])
+async def test_watermarks(autojump_clock, high_water, low_water):
+
+    stream = SlowStream(delay=1.0)
+    writer = PacketWriter(stream, high_water=high_water, low_water=low_water)
+
+    most = 0
+    async with writer.sending():
+        for i in range(100):
+            await writer.write(_packet(i))
+            most = max(most, writer.unsent)
+            assert writer.congested == (writer.unsent >= high_water)
+
+    # writes blocked until the peer caught up, so the backlog stayed bounded
+    assert most <= high_water + SIZE
+    assert writer.stalls > 0
+    assert writer.unsent == 0
+    assert b''.join(stream.sent) == b''.join(
+        _packet(i).wrapped() for i in range(100)
+    )
+    # and whatever piled up meanwhile was sent at once
+    if high_water > SIZE:
+        assert len(stream.sent) < 100
+
+
+async def test_no_stalls_while_keeping_up(autojump_clock):
+
+    stream = SlowStream()
+    writer = PacketWriter(stream, high_water=100 * SIZE, low_water=SIZE)
+
+    async with writer.sending():
+        for i in range(50):
+            await writer.write(_packet(i))
+            await trio.sleep(1.0)
+
+    assert writer.stalls == 0
+    assert len(b''.join(stream.sent)) == 50 * SIZE
+
+
+async def test_sending_twice():
+
+    writer = PacketWriter(SlowStream())
+
+    async with writer.sending():
+        with pytest.raises(RuntimeError):
+            async with writer.sending():
+                pass
+
+
+def test_watermarks_inverted():
+
+    with pytest.raises(ValueError):
+        PacketWriter(SlowStream(), high_water=10, low_water=20)
@@ -0,0 +1,90 @@
+"""The player list as sent over a connection."""
+
+from sys import intern
+from uuid import UUID
+
+from prodis.packets import play
+from prodis.packets.play import clientbound
+from prodis.playerlist import (
+    ADD_PLAYER,
+    REMOVE_PLAYER,
+    UPDATE_LATENCY,
+    PlayerList,
+)
+
+
+U = UUID('1b0a6f3e-9c8d-4f4e-8a55-3b2f1f6c7d10')
+V = UUID('5c4e5d1a-2b3c-4d5e-8f70-112233445566')
+
+
+def _generic(packet):
+
+    decoder, frame, _ = play.ClientBound.parse_frame(packet.wrapped(),
+                                                     inspect=())
+    return decoder.from_frame(frame)
+
+
+def _add(uuid, name, **properties):
+
+    return clientbound.PlayerInfo(action=ADD_PLAYER, updates={uuid: {
+        'name': name, 'properties': properties, 'gamemode': 0, 'ping': 10,
+        'display_name': None,
+    }})
+
+
+def test_add_update_remove():
+
+    players = PlayerList()
+    players.update(_add(U, 'bob', textures=('skin', 'sig')))
+    players.update(_generic(_add(V, 'alice')))
+
+    assert len(players) == 2
+    assert players.get(U).properties == (('textures', 'skin', 'sig'),)
+    assert players.get(V).name == 'alice'
+
+    snapshot = players.snapshot()
+    players.update(_generic(clientbound.PlayerInfo(
+        action=UPDATE_LATENCY, updates={U: {'ping': 99}},
+    )))
+
+    assert players.get(U).ping == 99
+    assert snapshot[U].ping == 10
+
+    players.update(clientbound.PlayerInfo(action=REMOVE_PLAYER,
+                                          updates={V: None}))
+    assert V not in players
+    assert [entry.uuid for entry in players] == [U]
+
+
+def test_interned_property_names_only():
+
+    players = PlayerList()
+    players.update(_generic(_add(U, 'bob', textures=('skin', 'sig'))))
+
+    entry = players.get(U)
+    prop, = entry.properties
+
+    # player names are unique to their entries, so interning is pointless
+    assert entry.name == 'bob'
+    assert entry.name is not intern('bob')
+    assert prop.name is intern('textures')
+    assert prop.value == 'skin'
+    assert prop.value is not intern('skin')
+
+
+def test_cleared_on_join():
+
+    players = PlayerList()
+    players.update(_add(U, 'bob'))
+
+    players.update(play.ClientBound(bytes([clientbound.JoinGame.id])))
+    assert len(players) == 0
+
+
+def test_irrelevant():
+
+    players = PlayerList()
+    players.update(play.ClientBound(b'\x7f\x00'))
+    players.update(clientbound.HeldItemChange(slot=1))
+
+    assert len(players) == 0
@@ -0,0 +1,56 @@
+import os
+
+import pytest
+
+from prodis.packets.policy import CompressionPolicy
+
+
+class Dense:
+    pass
+
+
+class Sparse:
+    pass
+
+
+def test_level():
+
+    policy = CompressionPolicy(level=3, levels={Dense: None, Sparse: 9})
+
+    assert policy.choose(object, 100) == 3
+    assert policy.choose(Dense, 100) is None
+    assert policy.choose(Sparse, 100) == 9
+
+
+def test_bulk():
+
+    policy = CompressionPolicy(level=1, bulk_size=1000, bulk_level=6)
+
+    assert policy.choose(object, 999) == 1
+    assert policy.choose(object, 1000) == 6
+
+
+@pytest.mark.parametrize('kwargs', [
+    dict(bulk_size=1000),
+    dict(bulk_level=6),
+])
+def test_bulk_needs_both(kwargs):
+
+    with pytest.raises(ValueError):
+        CompressionPolicy(**kwargs)
+
+
+def test_max_ratio_skips_dense_classes():
+
+    policy = CompressionPolicy(max_ratio=0.9, min_samples=4)
+    noise = os.urandom(1024)
+
+    for _ in range(4):
+        assert policy.compress(Dense, noise) is not None
+
+    results = [policy.compress(Dense, noise) for _ in range(8)]
+
+    # every min_samples-th frame is still sampled
+    assert sum(result is not None for result in results) == 2
+    assert policy.stats[Dense].skipped == 6
+    assert policy.compress(Sparse, bytes(1024)) is not None
@@ -0,0 +1,219 @@
+"""Recycling of packets through the pools of their classes."""
+
+import pytest
+import trio
+
+from trio.testing import MemorySendStream
+
+from prodis.packetmonitor import PacketMonitor
+from prodis.packets import play, pool_debug, schema
+from prodis.packets.packet import MinecraftPacketWithID
+from prodis.packets.play.clientbound import ChunkData, EntityHeadLook
+from prodis.packetwriter import PacketWriter
+
+
+class Root(MinecraftPacketWithID):
+
+    pass
+
+
+class Eager(Root):
+
+    id = 0
+    pool_size = 4
+
+    schema = schema.Schema(
+        schema.VarInt('value'),
+    )
+
+
+@pytest.fixture(autouse=True)
+def empty_pool():
+
+    EntityHeadLook._pool.clear()
+    yield
+    EntityHeadLook._pool.clear()
+
+
+def test_release_recycles():
+
+    packet = EntityHeadLook(entity_id=1, head_yaw=90.0)
+    assert packet.release()
+    assert EntityHeadLook._pool == [packet]
+
+    reused = EntityHeadLook(entity_id=2, head_yaw=-90.0)
+    assert reused is packet
+    assert not EntityHeadLook._pool
+    assert (reused.entity_id, reused.head_yaw) == (2, -90.0)
+
+
+def test_release_recycles_despite_other_references():
+
+    packet = EntityHeadLook(entity_id=1, head_yaw=0.0)
+    others = [packet, packet]
+
+    assert packet.release()
+    assert others[0] in EntityHeadLook._pool
+
+
+def test_release_dispatched():
+
+    packet = play.ClientBound(bytes.fromhex('3ee807c0'))
+    assert type(packet) is EntityHeadLook
+    assert packet.release()
+
+    reused = play.ClientBound(bytes.fromhex('3e0540'))
+    assert reused is packet
+    assert (reused.entity_id, reused.head_yaw) == (5, 90.0)
+
+
+def test_release_twice():
+
+    packet = EntityHeadLook(entity_id=1, head_yaw=0.0)
+    packet.release()
+
+    with pytest.raises(RuntimeError):
+        packet.release()
+
+
+def test_release_shared():
+
+    packet = EntityHeadLook(entity_id=1, head_yaw=0.0)
+    packet.share()
+
+    assert not packet.release()
+    assert packet.entity_id == 1
+    assert not EntityHeadLook._pool
+
+    assert packet.release()
+    assert EntityHeadLook._pool == [packet]
+
+
+def test_release_without_pool():
+
+    packet = play.ClientBound(b'\x7f\x00')
+    assert not packet.release()
+    assert bytes(packet.payload) == b'\x7f\x00'
+
+
+def test_release_pool_full(monkeypatch):
+
+    monkeypatch.setattr(EntityHeadLook, 'pool_size', 1)
+
+    first = EntityHeadLook(entity_id=1, head_yaw=0.0)
+    second = EntityHeadLook(entity_id=2, head_yaw=0.0)
+
+    assert first.release()
+    assert second.release()
+    assert EntityHeadLook._pool == [first]
+
+
+def test_pool_debug():
+
+    token = pool_debug.set(True)
+    try:
+        packet = EntityHeadLook(entity_id=1, head_yaw=0.0)
+        assert packet.release()
+
+    finally:
+        pool_debug.reset(token)
+
+    assert not EntityHeadLook._pool
+
+    with pytest.raises(RuntimeError):
+        packet.entity_id
+
+    with pytest.raises(RuntimeError):
+        packet.wrapped()
+
+    assert EntityHeadLook(entity_id=2, head_yaw=0.0) is not packet
+
+
+async def test_write_release():
+
+    stream = MemorySendStream()
+    writer = PacketWriter(stream)
+
+    packet = EntityHeadLook(entity_id=1000, head_yaw=-90.0)
+    await writer.write(packet, release=True)
+
+    assert EntityHeadLook._pool == [packet]
+    assert stream.get_data_nowait() == bytes.fromhex('043ee807c0')
+
+
+async def test_write_keeps():
+
+    writer = PacketWriter(MemorySendStream())
+
+    packet = EntityHeadLook(entity_id=1000, head_yaw=-90.0)
+    await writer.write(packet)
+
+    assert not EntityHeadLook._pool
+    assert packet.entity_id == 1000
+
+
+def test_pool_debug_eager():
+
+    assert not Eager.lazy
+
+    token = pool_debug.set(True)
+    try:
+        packet = Eager(b'\x05')
+        assert packet.value == 5
+        assert packet.release()
+
+    finally:
+        pool_debug.reset(token)
+
+    assert not Eager._pool
+
+    with pytest.raises(RuntimeError):
+        packet.value
+
+    with pytest.raises(RuntimeError):
+        packet.value = 6
+
+    with pytest.raises(RuntimeError):
+        packet.payload
+
+
+def test_eager_reused():
+
+    Eager._pool.clear()
+
+    packet = Eager(value=1)
+    assert packet.release()
+
+    reused = Eager(b'\x02')
+    assert reused is packet
+    assert (reused.value, bytes(reused.payload)) == (2, b'\x02')
+
+
+class Owned:
+
+    """Stand-in for a packet, counting its releases."""
+
+    def __init__(self, id_):
+
+        self.id = id_
+        self.released = 0
+
+    def release(self):
+
+        self.released += 1
+        return False
+
+
+async def test_monitor_releases():
+
+    send_channel, recv_channel = trio.open_memory_channel(10)
+    packets = [Owned(ChunkData.id), Owned(ChunkData.id), Owned(0x7f)]
+
+    async with send_channel:
+        for packet in packets:
+            await send_channel.send((False, packet))
+
+    # repeated chunks are not logged, but still released
+    await PacketMonitor(recv_channel).run()
+
+    assert [packet.released for packet in packets] == [1, 1, 1]
@@ -0,0 +1,104 @@
+"""Encoding and decoding of varints, around the edges of their tables."""
+
+import pytest
+
+from prodis.utils.varint import (
+    decode_varint,
+    decode_varints,
+    decode_varlong,
+    encode_varint,
+    encode_varints,
+    encode_varlong,
+)
+
+
+def _reference(value, bits):
+
+    value &= (1 << bits) - 1
+    encoded = bytearray()
+    while True:
+        octet = value & 0x7f
+        value >>= 7
+        if not value:
+            encoded.append(octet)
+            return bytes(encoded)
+
+        encoded.append(octet | 0x80)
+
+
+VARINTS = [
+    0, 1, 0x7f, 0x80, 0xff, 0x3fff, 0x4000, 0x4001, 0x1fffff, 0x200000,
+    0xfffffff, 0x10000000, 0x7fffffff, -1, -0x80, -0x4000, -0x80000000,
+]
+
+VARLONGS = VARINTS + [
+    0x80000000, 0xffffffff, 0x7fffffffffffffff, -0x8000000000000000,
+]
+
+
+def test_table():
+
+    # the values fitting into two octets are encoded from a table
+    for value in range(0x4000 + 1):
+        assert encode_varint(value) == _reference(value, 32), value
+
+
+@pytest.mark.parametrize('value', VARINTS)
+def test_varint(value):
+
+    encoded = encode_varint(value)
+
+    assert encoded == _reference(value, 32)
+    assert decode_varint(b'\x00' + encoded, 1) == (value, len(encoded) + 1)
+
+
+@pytest.mark.parametrize('value', VARLONGS)
+def test_varlong(value):
+
+    encoded = encode_varlong(value)
+
+    assert encoded == _reference(value, 64)
+    assert decode_varlong(encoded) == (value, len(encoded))
+
+
+@pytest.mark.parametrize('encode, value', [
+    (encode_varint, 0x80000000),
+    (encode_varint, -0x80000001),
+    (encode_varlong, 0x8000000000000000),
+    (encode_varlong, -0x8000000000000001),
+])
+def test_encode_out_of_range(encode, value):
+
+    with pytest.raises(ValueError):
+        encode(value)
+
+
+@pytest.mark.parametrize('decode, data', [
+    (decode_varint, b'\xff\xff\xff\xff\x10'),
+    (decode_varint, b'\x80\x80\x80\x80\x80\x00'),
+    (decode_varlong, b'\xff' * 9 + b'\x02'),
+])
+def test_decode_out_of_range(decode, data):
+
+    with pytest.raises(ValueError, match="out of range"):
+        decode(data)
+
+
+@pytest.mark.parametrize('decode', [decode_varint, decode_varlong])
+@pytest.mark.parametrize('data', [b'', b'\x80', b'\xff\xff\xff'])
+def test_decode_truncated(decode, data):
+
+    with pytest.raises(ValueError, match="end of data"):
+        decode(data)
+
+
+def test_varints():
+
+    encoded = encode_varints(VARINTS)
+
+    assert encoded == b''.join(map(encode_varint, VARINTS))
+    assert decode_varints(encoded, len(VARINTS)) == (VARINTS, len(encoded))
+    assert decode_varints(encoded, 0, 3) == ([], 3)
+
+    with pytest.raises(ValueError):
+        decode_varints(encoded, len(VARINTS) + 1)
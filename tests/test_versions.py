@@ -0,0 +1,100 @@
+"""Packet definitions resolved from the handshake protocol version."""
+
+import pytest
+
+from prodis.packets import handshaking, login, play, versions
+from prodis.packets.packet import MinecraftPacketWithID, protocol
+from prodis.utils.context import let
+
+
+class Root(MinecraftPacketWithID):
+
+    pass
+
+
+class Old(Root, versions=range(1, 5)):
+
+    id = 0
+
+
+class New(Root, versions=range(5, 9)):
+
+    id = 0
+
+
+class Always(Root):
+
+    id = 1
+
+
+def test_supported():
+
+    assert versions.is_supported(757)
+    assert versions.LATEST == 757
+    for version in (-1, 0, 756, 758):
+        assert not versions.is_supported(version)
+
+
+@pytest.mark.parametrize('a, b, expected', [
+    (range(1, 5), range(5, 9), False),
+    (range(1, 6), range(5, 9), True),
+    (range(5, 9), range(1, 6), True),
+    (range(1, 9), range(3, 4), True),
+    (None, range(5, 9), True),
+    (range(1, 5), None, True),
+])
+def test_overlap(a, b, expected):
+
+    assert versions.overlap(a, b) is expected
+
+
+@pytest.mark.parametrize('version, expected', [
+    (1, (Old, Always)),
+    (4, (Old, Always)),
+    (5, (New, Always)),
+    (8, (New, Always)),
+    (0, (None, Always)),
+    (9, (None, Always)),
+])
+def test_resolved(version, expected):
+
+    assert Root.dispatch_table(version) == expected
+
+    with let(protocol, version):
+        assert type(Root(b'\x00')) is (expected[0] or Root)
+
+
+def test_overlapping_definition():
+
+    with pytest.raises(AssertionError):
+        class Clash(Root, versions=range(4, 6)):
+            id = 0
+
+    assert Root.packet_types[0] == [Old, New]
+
+
+@pytest.mark.parametrize('version', [0, 756, 758])
+def test_unknown_version(version):
+
+    # nothing is defined for unsupported versions past the handshake
+    for cls in (login.ClientBound, login.ServerBound,
+                play.ClientBound, play.ServerBound):
+        assert cls.dispatch_table(version) == ()
+
+    with let(protocol, version):
+        packet = play.ClientBound(b'\x00\x01')
+        assert packet.dispatched_class() is None
+
+    assert type(packet) is play.ClientBound
+
+
+def test_unknown_version_handshake():
+
+    Handshake = handshaking.serverbound.Handshake
+
+    # status may be queried by any version, but logging in needs support
+    Handshake(next_state=1, protocol=-1)._validate()
+    Handshake(next_state=2, protocol=757)._validate()
+
+    with pytest.raises(AssertionError):
+        Handshake(next_state=2, protocol=758)._validate()